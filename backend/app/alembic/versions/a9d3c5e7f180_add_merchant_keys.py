@@ -0,0 +1,33 @@
+"""Add canonical merchant keys
+
+Revision ID: a9d3c5e7f180
+Revises: f4b8d2e6a179
+Create Date: 2026-10-19 20:41:53.207716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3c5e7f180'
+down_revision = 'f4b8d2e6a179'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable without a default, so adding the columns does not rewrite the
+    # tables; existing rows are filled by `python -m app.backfill_merchant_keys`
+    op.add_column('transaction', sa.Column('merchant_key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+    op.create_index('ix_transaction_user_id_merchant_key', 'transaction', ['user_id', 'merchant_key'], unique=False)
+    op.add_column('emailtransaction', sa.Column('merchant_key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+    op.create_index('ix_emailtransaction_gmail_connection_id_merchant_key', 'emailtransaction', ['gmail_connection_id', 'merchant_key'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_emailtransaction_gmail_connection_id_merchant_key', table_name='emailtransaction')
+    op.drop_column('emailtransaction', 'merchant_key')
+    op.drop_index('ix_transaction_user_id_merchant_key', table_name='transaction')
+    op.drop_column('transaction', 'merchant_key')
@@ -0,0 +1,37 @@
+"""Add trigram indexes for todo, milestone and subject search
+
+Revision ID: b4e8f2a6c913
+Revises: a9d3c5e7f180
+Create Date: 2026-10-19 21:27:40.583102
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8f2a6c913'
+down_revision = 'a9d3c5e7f180'
+branch_labels = None
+depends_on = None
+
+# Same accent-insensitive trigram setup as the transaction search indexes
+TRIGRAM_INDEXES = [
+    ("ix_todo_title_trgm", "todo", "title"),
+    ("ix_todo_description_trgm", "todo", "description"),
+    ("ix_roadmapmilestone_title_trgm", "roadmapmilestone", "title"),
+    ("ix_roadmapmilestone_description_trgm", "roadmapmilestone", "description"),
+    ("ix_resourcesubject_title_trgm", "resourcesubject", "title"),
+    ("ix_resourcesubject_description_trgm", "resourcesubject", "description"),
+]
+
+
+def upgrade():
+    for name, table, column in TRIGRAM_INDEXES:
+        op.execute(
+            f"CREATE INDEX {name} ON {table} USING gin (immutable_unaccent({column}) gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    for name, _, _ in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,38 @@
+"""Add word indexes for short todo, milestone and subject searches
+
+Revision ID: e7c2a9d4f615
+Revises: b4e8f2a6c913
+Create Date: 2026-10-20 09:12:03.218447
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c2a9d4f615'
+down_revision = 'b4e8f2a6c913'
+branch_labels = None
+depends_on = None
+
+# Search terms too short for trigrams are prefix-matched against these
+WORD_INDEXES = [
+    ("ix_todo_title_words", "todo", "title"),
+    ("ix_todo_description_words", "todo", "description"),
+    ("ix_roadmapmilestone_title_words", "roadmapmilestone", "title"),
+    ("ix_roadmapmilestone_description_words", "roadmapmilestone", "description"),
+    ("ix_resourcesubject_title_words", "resourcesubject", "title"),
+    ("ix_resourcesubject_description_words", "resourcesubject", "description"),
+]
+
+
+def upgrade():
+    for name, table, column in WORD_INDEXES:
+        op.execute(
+            f"CREATE INDEX {name} ON {table} USING gin "
+            f"(to_tsvector('simple'::regconfig, immutable_unaccent({column})))"
+        )
+
+
+def downgrade():
+    for name, _, _ in WORD_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,66 @@
+"""Add full-text and trigram search indexes
+
+Revision ID: f4b8d2e6a179
+Revises: e7c3a9f1d254
+Create Date: 2026-10-19 19:32:08.914552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b8d2e6a179'
+down_revision = 'e7c3a9f1d254'
+branch_labels = None
+depends_on = None
+
+TRANSACTION_VECTOR = (
+    "setweight(to_tsvector('simple', immutable_unaccent(coalesce(merchant, ''))), 'A')"
+    " || setweight(to_tsvector('simple', immutable_unaccent(coalesce(note, ''))), 'B')"
+)
+EMAIL_VECTOR = (
+    "setweight(to_tsvector('simple', immutable_unaccent(coalesce(merchant, ''))), 'A')"
+    " || setweight(to_tsvector('simple', immutable_unaccent(coalesce(subject, ''))), 'B')"
+)
+TRIGRAM_INDEXES = [
+    ("ix_transaction_merchant_trgm", "transaction", "merchant"),
+    ("ix_transaction_note_trgm", "transaction", "note"),
+    ("ix_emailtransaction_merchant_trgm", "emailtransaction", "merchant"),
+]
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # unaccent() is only STABLE (its dictionary could change), so it cannot be
+    # used in generated columns or indexes; pinning the dictionary makes it safe
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+
+    # Adding a stored generated column rewrites the table once
+    op.add_column('transaction', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(TRANSACTION_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_transaction_search_vector', 'transaction', ['search_vector'], unique=False, postgresql_using='gin')
+    op.add_column('emailtransaction', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(EMAIL_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_emailtransaction_search_vector', 'emailtransaction', ['search_vector'], unique=False, postgresql_using='gin')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.execute(
+            f"CREATE INDEX {name} ON {table} USING gin (immutable_unaccent({column}) gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    for name, _, _ in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.drop_index('ix_emailtransaction_search_vector', table_name='emailtransaction', postgresql_using='gin')
+    op.drop_column('emailtransaction', 'search_vector')
+    op.drop_index('ix_transaction_search_vector', table_name='transaction', postgresql_using='gin')
+    op.drop_column('transaction', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
+    # The extensions stay: other objects may have come to rely on them
@@ -3,15 +3,20 @@ from fastapi import APIRouter
 from app.api.routes import (
     accounts,
     allocation_rules,
+    analytics,
     categories,
     feedback,
+    fx_rates,
     gmail,
     items,
     login,
     monthly_reports,
     private,
+    reconciliation,
+    recurring,
     resources,
     roadmap,
+    search,
     todos,
     transactions,
     users,
@@ -34,6 +39,11 @@ api_router.include_router(roadmap.router)
 api_router.include_router(resources.router, prefix="/resources", tags=["resources"])
 api_router.include_router(gmail.router)
 api_router.include_router(feedback.router)
+api_router.include_router(analytics.router)
+api_router.include_router(reconciliation.router)
+api_router.include_router(recurring.router)
+api_router.include_router(fx_rates.router)
+api_router.include_router(search.router)
 
 
 if settings.ENVIRONMENT == "local":
@@ -1,15 +1,18 @@
 import uuid
+from datetime import date
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from app import crud
 from app.api.deps import CurrentUser, SessionDep
 from app.models import (
+    AccountBalancesPublic,
     AccountCreate,
     AccountPublic,
     AccountsPublic,
     AccountUpdate,
+    BalanceHistoryPublic,
     Message,
 )
 
@@ -29,6 +32,51 @@ def read_accounts(
     return AccountsPublic(data=accounts, count=count)
 
 
+@router.get("/balances", response_model=AccountBalancesPublic)
+def read_account_balances(session: SessionDep, current_user: CurrentUser) -> Any:
+    """
+    Current balance of every account of the current user.
+    """
+    balances = crud.get_account_balances(session=session, user_id=current_user.id)
+    return AccountBalancesPublic(data=balances, count=len(balances))
+
+
+@router.get("/{account_id}/balance-history", response_model=BalanceHistoryPublic)
+def read_balance_history(
+    session: SessionDep,
+    current_user: CurrentUser,
+    account_id: uuid.UUID,
+    start_date: date | None = Query(None, description="Inclusive start date"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+) -> Any:
+    """
+    Transactions of an account, oldest first, with the running balance after each.
+    """
+    account = crud.get_account(session=session, account_id=account_id)
+    if not account:
+        raise HTTPException(
+            status_code=404,
+            detail="The account with this id does not exist in the system",
+        )
+    if account.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="Not enough permissions",
+        )
+    try:
+        return crud.get_balance_history(
+            session=session,
+            user_id=current_user.id,
+            account_id=account_id,
+            start_date=start_date,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/", response_model=AccountPublic)
 def create_account(
     *, session: SessionDep, current_user: CurrentUser, account_in: AccountCreate
@@ -1,7 +1,8 @@
 import uuid
+from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from app import crud
 from app.api.deps import CurrentUser, SessionDep
@@ -10,6 +11,8 @@ from app.models import (
     AllocationRulePublic,
     AllocationRulesPublic,
     AllocationRuleUpdate,
+    BudgetAlertPublic,
+    BudgetAlertsPublic,
     Message,
 )
 
@@ -45,6 +48,47 @@ def create_allocation_rule(
     return allocation_rule
 
 
+@router.get("/alerts", response_model=BudgetAlertsPublic)
+def read_budget_alerts(
+    session: SessionDep,
+    current_user: CurrentUser,
+    since: datetime | None = Query(
+        None, description="Only alerts raised after this time, e.g. the last poll"
+    ),
+    include_acknowledged: bool = False,
+    limit: int = Query(100, ge=1, le=500),
+) -> Any:
+    """
+    Budget alerts raised when a group's spending reaches a threshold of its allocation.
+    """
+    alerts = crud.get_budget_alerts(
+        session=session,
+        user_id=current_user.id,
+        since=since,
+        include_acknowledged=include_acknowledged,
+        limit=limit,
+    )
+    return BudgetAlertsPublic(data=alerts, count=len(alerts))
+
+
+@router.post("/alerts/{alert_id}/acknowledge", response_model=BudgetAlertPublic)
+def acknowledge_budget_alert(
+    *, session: SessionDep, current_user: CurrentUser, alert_id: uuid.UUID
+) -> Any:
+    """
+    Mark a budget alert as seen.
+    """
+    alert = crud.get_budget_alert(session=session, alert_id=alert_id)
+    if not alert:
+        raise HTTPException(status_code=404, detail="Budget alert not found")
+    if alert.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="Not enough permissions",
+        )
+    return crud.acknowledge_budget_alert(session=session, db_alert=alert)
+
+
 @router.patch("/{allocation_rule_id}", response_model=AllocationRulePublic)
 def update_allocation_rule(
     *,
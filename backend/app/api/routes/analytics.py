@@ -0,0 +1,202 @@
+import os
+import uuid
+from datetime import date
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from app import crud
+from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.models import (
+    AnalyticsSnapshotPublic,
+    AnalyticsSnapshotsPublic,
+    CategoryTrends,
+    MerchantTotals,
+    ReportCacheStats,
+    RollingTotals,
+    SnapshotFormat,
+    TxnType,
+)
+from app.services.analytics_service import (
+    analytics_cache,
+    category_trends,
+    rolling_totals,
+    top_merchants,
+)
+from app.services.snapshot_service import (
+    SNAPSHOT_TABLES,
+    SnapshotUnavailableError,
+    create_user_snapshot,
+    snapshot_file_path,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+MAX_TREND_MONTHS = 120
+MAX_ROLLING_DAYS = 3660
+
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="Start date must be before end date")
+
+
+# ========= COLUMNAR SNAPSHOTS =========
+@router.post("/snapshots", response_model=AnalyticsSnapshotPublic)
+def create_snapshot(
+    session: SessionDep,
+    current_user: CurrentUser,
+    fmt: SnapshotFormat = Query(SnapshotFormat.parquet, alias="format"),
+    incremental: bool = Query(
+        True, description="Only include rows changed since the last snapshot"
+    ),
+) -> Any:
+    """
+    Write a columnar snapshot of the current user's ledger data.
+    """
+    try:
+        snapshot = create_user_snapshot(
+            session=session,
+            user_id=current_user.id,
+            fmt=fmt,
+            incremental=incremental,
+        )
+    except SnapshotUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return snapshot
+
+
+@router.get("/snapshots", response_model=AnalyticsSnapshotsPublic)
+def read_snapshots(
+    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+) -> Any:
+    """
+    Retrieve analytics snapshots for current user, newest first.
+    """
+    snapshots, count = crud.get_analytics_snapshots(
+        session=session, user_id=current_user.id, skip=skip, limit=limit
+    )
+    return AnalyticsSnapshotsPublic(data=snapshots, count=count)
+
+
+@router.get("/snapshots/{snapshot_id}/{table}")
+def download_snapshot_table(
+    session: SessionDep,
+    current_user: CurrentUser,
+    snapshot_id: uuid.UUID,
+    table: str,
+) -> FileResponse:
+    """
+    Download one table file of a snapshot.
+    """
+    if table not in SNAPSHOT_TABLES:
+        raise HTTPException(status_code=404, detail="Snapshot table not found")
+    snapshot = crud.get_analytics_snapshot(session=session, snapshot_id=snapshot_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    if snapshot.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    path = snapshot_file_path(snapshot, table)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Snapshot file no longer exists")
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=os.path.basename(path),
+    )
+
+
+# ========= CACHED QUERIES =========
+@router.get("/category-trends", response_model=CategoryTrends)
+def read_category_trends(
+    session: SessionDep,
+    current_user: CurrentUser,
+    start_date: date = Query(..., description="Any day of the first month"),
+    end_date: date = Query(..., description="Any day of the last month"),
+    txn_type: TxnType = Query(TxnType.expense, alias="type"),
+    account_id: uuid.UUID | None = None,
+) -> Any:
+    """
+    Monthly totals per category, largest category first.
+    """
+    _check_range(start_date, end_date)
+    months = (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+    if months > MAX_TREND_MONTHS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_TREND_MONTHS} months per request"
+        )
+    return category_trends(
+        session=session,
+        user_id=current_user.id,
+        start_month=start_date.replace(day=1),
+        end_month=end_date.replace(day=1),
+        txn_type=txn_type,
+        account_id=account_id,
+    )
+
+
+@router.get("/rolling", response_model=RollingTotals)
+def read_rolling_totals(
+    session: SessionDep,
+    current_user: CurrentUser,
+    start_date: date = Query(..., description="Inclusive start date"),
+    end_date: date = Query(..., description="Inclusive end date"),
+    window: int = Query(30, ge=1, le=365, description="Window length in days"),
+    txn_type: TxnType = Query(TxnType.expense, alias="type"),
+    account_id: uuid.UUID | None = None,
+) -> Any:
+    """
+    Daily totals with their trailing rolling average.
+    """
+    _check_range(start_date, end_date)
+    if (end_date - start_date).days >= MAX_ROLLING_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_ROLLING_DAYS} days per request"
+        )
+    return rolling_totals(
+        session=session,
+        user_id=current_user.id,
+        start_date=start_date,
+        end_date=end_date,
+        window_days=window,
+        txn_type=txn_type,
+        account_id=account_id,
+    )
+
+
+@router.get("/top-merchants", response_model=MerchantTotals)
+def read_top_merchants(
+    session: SessionDep,
+    current_user: CurrentUser,
+    start_date: date = Query(..., description="Inclusive start date"),
+    end_date: date = Query(..., description="Inclusive end date"),
+    limit: int = Query(10, ge=1, le=100),
+    txn_type: TxnType = Query(TxnType.expense, alias="type"),
+    account_id: uuid.UUID | None = None,
+) -> Any:
+    """
+    Merchants with the largest totals; count is the number of distinct merchants.
+    """
+    _check_range(start_date, end_date)
+    return top_merchants(
+        session=session,
+        user_id=current_user.id,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        txn_type=txn_type,
+        account_id=account_id,
+    )
+
+
+@router.get(
+    "/cache/stats",
+    response_model=ReportCacheStats,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def read_analytics_cache_stats() -> Any:
+    """
+    Hit/miss counters and memory use of this process's column-oriented transaction cache.
+    """
+    return analytics_cache.stats()
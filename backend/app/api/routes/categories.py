@@ -7,11 +7,13 @@ from app import crud
 from app.api.deps import CurrentUser, SessionDep
 from app.models import (
     CategoriesPublic,
+    CategorizationStats,
     CategoryCreate,
     CategoryPublic,
     CategoryUpdate,
     Message,
 )
+from app.services.categorization_service import get_categorization_stats
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
@@ -50,6 +52,29 @@ def create_category(
     return category
 
 
+@router.post("/auto-categorization/rebuild", response_model=Message)
+def rebuild_auto_categorization_index(
+    session: SessionDep, current_user: CurrentUser
+) -> Any:
+    """
+    Rebuild the merchant-to-category index from the user's categorized transactions.
+    """
+    entries = crud.rebuild_merchant_category_index(
+        session=session, user_id=current_user.id
+    )
+    return Message(message=f"Rebuilt auto-categorization index with {entries} entries")
+
+
+@router.get("/auto-categorization/stats", response_model=CategorizationStats)
+def read_auto_categorization_stats(
+    session: SessionDep, current_user: CurrentUser
+) -> Any:
+    """
+    Index size and ingest hit rate of the merchant-to-category index.
+    """
+    return get_categorization_stats(session=session, user_id=current_user.id)
+
+
 @router.patch("/{category_id}", response_model=CategoryPublic)
 def update_category(
     *,
@@ -9,12 +9,11 @@ from app.models import (
     Feedback,
     FeedbackCreate,
     FeedbackPublic,
-    FeedbackUpdate,
     FeedbacksPublic,
+    FeedbackUpdate,
     User,
 )
 
-
 router = APIRouter(prefix="/api/v1/feedback", tags=["feedback"])
 
 
@@ -0,0 +1,61 @@
+import io
+from datetime import date
+from typing import Any
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+
+from app import crud
+from app.api.deps import SessionDep, get_current_active_superuser, get_current_user
+from app.models import FxRateImportResult, FxRatesPublic
+from app.services.fx_service import load_fx_rates
+
+router = APIRouter(prefix="/fx-rates", tags=["fx-rates"])
+
+
+@router.get("/", response_model=FxRatesPublic, dependencies=[Depends(get_current_user)])
+def read_fx_rates(
+    session: SessionDep,
+    currency: str | None = None,
+    start_date: date | None = Query(None, description="Inclusive start date"),
+    end_date: date | None = Query(None, description="Inclusive end date"),
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page; skip is ignored"
+    ),
+) -> Any:
+    """
+    Daily FX rates to the base currency, newest first.
+    """
+    try:
+        page = crud.get_fx_rates(
+            session=session,
+            currency=currency,
+            start_date=start_date,
+            end_date=end_date,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FxRatesPublic(data=page.items, count=page.count, next_cursor=page.next_cursor)
+
+
+@router.post(
+    "/import",
+    response_model=FxRateImportResult,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def import_fx_rates(
+    session: SessionDep,
+    file: UploadFile = File(..., description="CSV with date, currency and rate columns"),
+) -> Any:
+    """
+    Load daily FX rates; existing rates of the same day are overwritten.
+    """
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return load_fx_rates(session=session, lines=lines)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
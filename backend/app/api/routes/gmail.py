@@ -1,34 +1,48 @@
+import logging
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict
 
-import logging
+import jwt
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
 from app import crud
 from app.api.deps import CurrentUser, SessionDep, get_valid_gmail_connection_with_token
+from app.core import security
+from app.core.config import settings
+from app.core.db import engine
+from app.crud.email_transaction import EMAIL_TRANSACTION_EXPORT_COLUMNS
 from app.models import (
     EmailTransaction,
+    EmailTransactionBulkUpdate,
+    EmailTransactionBulkUpdateResult,
+    EmailTransactionConversionRequest,
+    EmailTransactionConversionResults,
     EmailTransactionCreate,
     EmailTransactionPublic,
-    EmailTransactionUpdate,
     EmailTransactionsPublic,
+    EmailTransactionUpdate,
     EmailTxnDashboard,
+    ExportFormat,
     GmailConnection,
     GmailConnectionCreate,
     GmailConnectionPublic,
-    GmailConnectionUpdate,
     GmailConnectionsPublic,
+    GmailConnectionUpdate,
     Message,
     TransactionCreate,
     TransactionPublic,
 )
-from app.services.gmail_service import EmailTransactionProcessor, GmailService, EmailPatterns
+from app.services.categorization_service import load_category_index
+from app.services.export_service import export_response
+from app.services.gmail_service import (
+    EmailPatterns,
+    EmailTransactionProcessor,
+    GmailService,
+)
 from app.utils import decrypt_token, encrypt_token, is_token_expired, normalize_to_utc
-from app.core import security
-from app.core.config import settings
-import jwt
 
 router = APIRouter(prefix="/gmail", tags=["gmail"])
 logger = logging.getLogger(__name__)
@@ -43,7 +57,7 @@ def get_gmail_connections(
     limit: int = Query(100, ge=1, le=100),
 ) -> Any:
     """Get all Gmail connections for the current user."""
-    connections = crud.get_gmail_connections(
+    connections, count = crud.get_gmail_connections(
         session=session, user_id=current_user.id, skip=skip, limit=limit
     )
     
@@ -53,7 +67,7 @@ def get_gmail_connections(
         public_conn = GmailConnectionPublic.model_validate(conn)
         public_connections.append(public_conn)
     
-    return GmailConnectionsPublic(data=public_connections, count=len(public_connections))
+    return GmailConnectionsPublic(data=public_connections, count=count)
 
 
 @router.post("/connect", response_model=dict)
@@ -279,45 +293,60 @@ def get_email_transactions(
         if not connection or connection.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Gmail connection not found")
     
-    # Get transactions based on filters
+    transactions, total_count = crud.get_email_transactions_for_all_connections(
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        status=status,
+        sort_by=sort_by,
+        gmail_connection_id=connection_id,
+    )
+    return EmailTransactionsPublic(data=transactions, count=total_count)
+
+
+@router.get("/email-transactions/export")
+def export_email_transactions(
+    session: SessionDep,
+    current_user: CurrentUser,
+    connection_id: uuid.UUID | None = Query(None, description="Gmail connection ID (optional, defaults to all user's connections)"),
+    fmt: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    start_date: date | None = Query(None, description="Inclusive start date (received_at)"),
+    end_date: date | None = Query(None, description="Inclusive end date (received_at)"),
+    account_number: str | None = Query(None, description="Filter by bank account number"),
+    category_id: uuid.UUID | None = None,
+    status: str | None = Query(None, description="Filter by status (pending, processed, ignored)"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
+) -> StreamingResponse:
+    """Stream email transactions of the current user as CSV or NDJSON."""
     if connection_id:
-        # Single connection logic
-        if status:
-            if status == "pending":
-                transactions = crud.get_pending_email_transactions(
-                    session=session, gmail_connection_id=connection_id, skip=skip, limit=limit, sort_by=sort_by
-                )
-            else:
-                # For other statuses, we need to filter by status
-                transactions = crud.get_email_transactions(
-                    session=session, gmail_connection_id=connection_id, skip=skip, limit=limit, sort_by=sort_by
-                )
-                transactions = [t for t in transactions if t.status == status]
-            total_count = crud.count_email_transactions(
-                session=session, gmail_connection_id=connection_id, status=status
-            )
-        else:
-            transactions = crud.get_email_transactions(
-                session=session, gmail_connection_id=connection_id, skip=skip, limit=limit, sort_by=sort_by
-            )
-            total_count = crud.count_email_transactions(
-                session=session, gmail_connection_id=connection_id, status=status
+        connection = crud.get_gmail_connection(session=session, connection_id=connection_id)
+        if not connection or connection.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Gmail connection not found")
+    user_id = current_user.id
+
+    def rows() -> Any:
+        # The request session is closed before the body is streamed, so the
+        # export reads through its own session for the lifetime of the stream.
+        with Session(engine) as export_session:
+            yield from crud.iter_email_transactions_for_export(
+                session=export_session,
+                user_id=user_id,
+                gmail_connection_id=connection_id,
+                start_date=start_date,
+                end_date=end_date,
+                account_number=account_number,
+                category_id=category_id,
+                status=status,
             )
-    else:
-        # All connections logic - use new CRUD function
-        transactions, total_count = crud.get_email_transactions_for_all_connections(
-            session=session, user_id=current_user.id, skip=skip, limit=limit, status=status, sort_by=sort_by
-        )
-    
-    # Create public transactions with category names
-    public_transactions = []
-    for t in transactions:
-        transaction_dict = t.model_dump()
-        if t.category:
-            transaction_dict['category_name'] = t.category.name
-        public_transactions.append(EmailTransactionPublic.model_validate(transaction_dict))
-    
-    return EmailTransactionsPublic(data=public_transactions, count=total_count)
+
+    return export_response(
+        rows(),
+        columns=EMAIL_TRANSACTION_EXPORT_COLUMNS,
+        fmt=fmt,
+        filename="email-transactions",
+        compress=gzip,
+    )
 
 
 @router.post("/sync-emails", response_model=Message)
@@ -341,6 +370,7 @@ def sync_emails(
         emails = gmail_service.search_all_transaction_emails(access_token, batch_size=batch_size)
         
         processor = EmailTransactionProcessor()
+        category_index = load_category_index(session=session, user_id=current_user.id)
         synced_count = 0
         skipped_count = 0
         
@@ -368,7 +398,8 @@ def sync_emails(
                 merchant=transaction_info.get('merchant'),
                 account_number=transaction_info.get('account_number'),
                 transaction_type=transaction_info.get('transaction_type'),
-                raw_content=email['body']
+                raw_content=email['body'],
+                category_id=category_index.suggest(transaction_info.get('merchant')),
             )
             
             crud.create_email_transaction(
@@ -437,6 +468,7 @@ def sync_emails_batch(
                 emails.append(email_detail)
         
         processor = EmailTransactionProcessor()
+        category_index = load_category_index(session=session, user_id=current_user.id)
         synced_count = 0
         skipped_count = 0
         
@@ -464,7 +496,8 @@ def sync_emails_batch(
                 merchant=transaction_info.get('merchant'),
                 account_number=transaction_info.get('account_number'),
                 transaction_type=transaction_info.get('transaction_type'),
-                raw_content=email['body']
+                raw_content=email['body'],
+                category_id=category_index.suggest(transaction_info.get('merchant')),
             )
             
             crud.create_email_transaction(
@@ -516,6 +549,7 @@ def sync_emails_by_month(
         emails = gmail_service.search_transaction_emails_by_month(access_token, year, month, max_results=max_results)
         
         processor = EmailTransactionProcessor()
+        category_index = load_category_index(session=session, user_id=current_user.id)
         synced_count = 0
         
         for email in emails:
@@ -541,7 +575,8 @@ def sync_emails_by_month(
                 merchant=transaction_info.get('merchant'),
                 account_number=transaction_info.get('account_number'),
                 transaction_type=transaction_info.get('transaction_type'),
-                raw_content=email['body']
+                raw_content=email['body'],
+                category_id=category_index.suggest(transaction_info.get('merchant')),
             )
             
             crud.create_email_transaction(
@@ -560,6 +595,47 @@ def sync_emails_by_month(
         raise HTTPException(status_code=400, detail=f"Failed to sync emails for {year}/{month:02d}: {str(e)}")
 
 
+@router.patch("/email-transactions/bulk", response_model=EmailTransactionBulkUpdateResult)
+def bulk_update_email_transactions(
+    session: SessionDep,
+    current_user: CurrentUser,
+    bulk_in: EmailTransactionBulkUpdate,
+) -> Any:
+    """Apply one update to many email transactions selected by ids or by filter."""
+    updates = bulk_in.update
+    if updates.category_id is not None:
+        category = crud.get_category(session=session, category_id=updates.category_id)
+        if not category:
+            raise HTTPException(status_code=404, detail="Category not found")
+        if category.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+    if updates.linked_transaction_id is not None:
+        transaction = crud.get_transaction(
+            session=session, transaction_id=updates.linked_transaction_id
+        )
+        if not transaction:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+        if transaction.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+    if bulk_in.filter is not None and bulk_in.filter.gmail_connection_id is not None:
+        connection = crud.get_gmail_connection(
+            session=session, connection_id=bulk_in.filter.gmail_connection_id
+        )
+        if not connection:
+            raise HTTPException(status_code=404, detail="Gmail connection not found")
+        if connection.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    updated_ids = crud.bulk_update_email_transactions(
+        session=session,
+        user_id=current_user.id,
+        updates=updates,
+        transaction_ids=bulk_in.ids,
+        filters=bulk_in.filter,
+    )
+    return EmailTransactionBulkUpdateResult(ids=updated_ids, count=len(updated_ids))
+
+
 @router.patch("/email-transactions/{transaction_id}", response_model=EmailTransactionPublic)
 def update_email_transaction(
     session: SessionDep,
@@ -677,6 +753,7 @@ def trigger_auto_sync(
         emails = gmail_service.search_recent_transaction_emails(access_token, days=7)
         
         processor = EmailTransactionProcessor()
+        category_index = load_category_index(session=session, user_id=current_user.id)
         synced_count = 0
         
         for email in emails:
@@ -702,7 +779,8 @@ def trigger_auto_sync(
                 merchant=transaction_info.get('merchant'),
                 account_number=transaction_info.get('account_number'),
                 transaction_type=transaction_info.get('transaction_type'),
-                raw_content=email['body']
+                raw_content=email['body'],
+                category_id=category_index.suggest(transaction_info.get('merchant')),
             )
             
             crud.create_email_transaction(
@@ -792,6 +870,28 @@ def trigger_sync_all_connections(
 
 
 # ========= EMAIL TRANSACTION TO TRANSACTION CONVERSION =========
+@router.post("/email-transactions/create-transactions", response_model=EmailTransactionConversionResults)
+def create_transactions_from_emails(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    conversion_in: EmailTransactionConversionRequest,
+) -> Any:
+    """
+    Create transactions from many email transactions in one database transaction.
+
+    Each item is validated on its own; the response reports the created
+    transaction id or the error for every item, in request order.
+    """
+    results = crud.convert_email_transactions(
+        session=session, user_id=current_user.id, conversions=conversion_in.items
+    )
+    created_count = sum(1 for r in results if r.transaction_id is not None)
+    return EmailTransactionConversionResults(
+        data=results, created_count=created_count, count=len(results)
+    )
+
+
 @router.post("/email-transactions/{email_transaction_id}/create-transaction", response_model=TransactionPublic)
 def create_transaction_from_email(
     *,
@@ -2,22 +2,27 @@ import uuid
 from datetime import date, datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlmodel import Session, select, func, and_
 
 from app import crud
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_active_superuser, get_current_user, get_db
 from app.models import (
+    BudgetReport,
+    CategoryGrowthReport,
     MonthlyFinancialReport, 
     MonthlyFinancialSummary, 
     MonthlyFinancialReports,
-    Transaction, 
+    ReportCacheStats,
     AllocationRule,
     TransactionPublic,
     AllocationRulePublic,
     User,
     TxnType
 )
+from app.services.budget_service import compute_budget
+from app.services.report_cache import report_cache
+from app.services.trend_service import compute_growth_report
 
 router = APIRouter()
 
@@ -37,64 +42,44 @@ def get_monthly_financial_summary(
     if month < 1 or month > 12:
         raise HTTPException(status_code=400, detail="Month must be between 1 and 12")
     
-    # Calculate date range for the month
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1)
-    else:
-        end_date = date(year, month + 1, 1)
-    
-    # Get transactions for the month
-    transaction_statement = (
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.txn_date >= start_date)
-        .where(Transaction.txn_date < end_date)
-    )
-    transactions = db.exec(transaction_statement).all()
-    
-    # Get income transactions for the month
-    income_transactions = [txn for txn in transactions if txn.type == TxnType.income]
-    
-    # Calculate totals
-    total_income = sum(txn.amount for txn in transactions if txn.type == TxnType.income)
-    total_expenses = sum(txn.amount for txn in transactions if txn.type == TxnType.expense)
-    net_amount = total_income - total_expenses
-    
-    # Calculate category breakdown
-    category_breakdown = {}
-    for txn in transactions:
-        if txn.category:
-            category_name = txn.category.name
-            if category_name not in category_breakdown:
-                category_breakdown[category_name] = 0.0
-            if txn.type == TxnType.expense:
-                category_breakdown[category_name] += txn.amount
-            else:
-                category_breakdown[category_name] -= txn.amount
-    
-    # Calculate account breakdown
-    account_breakdown = {}
-    for txn in transactions:
-        account_name = txn.account.name
-        if account_name not in account_breakdown:
-            account_breakdown[account_name] = 0.0
-        if txn.type == TxnType.expense:
-            account_breakdown[account_name] -= txn.amount
-        else:
-            account_breakdown[account_name] += txn.amount
-    
-    return MonthlyFinancialSummary(
+    start_date, end_date = crud.get_month_bounds(year, month)
+    
+    # Read the version before computing so a concurrent write can only make
+    # the stored payload fresher than its version, never staler
+    version = _month_version(db, current_user.id, start_date)
+    cache_key = (current_user.id, year, month, "summary")
+    cached = report_cache.get(cache_key, version)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Totals and breakdowns are aggregated in the database
+    totals = crud.get_type_totals(
+        session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+    )
+    total_income, _ = totals[TxnType.income]
+    total_expenses, expense_count = totals[TxnType.expense]
+    category_breakdown = crud.get_category_breakdown(
+        session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+    )
+    account_breakdown = crud.get_account_breakdown(
+        session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+    )
+    unconverted = crud.get_unconverted_amounts(
+        session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+    )
+    
+    summary = MonthlyFinancialSummary(
         year=year,
         month=month,
-        total_income=total_income,
         total_expenses=total_expenses,
-        net_amount=net_amount,
-        income_count=len(income_transactions),
-        expense_count=len([t for t in transactions if t.type == TxnType.expense]),
+        net_amount=total_income - total_expenses,
+        expense_count=expense_count,
         category_breakdown=category_breakdown,
-        account_breakdown=account_breakdown
+        account_breakdown=account_breakdown,
+        unconverted=unconverted.get(start_date, {}),
     )
+    report_cache.put(cache_key, version, summary.model_dump_json().encode())
+    return summary
 
 
 @router.get("/detailed/{year}/{month}", response_model=MonthlyFinancialReport)
@@ -112,49 +97,45 @@ def get_monthly_financial_report(
     if month < 1 or month > 12:
         raise HTTPException(status_code=400, detail="Month must be between 1 and 12")
     
-    # Calculate date range for the month
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1)
-    else:
-        end_date = date(year, month + 1, 1)
-    
-    # Get transactions for the month
-    transaction_statement = (
-        select(Transaction)
-        .where(Transaction.user_id == current_user.id)
-        .where(Transaction.txn_date >= start_date)
-        .where(Transaction.txn_date < end_date)
-    )
-    transactions = db.exec(transaction_statement).all()
+    start_date, end_date = crud.get_month_bounds(year, month)
     
-    # Get income transactions for the month
-    income_transactions = [txn for txn in transactions if txn.type == TxnType.income]
+    version = _month_version(db, current_user.id, start_date)
+    cache_key = (current_user.id, year, month, "detailed")
+    cached = report_cache.get(cache_key, version)
+    if cached is not None:
+        report = MonthlyFinancialReport.model_validate_json(cached)
+    else:
+        totals = crud.get_type_totals(
+            session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+        )
+        total_income, _ = totals[TxnType.income]
+        total_expenses, expense_count = totals[TxnType.expense]
+        transactions = crud.get_transactions_by_month(
+            session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+        ).get((year, month), [])
+        unconverted = crud.get_unconverted_amounts(
+            session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+        )
+        report = MonthlyFinancialReport(
+            year=year,
+            month=month,
+            total_expenses=total_expenses,
+            net_amount=total_income - total_expenses,
+            expense_count=expense_count,
+            unconverted=unconverted.get(start_date, {}),
+            transactions=[TransactionPublic.model_validate(txn) for txn in transactions],
+        )
+        report_cache.put(cache_key, version, report.model_dump_json().encode())
     
-    # Get allocation rules (global ones, not sprint-specific)
-    allocation_statement = (
-        select(AllocationRule)
-        .where(AllocationRule.user_id == current_user.id)
-        .where(AllocationRule.sprint_id.is_(None))
+    # Allocation rules are not versioned with the month, attach them fresh
+    allocation_statement = select(AllocationRule).where(
+        AllocationRule.user_id == current_user.id
     )
     allocation_rules = db.exec(allocation_statement).all()
-    
-    # Calculate totals
-    total_income = sum(txn.amount for txn in transactions if txn.type == TxnType.income)
-    total_expenses = sum(txn.amount for txn in transactions if txn.type == TxnType.expense)
-    net_amount = total_income - total_expenses
-    
-    return MonthlyFinancialReport(
-        year=year,
-        month=month,
-        total_income=total_income,
-        total_expenses=total_expenses,
-        net_amount=net_amount,
-        income_count=len(income_transactions),
-        expense_count=len([t for t in transactions if t.type == TxnType.expense]),
-        transactions=[TransactionPublic.model_validate(txn) for txn in transactions],
-        allocation_rules=[AllocationRulePublic.model_validate(rule) for rule in allocation_rules]
-    )
+    report.allocation_rules = [
+        AllocationRulePublic.model_validate(rule) for rule in allocation_rules
+    ]
+    return report
 
 
 @router.get("/range", response_model=MonthlyFinancialReports)
@@ -165,6 +146,9 @@ def get_monthly_financial_reports_range(
     start_month: int = Query(..., description="Start month (1-12)"),
     end_year: int = Query(..., description="End year"),
     end_month: int = Query(..., description="End month (1-12)"),
+    include_transactions: bool = Query(
+        False, description="Include each month's transactions in the response"
+    ),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
@@ -177,44 +161,57 @@ def get_monthly_financial_reports_range(
     if start_year > end_year or (start_year == end_year and start_month > end_month):
         raise HTTPException(status_code=400, detail="Start date must be before end date")
     
+    start_date, _ = crud.get_month_bounds(start_year, start_month)
+    end_month_start, end_date = crud.get_month_bounds(end_year, end_month)
+    
+    versions = crud.get_report_versions(
+        session=db,
+        user_id=current_user.id,
+        start_month=start_date,
+        end_month=end_month_start,
+    )
+    version = tuple(sorted(versions.items()))
+    cache_key = (
+        current_user.id, start_year, start_month, "range", end_year, end_month, include_transactions
+    )
+    cached = report_cache.get(cache_key, version)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # One grouped query for all months, one ordered query for the payloads
+    totals_by_month = crud.get_monthly_type_totals(
+        session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+    )
+    unconverted_by_month = crud.get_unconverted_amounts(
+        session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+    )
+    transactions_by_month = {}
+    if include_transactions:
+        transactions_by_month = crud.get_transactions_by_month(
+            session=db, user_id=current_user.id, start_date=start_date, end_date=end_date
+        )
+    
     reports = []
     current_year = start_year
     current_month = start_month
     
     while current_year < end_year or (current_year == end_year and current_month <= end_month):
-        # Calculate date range for the current month
-        start_date = date(current_year, current_month, 1)
-        if current_month == 12:
-            end_date = date(current_year + 1, 1, 1)
-        else:
-            end_date = date(current_year, current_month + 1, 1)
-        
-        # Get transactions for the month
-        transaction_statement = (
-            select(Transaction)
-            .where(Transaction.user_id == current_user.id)
-            .where(Transaction.txn_date >= start_date)
-            .where(Transaction.txn_date < end_date)
-        )
-        transactions = db.exec(transaction_statement).all()
-        
-        # Get income transactions for the month
-        income_transactions = [txn for txn in transactions if txn.type == TxnType.income]
-        
-        # Calculate totals
-        total_income = sum(txn.amount for txn in transactions if txn.type == TxnType.income)
-        total_expenses = sum(txn.amount for txn in transactions if txn.type == TxnType.expense)
-        net_amount = total_income - total_expenses
+        key = (current_year, current_month)
+        totals = totals_by_month.get(key, {})
+        total_income, _ = totals.get(TxnType.income, (0.0, 0))
+        total_expenses, expense_count = totals.get(TxnType.expense, (0.0, 0))
         
         reports.append(MonthlyFinancialReport(
             year=current_year,
             month=current_month,
-            total_income=total_income,
             total_expenses=total_expenses,
-            net_amount=net_amount,
-            income_count=len(income_transactions),
-            expense_count=len([t for t in transactions if t.type == TxnType.expense]),
-            transactions=[TransactionPublic.model_validate(txn) for txn in transactions],
+            net_amount=total_income - total_expenses,
+            expense_count=expense_count,
+            unconverted=unconverted_by_month.get(date(current_year, current_month, 1), {}),
+            transactions=[
+                TransactionPublic.model_validate(txn)
+                for txn in transactions_by_month.get(key, [])
+            ],
             allocation_rules=[]
         ))
         
@@ -224,4 +221,121 @@ def get_monthly_financial_reports_range(
             current_month = 1
             current_year += 1
     
-    return MonthlyFinancialReports(data=reports, count=len(reports))
+    result = MonthlyFinancialReports(data=reports, count=len(reports))
+    report_cache.put(cache_key, version, result.model_dump_json().encode())
+    return result
+
+
+@router.get("/budget", response_model=BudgetReport)
+def get_budget_report(
+    *,
+    db: Session = Depends(get_db),
+    start_year: int = Query(..., description="Start year"),
+    start_month: int = Query(..., description="Start month (1-12)"),
+    end_year: int = Query(..., description="End year"),
+    end_month: int = Query(..., description="End month (1-12)"),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Allocated vs spent vs remaining per category group for each month of a range.
+    """
+    if start_month < 1 or start_month > 12 or end_month < 1 or end_month > 12:
+        raise HTTPException(status_code=400, detail="Month must be between 1 and 12")
+    
+    if start_year > end_year or (start_year == end_year and start_month > end_month):
+        raise HTTPException(status_code=400, detail="Start date must be before end date")
+    
+    start_date = date(start_year, start_month, 1)
+    end_date = date(end_year, end_month, 1)
+    rules = db.exec(
+        select(AllocationRule).where(AllocationRule.user_id == current_user.id)
+    ).all()
+    versions = crud.get_report_versions(
+        session=db, user_id=current_user.id, start_month=start_date, end_month=end_date
+    )
+    # Rules are part of the version: editing one changes every allocation
+    version = (
+        tuple(sorted(versions.items())),
+        tuple(sorted((rule.grp.value, rule.percent) for rule in rules)),
+    )
+    cache_key = (current_user.id, start_year, start_month, "budget", end_year, end_month)
+    cached = report_cache.get(cache_key, version)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    report = compute_budget(
+        session=db,
+        user_id=current_user.id,
+        start_month=start_date,
+        end_month=end_date,
+        rules=rules,
+    )
+    report_cache.put(cache_key, version, report.model_dump_json().encode())
+    return report
+
+
+@router.get("/trends", response_model=CategoryGrowthReport)
+def get_category_trends(
+    *,
+    db: Session = Depends(get_db),
+    start_year: int = Query(..., description="Start year"),
+    start_month: int = Query(..., description="Start month (1-12)"),
+    end_year: int = Query(..., description="End year"),
+    end_month: int = Query(..., description="End month (1-12)"),
+    txn_type: TxnType = Query(TxnType.expense, alias="type"),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Month-over-month growth, rolling 3-month average and year-over-year growth per category.
+    """
+    if start_month < 1 or start_month > 12 or end_month < 1 or end_month > 12:
+        raise HTTPException(status_code=400, detail="Month must be between 1 and 12")
+    
+    if start_year > end_year or (start_year == end_year and start_month > end_month):
+        raise HTTPException(status_code=400, detail="Start date must be before end date")
+    
+    start_date = date(start_year, start_month, 1)
+    end_date = date(end_year, end_month, 1)
+    # The year before the range feeds the averages and year-over-year values
+    versions = crud.get_report_versions(
+        session=db,
+        user_id=current_user.id,
+        start_month=date(start_year - 1, start_month, 1),
+        end_month=end_date,
+    )
+    version = tuple(sorted(versions.items()))
+    cache_key = (
+        current_user.id, start_year, start_month, "trends", end_year, end_month, txn_type
+    )
+    cached = report_cache.get(cache_key, version)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    report = compute_growth_report(
+        session=db,
+        user_id=current_user.id,
+        start_month=start_date,
+        end_month=end_date,
+        txn_type=txn_type,
+    )
+    report_cache.put(cache_key, version, report.model_dump_json().encode())
+    return report
+
+
+@router.get(
+    "/cache/stats",
+    response_model=ReportCacheStats,
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def get_report_cache_stats() -> Any:
+    """
+    Hit/miss counters and memory use of this process's report cache.
+    """
+    return report_cache.stats()
+
+
+def _month_version(db: Session, user_id: uuid.UUID, month_start: date) -> int:
+    versions = crud.get_report_versions(
+        session=db, user_id=user_id, start_month=month_start, end_month=month_start
+    )
+    return versions.get(month_start, 0)
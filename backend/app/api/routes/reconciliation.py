@@ -0,0 +1,59 @@
+import uuid
+from datetime import date
+from typing import Any
+
+from fastapi import APIRouter, Query
+
+from app import crud
+from app.api.deps import CurrentUser, SessionDep
+from app.models import (
+    ReconciliationConfirmRequest,
+    ReconciliationConfirmResult,
+    ReconciliationProposals,
+)
+from app.services.reconciliation_service import propose_matches
+
+router = APIRouter(prefix="/reconciliation", tags=["reconciliation"])
+
+
+@router.get("/proposals", response_model=ReconciliationProposals)
+def read_reconciliation_proposals(
+    session: SessionDep,
+    current_user: CurrentUser,
+    window_days: int = Query(3, ge=0, le=31, description="Max days between email and transaction"),
+    start_date: date | None = Query(None, description="Inclusive start of email received date"),
+    end_date: date | None = Query(None, description="Inclusive end of email received date"),
+    account_id: uuid.UUID | None = None,
+    gmail_connection_id: uuid.UUID | None = None,
+) -> Any:
+    """
+    Propose links between unlinked email transactions and existing transactions
+    with the same amount and a close date.
+    """
+    proposals = propose_matches(
+        session=session,
+        user_id=current_user.id,
+        window_days=window_days,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id,
+        gmail_connection_id=gmail_connection_id,
+    )
+    return ReconciliationProposals(data=proposals, count=len(proposals))
+
+
+@router.post("/confirm", response_model=ReconciliationConfirmResult)
+def confirm_reconciliation_matches(
+    session: SessionDep,
+    current_user: CurrentUser,
+    confirm_in: ReconciliationConfirmRequest,
+) -> Any:
+    """
+    Link confirmed email transactions to their transactions in one bulk update.
+    """
+    linked = crud.link_email_transactions(
+        session=session, user_id=current_user.id, matches=confirm_in.matches
+    )
+    return ReconciliationConfirmResult(
+        linked=linked, count=len(linked), skipped=len(confirm_in.matches) - len(linked)
+    )
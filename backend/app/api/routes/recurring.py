@@ -0,0 +1,41 @@
+from typing import Any
+
+from fastapi import APIRouter, Query
+
+from app import crud
+from app.api.deps import CurrentUser, SessionDep
+from app.models import CashFlowProjection, RecurringSeriesListPublic
+from app.services.recurring_service import detect_recurring_series, project_cash_flow
+
+router = APIRouter(prefix="/recurring", tags=["recurring"])
+
+
+@router.get("/", response_model=RecurringSeriesListPublic)
+def read_recurring_series(session: SessionDep, current_user: CurrentUser) -> Any:
+    """
+    Recurring bills and income found by the last detection run.
+    """
+    series = crud.get_recurring_series(session=session, user_id=current_user.id)
+    return RecurringSeriesListPublic(data=series, count=len(series))
+
+
+@router.post("/detect", response_model=RecurringSeriesListPublic)
+def detect_series(session: SessionDep, current_user: CurrentUser) -> Any:
+    """
+    Re-run recurring series detection now instead of waiting for the nightly job.
+    """
+    detect_recurring_series(session=session, user_id=current_user.id)
+    series = crud.get_recurring_series(session=session, user_id=current_user.id)
+    return RecurringSeriesListPublic(data=series, count=len(series))
+
+
+@router.get("/projection", response_model=CashFlowProjection)
+def read_cash_flow_projection(
+    session: SessionDep,
+    current_user: CurrentUser,
+    months: int = Query(6, ge=1, le=24, description="Months to project, from the current one"),
+) -> Any:
+    """
+    Expected income and expenses per month from the stored recurring series.
+    """
+    return project_cash_flow(session=session, user_id=current_user.id, months=months)
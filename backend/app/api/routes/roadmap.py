@@ -32,10 +32,10 @@ def read_roadmaps(
     """
     Retrieve roadmaps for current user.
     """
-    roadmaps = crud.get_roadmaps(
+    roadmaps, count = crud.get_roadmaps(
         session=session, user_id=current_user.id, skip=skip, limit=limit
     )
-    return RoadmapsPublic(data=roadmaps, count=len(roadmaps))
+    return RoadmapsPublic(data=roadmaps, count=count)
 
 
 @router.post("/", response_model=RoadmapPublic)
@@ -122,10 +122,10 @@ def read_milestones(
     if not roadmap or roadmap.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Roadmap not found")
     
-    milestones = crud.get_milestones_by_roadmap(
+    milestones, count = crud.get_milestones_by_roadmap(
         session=session, roadmap_id=roadmap_id, skip=skip, limit=limit
     )
-    return RoadmapMilestonesPublic(data=milestones, count=len(milestones))
+    return RoadmapMilestonesPublic(data=milestones, count=count)
 
 
 @router.post("/{roadmap_id}/milestones", response_model=RoadmapMilestonePublic)
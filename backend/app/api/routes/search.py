@@ -0,0 +1,37 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app import crud
+from app.api.deps import CurrentUser, SessionDep
+from app.crud.search import SearchKind
+from app.models import SearchResults
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/", response_model=SearchResults)
+def search(
+    session: SessionDep,
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=1, max_length=200, description="Words or part of a merchant"),
+    kind: SearchKind | None = Query(None, description="Only search this kind of row"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+) -> Any:
+    """
+    Search transactions and email transactions by merchant, note and subject.
+    """
+    kinds = {kind} if kind else {"transaction", "email_transaction"}
+    try:
+        page = crud.search_ledger(
+            session=session,
+            user_id=current_user.id,
+            text=q,
+            kinds=kinds,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SearchResults(data=page.items, count=page.count, next_cursor=page.next_cursor)
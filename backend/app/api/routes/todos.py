@@ -3,7 +3,6 @@ from datetime import date
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
 
 from app.api.deps import CurrentUser, SessionDep
 from app.crud import (
@@ -13,12 +12,15 @@ from app.crud import (
     delete_todo,
     get_checklist_item,
     get_checklist_items_by_todo,
+    get_todo,
     get_todo_children,
     get_todo_parent,
+    get_todos,
     get_todos_by_milestone,
     get_todo_milestone,
     get_todos_by_subject,
     get_todo_subject,
+    todo_to_public,
     update_checklist_item,
     update_todo,
     get_todos_for_date,
@@ -56,52 +58,15 @@ def read_todos(
     Retrieve todos with optional search functionality.
     """
 
-    # Base query conditions
-    base_conditions = []
-    if not current_user.is_superuser:
-        base_conditions.append(Todo.owner_id == current_user.id)
-    
-    # Add search condition if provided
-    if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        search_condition = (
-            Todo.title.ilike(search_term) | 
-            Todo.description.ilike(search_term)
-        )
-        base_conditions.append(search_condition)
-
-    # Build count statement
-    count_statement = select(func.count()).select_from(Todo)
-    if base_conditions:
-        count_statement = count_statement.where(*base_conditions)
-    count = session.exec(count_statement).one()
-
-    # Build main query statement with relationships
-    statement = select(Todo)
-    if base_conditions:
-        statement = statement.where(*base_conditions)
-    statement = statement.offset(skip).limit(limit).order_by(Todo.created_at.desc())
-    todos = session.exec(statement).all()
-
-    # Convert to public format with relationships
-    todo_publics = []
-    for todo in todos:
-        todo_dict = todo.model_dump()
-        # Add subject object if exists
-        if todo.subject_id:
-            from app.models import ResourceSubject
-            subject = session.get(ResourceSubject, todo.subject_id)
-            if subject:
-                todo_dict["subject"] = subject.model_dump()
-        # Add milestone object if exists
-        if todo.milestone_id:
-            from app.models import RoadmapMilestone
-            milestone = session.get(RoadmapMilestone, todo.milestone_id)
-            if milestone:
-                todo_dict["milestone"] = milestone.model_dump()
-        todo_publics.append(todo_dict)
-
-    return TodosPublic(data=todo_publics, count=count)
+    todos, count = get_todos(
+        session=session,
+        owner_id=None if current_user.is_superuser else current_user.id,
+        skip=skip,
+        limit=limit,
+        search=search,
+    )
+
+    return TodosPublic(data=[todo_to_public(todo) for todo in todos], count=count)
 
 
 @router.get("/overdue", response_model=TodosPublic) 
@@ -123,28 +88,12 @@ def read_todo(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
     """
     Get todo by ID.
     """
-    todo = session.get(Todo, id)
+    todo = get_todo(session=session, todo_id=id)
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     if not current_user.is_superuser and (todo.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    
-    # Convert to public format with relationships
-    todo_dict = todo.model_dump()
-    # Add subject object if exists
-    if todo.subject_id:
-        from app.models import ResourceSubject
-        subject = session.get(ResourceSubject, todo.subject_id)
-        if subject:
-            todo_dict["subject"] = subject.model_dump()
-    # Add milestone object if exists
-    if todo.milestone_id:
-        from app.models import RoadmapMilestone
-        milestone = session.get(RoadmapMilestone, todo.milestone_id)
-        if milestone:
-            todo_dict["milestone"] = milestone.model_dump()
-    
-    return todo_dict
+    return todo_to_public(todo)
 
 
 @router.post("/", response_model=TodoPublic)
@@ -1,41 +1,128 @@
+import codecs
+import io
+import json
 import uuid
+from datetime import date
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, File, Form, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
 
 from app import crud
 from app.api.deps import CurrentUser, SessionDep
+from app.core.db import engine
+from app.crud.transaction import TRANSACTION_EXPORT_COLUMNS
 from app.models import (
+    ExportFormat,
     Message,
+    StatementFormat,
+    TransactionBatchMode,
+    TransactionBatchRequest,
+    TransactionBatchResult,
     TransactionCreate,
+    TransactionImportResult,
     TransactionPublic,
     TransactionsPublic,
     TransactionUpdate,
+    TxnType,
 )
+from app.services.export_service import export_response
+from app.services.statement_import import import_statement
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 
 @router.get("/", response_model=TransactionsPublic)
 def read_transactions(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    start_date: date | None = Query(None, description="Inclusive start date"),
+    end_date: date | None = Query(None, description="Inclusive end date"),
+    account_id: uuid.UUID | None = None,
+    category_id: uuid.UUID | None = None,
+    type: TxnType | None = None,
+    min_amount: float | None = Query(None, ge=0),
+    max_amount: float | None = Query(None, ge=0),
+    currency: str | None = Query(None, max_length=10),
+    q: str | None = Query(None, description="Text contained in the merchant or note"),
+    sort: str = Query(
+        "-txn_date",
+        description="txn_date, amount or created_at; prefix with - for descending",
+    ),
+    cursor: str | None = Query(
+        None,
+        description="next_cursor of the previous page; skip is ignored and count is null",
+    ),
 ) -> Any:
     """
     Retrieve transactions for current user.
     """
-    transactions, count = crud.get_transactions(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "account_id": account_id,
+        "category_id": category_id,
+        "type": type,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "currency": currency,
+        "q": q.strip() if q and q.strip() else None,
+    }
+    try:
+        page = crud.get_transactions(
+            session=session,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            sort=sort,
+            filters=filters,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TransactionsPublic(
+        data=page.items, count=page.count, next_cursor=page.next_cursor
+    )
+
+
+@router.get("/export")
+def export_transactions(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query(ExportFormat.csv, alias="format"),
+    start_date: date | None = Query(None, description="Inclusive start date"),
+    end_date: date | None = Query(None, description="Inclusive end date"),
+    account_id: uuid.UUID | None = None,
+    category_id: uuid.UUID | None = None,
+    gzip: bool = Query(False, description="Gzip-compress the download"),
+) -> StreamingResponse:
+    """
+    Stream all transactions of the current user as CSV or NDJSON.
+    """
+    user_id = current_user.id
+
+    def rows() -> Any:
+        # The request session is closed before the body is streamed, so the
+        # export reads through its own session for the lifetime of the stream.
+        with Session(engine) as export_session:
+            yield from crud.iter_transactions_for_export(
+                session=export_session,
+                user_id=user_id,
+                start_date=start_date,
+                end_date=end_date,
+                account_id=account_id,
+                category_id=category_id,
+            )
+
+    return export_response(
+        rows(),
+        columns=TRANSACTION_EXPORT_COLUMNS,
+        fmt=fmt,
+        filename="transactions",
+        compress=gzip,
     )
-    
-    # Create public transactions with category names
-    public_transactions = []
-    for t in transactions:
-        transaction_dict = t.model_dump()
-        if t.category:
-            transaction_dict['category_name'] = t.category.name
-        public_transactions.append(TransactionPublic.model_validate(transaction_dict))
-    
-    return TransactionsPublic(data=public_transactions, count=count)
 
 
 @router.post("/", response_model=TransactionPublic)
@@ -51,6 +138,86 @@ def create_transaction(
     return transaction
 
 
+@router.post("/batch", response_model=TransactionBatchResult)
+def batch_transactions(
+    *,
+    session: SessionDep,
+    current_user: CurrentUser,
+    batch_in: TransactionBatchRequest,
+    response: Response,
+) -> Any:
+    """
+    Create, update and delete transactions in one request.
+
+    In atomic mode a failing operation rolls the whole batch back and the
+    response is a 400 with the per-operation results; in partial mode the
+    failing operations are skipped.
+    """
+    result = crud.apply_transaction_batch(
+        session=session,
+        user_id=current_user.id,
+        operations=batch_in.operations,
+        atomic=batch_in.mode == TransactionBatchMode.atomic,
+    )
+    if not result.committed:
+        response.status_code = 400
+    return result
+
+
+@router.post("/import", response_model=TransactionImportResult)
+def import_transactions(
+    session: SessionDep,
+    current_user: CurrentUser,
+    file: UploadFile = File(..., description="CSV or OFX bank statement"),
+    account_id: uuid.UUID = Form(...),
+    fmt: StatementFormat | None = Form(
+        None, alias="format", description="Defaults from the file extension"
+    ),
+    date_format: str | None = Form(
+        None, description="strptime format, e.g. %d/%m/%Y; common formats are tried"
+    ),
+    columns: str | None = Form(
+        None, description='JSON object of field -> CSV header, e.g. {"txn_date": "Posted"}'
+    ),
+    encoding: str = Form("utf-8-sig"),
+    dry_run: bool = Form(False, description="Validate and count without saving"),
+) -> Any:
+    """
+    Import a bank statement into one account, skipping rows already imported.
+    """
+    account = crud.get_account(session=session, account_id=account_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if account.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    try:
+        codecs.lookup(encoding)
+        column_map = json.loads(columns) if columns else None
+    except (LookupError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid encoding or columns")
+    if column_map is not None and not isinstance(column_map, dict):
+        raise HTTPException(status_code=400, detail="columns must be a JSON object")
+    if fmt is None:
+        name = (file.filename or "").lower()
+        fmt = StatementFormat.ofx if name.endswith((".ofx", ".qfx")) else StatementFormat.csv
+
+    # Read line by line from the spooled upload instead of loading it whole
+    lines = io.TextIOWrapper(file.file, encoding=encoding, newline="")
+    try:
+        return import_statement(
+            session=session,
+            user_id=current_user.id,
+            account=account,
+            lines=lines,
+            fmt=fmt,
+            date_format=date_format,
+            columns=column_map,
+            dry_run=dry_run,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.patch("/{transaction_id}", response_model=TransactionPublic)
 def update_transaction(
     *,
@@ -0,0 +1,34 @@
+import argparse
+import logging
+import uuid
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.crud.merchant_key import backfill_merchant_keys
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fill the canonical merchant keys of transactions and email transactions."
+    )
+    parser.add_argument("--user-id", type=uuid.UUID, default=None)
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Recompute every key, not only missing ones (after changing the rules)",
+    )
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        rows = backfill_merchant_keys(
+            session=session, user_id=args.user_id, only_missing=not args.all
+        )
+    logger.info(f"Updated {rows} merchant keys")
+
+
+if __name__ == "__main__":
+    main()
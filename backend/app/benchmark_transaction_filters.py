@@ -0,0 +1,166 @@
+import argparse
+import logging
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+from sqlalchemy import delete, text
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.core.security import get_password_hash
+from app.crud.transaction import get_transactions
+from app.models import Account, Category, CategoryGroup, Transaction, TxnType, User
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ACCOUNT_COUNT = 5
+CATEGORY_COUNT = 30
+
+# Synthetic ledger: ~4 years of dates, amounts up to 5M, a few merchants
+SEED_SQL = text(
+    """
+    INSERT INTO transaction (
+        id, user_id, account_id, category_id, txn_date, type, amount,
+        currency, merchant, note, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        :user_id,
+        (:account_ids)[1 + (n % cardinality(:account_ids))],
+        (:category_ids)[1 + (n % cardinality(:category_ids))],
+        DATE '2021-01-01' + (n % 1460),
+        CASE WHEN n % 10 = 0 THEN 'income'::txntype ELSE 'expense'::txntype END,
+        1000 + (n::bigint * 7919) % 5000000,
+        CASE WHEN n % 50 = 0 THEN 'USD' ELSE 'VND' END,
+        'Merchant ' || (n % 500),
+        CASE WHEN n % 7 = 0 THEN 'note ' || n END,
+        now(),
+        now()
+    FROM generate_series(1, :rows) AS n
+    """
+)
+
+
+def seed(session: Session, rows: int) -> tuple[User, list[Account], list[Category]]:
+    user = User(
+        email=f"benchmark-{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password=get_password_hash(uuid.uuid4().hex),
+    )
+    session.add(user)
+    session.flush()
+    accounts = [
+        Account(name=f"Benchmark account {i}", user_id=user.id)
+        for i in range(ACCOUNT_COUNT)
+    ]
+    categories = [
+        Category(name=f"Benchmark category {i}", grp=CategoryGroup.needs, user_id=user.id)
+        for i in range(CATEGORY_COUNT)
+    ]
+    session.add_all([*accounts, *categories])
+    session.flush()
+    session.exec(
+        SEED_SQL,
+        params={
+            "user_id": user.id,
+            "account_ids": [a.id for a in accounts],
+            "category_ids": [c.id for c in categories],
+            "rows": rows,
+        },
+    )
+    session.commit()
+    session.exec(text("ANALYZE transaction"))
+    return user, accounts, categories
+
+
+def cleanup(session: Session, user: User) -> None:
+    session.exec(delete(Transaction).where(Transaction.user_id == user.id))
+    session.exec(delete(Category).where(Category.user_id == user.id))
+    session.exec(delete(Account).where(Account.user_id == user.id))
+    session.exec(delete(User).where(User.id == user.id))
+    session.commit()
+
+
+def scenarios(
+    accounts: list[Account], categories: list[Category]
+) -> dict[str, dict[str, Any]]:
+    return {
+        "first page": {},
+        "date range": {"filters": {"start_date": date(2023, 3, 1), "end_date": date(2023, 3, 31)}},
+        "account": {"filters": {"account_id": accounts[0].id}},
+        "category + date range": {
+            "filters": {
+                "category_id": categories[0].id,
+                "start_date": date(2022, 1, 1),
+                "end_date": date(2022, 12, 31),
+            }
+        },
+        "type income": {"filters": {"type": TxnType.income}},
+        "amount range by amount": {
+            "filters": {"min_amount": 100000, "max_amount": 120000},
+            "sort": "amount",
+        },
+        "currency USD": {"filters": {"currency": "USD"}},
+        "text search": {"filters": {"q": "merchant 42"}},
+        "deep offset": {"skip": 500000},
+    }
+
+
+def time_call(call: Callable[[], Any], repeat: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def run(rows: int, repeat: int, limit: int) -> None:
+    with Session(engine) as session:
+        logger.info(f"Seeding {rows} transactions")
+        user, accounts, categories = seed(session, rows)
+        try:
+            for name, params in scenarios(accounts, categories).items():
+                median, worst = time_call(
+                    lambda params=params: get_transactions(
+                        session=session, user_id=user.id, limit=limit, **params
+                    ),
+                    repeat,
+                )
+                logger.info(f"{name:<24} median {median:8.1f} ms  max {worst:8.1f} ms")
+
+            # Walking the same deep position with cursors instead of offsets
+            page = get_transactions(session=session, user_id=user.id, limit=limit)
+            for _ in range(20):
+                page = get_transactions(
+                    session=session, user_id=user.id, limit=limit, cursor=page.next_cursor
+                )
+            cursor = page.next_cursor
+            median, worst = time_call(
+                lambda: get_transactions(
+                    session=session, user_id=user.id, limit=limit, cursor=cursor
+                ),
+                repeat,
+            )
+            logger.info(f"{'keyset page':<24} median {median:8.1f} ms  max {worst:8.1f} ms")
+        finally:
+            cleanup(session, user)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time the transaction list filters on a synthetic dataset."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    run(args.rows, args.repeat, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -100,6 +100,30 @@ class Settings(BaseSettings):
     GOOGLE_REDIRECT_URI: str = "http://localhost:8000/api/v1/gmail/callback"
     GMAIL_ENCRYPTION_KEY: str = ""
 
+    # Analytics snapshot settings (requires the optional "analytics" extra)
+    ANALYTICS_SNAPSHOT_DIR: str = "/app/data/snapshots"
+    ANALYTICS_SNAPSHOT_BATCH_SIZE: int = 10000
+    # Watermarks trail the database clock so writes still committing are
+    # picked up by the next snapshot instead of being skipped
+    ANALYTICS_SNAPSHOT_WATERMARK_LAG_SECONDS: int = 300
+    # Incrementals after a full snapshot before the next one compacts them
+    ANALYTICS_SNAPSHOT_MAX_INCREMENTALS: int = 30
+
+    # In-process cache for monthly report payloads
+    REPORT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # In-process columnar copies of users' transactions for /analytics queries;
+    # 0 turns the cache off and every query loads the columns afresh
+    ANALYTICS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Reports convert every amount into this currency using the fxrate table
+    BASE_CURRENCY: str = "VND"
+    # How long other workers may serve rates cached before a rate load
+    FX_RATE_CACHE_TTL_SECONDS: int = 3600
+
+    # Percent of a group's allocation at which a budget alert is raised
+    BUDGET_ALERT_THRESHOLDS: list[int] = [80, 100]
+
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
             message = (
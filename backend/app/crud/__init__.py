@@ -21,6 +21,7 @@ from .todo import (
     get_todo_milestone,
     get_todos_by_subject,
     get_todo_subject,
+    todo_to_public,
     update_checklist_item,
     update_todo,
     get_todos_for_date,
@@ -37,6 +38,22 @@ from .account import (
     get_accounts,
     update_account,
 )
+from .account_balance import (
+    apply_balance_deltas,
+    get_account_balances,
+    get_balance_history,
+    rebuild_account_balances,
+    remove_category_from_balances,
+)
+from .budget import (
+    acknowledge_budget_alert,
+    apply_budget_deltas,
+    get_budget_alert,
+    get_budget_alerts,
+    rebuild_budget_totals,
+    remove_account_budget_totals,
+    shift_category_budget_totals,
+)
 from .category import (
     create_category,
     delete_category,
@@ -45,10 +62,14 @@ from .category import (
     update_category,
 )
 from .transaction import (
+    apply_transaction_batch,
+    bulk_create_transactions,
     create_transaction,
     delete_transaction,
     get_transaction,
     get_transactions,
+    insert_transaction_rows,
+    iter_transactions_for_export,
     update_transaction,
 )
 from .allocation_rule import (
@@ -69,6 +90,7 @@ from .gmail_connection import (
 )
 from .email_transaction import (
     bulk_update_email_transactions,
+    convert_email_transactions,
     count_email_transactions,
     create_email_transaction,
     delete_email_transaction,
@@ -79,6 +101,8 @@ from .email_transaction import (
     get_email_txn_dashboard,
     update_email_transaction,
     get_email_transactions_for_all_connections,
+    iter_email_transactions_for_export,
+    link_email_transactions,
 )
 from .roadmap import (
     create_roadmap,
@@ -109,6 +133,57 @@ from .resource import (
     reorder_resource_subjects,
     search_subjects_for_user,
 )
+from .analytics_snapshot import (
+    count_analytics_snapshots_since,
+    delete_analytics_snapshots_before,
+    get_analytics_snapshot,
+    get_analytics_snapshots,
+    get_latest_analytics_snapshot,
+)
+from .ledger import (
+    add_to_ledger,
+    apply_ledger_deltas,
+    check_ledger_aggregates,
+    rebuild_ledger_aggregates,
+)
+from .fx_rate import (
+    convert_rows,
+    fx_rate_cache,
+    get_fx_rates,
+    get_monthly_rates,
+    upsert_fx_rates,
+)
+from .report import (
+    get_account_breakdown,
+    get_category_trend_rows,
+    get_category_breakdown,
+    get_month_bounds,
+    get_monthly_group_totals,
+    get_monthly_type_totals,
+    get_transactions_by_month,
+    get_type_totals,
+    get_unconverted_amounts,
+)
+from .recurring import (
+    get_recurring_series,
+    replace_recurring_series,
+)
+from .report_version import (
+    bump_all_report_versions,
+    bump_report_versions,
+    bump_report_versions_since,
+    get_report_version_token,
+    get_report_versions,
+)
+from .search import search_ledger
+from .merchant_category import (
+    category_tokens,
+    count_merchant_category_stats,
+    get_merchant_category_index,
+    rebuild_merchant_category_index,
+    record_category_usage,
+)
+from .merchant_key import backfill_merchant_keys, merchant_key
 from .feedback import (
     create_feedback,
     delete_feedback,
@@ -136,6 +211,7 @@ __all__ = [
     "get_todo_milestone",
     "get_todos_by_subject",
     "get_todo_subject",
+    "todo_to_public",
     # Checklist functions
     "create_checklist_item",
     "delete_checklist_item",
@@ -162,6 +238,20 @@ __all__ = [
     "get_account",
     "get_accounts",
     "update_account",
+    # Account balance functions
+    "apply_balance_deltas",
+    "get_account_balances",
+    "get_balance_history",
+    "rebuild_account_balances",
+    "remove_category_from_balances",
+    # Budget functions
+    "acknowledge_budget_alert",
+    "apply_budget_deltas",
+    "get_budget_alert",
+    "get_budget_alerts",
+    "rebuild_budget_totals",
+    "remove_account_budget_totals",
+    "shift_category_budget_totals",
     # Category functions
     "create_category",
     "delete_category",
@@ -169,10 +259,14 @@ __all__ = [
     "get_categories",
     "update_category",
     # Transaction functions
+    "apply_transaction_batch",
+    "bulk_create_transactions",
     "create_transaction",
     "delete_transaction",
     "get_transaction",
     "get_transactions",
+    "insert_transaction_rows",
+    "iter_transactions_for_export",
     "update_transaction",
     # Allocation rule functions
     "create_allocation_rule",
@@ -190,6 +284,7 @@ __all__ = [
     "update_gmail_connection",
     # Email transaction functions
     "bulk_update_email_transactions",
+    "convert_email_transactions",
     "count_email_transactions",
     "create_email_transaction",
     "delete_email_transaction",
@@ -200,6 +295,8 @@ __all__ = [
     "get_email_txn_dashboard",
     "update_email_transaction",
     "get_email_transactions_for_all_connections",
+    "iter_email_transactions_for_export",
+    "link_email_transactions",
     # Roadmap functions
     "create_roadmap",
     "delete_roadmap",
@@ -229,6 +326,53 @@ __all__ = [
     "update_resource_subject",
     "reorder_resource_subjects",
     "search_subjects_for_user",
+    # Analytics snapshot functions
+    "count_analytics_snapshots_since",
+    "delete_analytics_snapshots_before",
+    "get_analytics_snapshot",
+    "get_analytics_snapshots",
+    "get_latest_analytics_snapshot",
+    # Ledger aggregate functions
+    "add_to_ledger",
+    "apply_ledger_deltas",
+    "check_ledger_aggregates",
+    "rebuild_ledger_aggregates",
+    # FX rate functions
+    "convert_rows",
+    "fx_rate_cache",
+    "get_fx_rates",
+    "get_monthly_rates",
+    "upsert_fx_rates",
+    # Report functions
+    "get_account_breakdown",
+    "get_category_breakdown",
+    "get_category_trend_rows",
+    "get_month_bounds",
+    "get_monthly_group_totals",
+    "get_monthly_type_totals",
+    "get_transactions_by_month",
+    "get_type_totals",
+    "get_unconverted_amounts",
+    # Recurring series functions
+    "get_recurring_series",
+    "replace_recurring_series",
+    # Report version functions
+    "bump_all_report_versions",
+    "bump_report_versions",
+    "bump_report_versions_since",
+    "get_report_version_token",
+    "get_report_versions",
+    # Search functions
+    "search_ledger",
+    # Merchant category index functions
+    "category_tokens",
+    "count_merchant_category_stats",
+    "get_merchant_category_index",
+    "rebuild_merchant_category_index",
+    "record_category_usage",
+    # Merchant key functions
+    "backfill_merchant_keys",
+    "merchant_key",
     # Feedback functions
     "create_feedback",
     "delete_feedback",
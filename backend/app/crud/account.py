@@ -4,6 +4,9 @@ from typing import Any
 
 from sqlmodel import Session, select
 
+from app.crud.budget import remove_account_budget_totals
+from app.crud.pagination import paginate_offset
+from app.crud.report_version import bump_all_report_versions
 from app.models import Account, AccountCreate, AccountUpdate
 
 
@@ -24,6 +27,8 @@ def update_account(
     extra_data = {"updated_at": datetime.now(timezone.utc)}
     db_account.sqlmodel_update(account_data, update=extra_data)
     session.add(db_account)
+    # Report breakdowns are labelled with account names
+    bump_all_report_versions(session=session, user_id=db_account.user_id)
     session.commit()
     session.refresh(db_account)
     return db_account
@@ -37,19 +42,24 @@ def get_account(*, session: Session, account_id: uuid.UUID) -> Account | None:
 def get_accounts(
     *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
 ) -> tuple[list[Account], int]:
-    statement = (
-        select(Account).where(Account.user_id == user_id).offset(skip).limit(limit)
+    return paginate_offset(
+        session,
+        select(Account).where(Account.user_id == user_id),
+        id_column=Account.id,
+        sort="created_at",
+        sort_spec={"created_at": Account.created_at},
+        skip=skip,
+        limit=limit,
     )
-    accounts = list(session.exec(statement).all())
-    count_statement = select(Account).where(Account.user_id == user_id)
-    count = len(session.exec(count_statement).all())
-    return accounts, count
 
 
 def delete_account(*, session: Session, account_id: uuid.UUID) -> Account | None:
     statement = select(Account).where(Account.id == account_id)
     account = session.exec(statement).first()
     if account:
+        # Its transactions and aggregates are cascade-deleted with it
+        remove_account_budget_totals(session=session, account_id=account.id)
         session.delete(account)
+        bump_all_report_versions(session=session, user_id=account.user_id)
         session.commit()
     return account
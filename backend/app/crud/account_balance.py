@@ -0,0 +1,210 @@
+import uuid
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import ColumnElement, case, delete, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.crud.pagination import decode_cursor, encode_cursor
+from app.models import (
+    Account,
+    AccountBalance,
+    AccountBalancePublic,
+    BalanceHistoryEntry,
+    BalanceHistoryPublic,
+    Transaction,
+    TxnType,
+)
+
+BalanceKey = tuple[uuid.UUID, uuid.UUID]  # (user_id, account_id)
+
+
+def signed_amount() -> ColumnElement[float]:
+    """Transaction amount as it moves the account balance: income adds, expenses subtract."""
+    return case(
+        (Transaction.type == TxnType.income, Transaction.amount),
+        else_=-Transaction.amount,
+    )
+
+
+def apply_balance_deltas(
+    *, session: Session, deltas: Iterable[tuple[BalanceKey, float, int]]
+) -> None:
+    """Add (key, signed amount, count) deltas to account balances. No commit."""
+    folded: dict[BalanceKey, list[float]] = {}
+    for key, amount, count in deltas:
+        entry = folded.setdefault(key, [0.0, 0])
+        entry[0] += amount
+        entry[1] += count
+    folded = {key: entry for key, entry in folded.items() if entry[1] or entry[0]}
+    if not folded:
+        return
+
+    statement = insert(AccountBalance).values(
+        [
+            {
+                "user_id": user_id,
+                "account_id": account_id,
+                "balance": amount,
+                "txn_count": count,
+            }
+            for (user_id, account_id), (amount, count) in folded.items()
+        ]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["account_id"],
+        set_={
+            "balance": AccountBalance.balance + statement.excluded.balance,
+            "txn_count": AccountBalance.txn_count + statement.excluded.txn_count,
+            "updated_at": func.now(),
+        },
+    )
+    session.exec(statement)
+
+
+def remove_category_from_balances(*, session: Session, category_id: uuid.UUID) -> None:
+    """Take a category's transactions out of their accounts' balances. No commit.
+
+    Deleting a category cascades to its transactions without going through
+    delete_transaction, so their amounts are subtracted here in one UPDATE.
+    """
+    totals = (
+        select(
+            Transaction.account_id,
+            func.sum(signed_amount()).label("amount"),
+            func.count().label("count"),
+        )
+        .where(Transaction.category_id == category_id)
+        .group_by(Transaction.account_id)
+        .subquery()
+    )
+    session.exec(
+        update(AccountBalance)
+        .where(AccountBalance.account_id == totals.c.account_id)
+        .values(
+            balance=AccountBalance.balance - totals.c.amount,
+            txn_count=AccountBalance.txn_count - totals.c.count,
+            updated_at=func.now(),
+        )
+    )
+
+
+def rebuild_account_balances(
+    *, session: Session, user_id: uuid.UUID | None = None
+) -> None:
+    """Recompute balances from transactions (one user, or everyone). No commit."""
+    clear = delete(AccountBalance)
+    source = select(
+        Transaction.user_id,
+        Transaction.account_id,
+        func.sum(signed_amount()),
+        func.count(),
+    ).group_by(Transaction.user_id, Transaction.account_id)
+    if user_id is not None:
+        clear = clear.where(AccountBalance.user_id == user_id)
+        source = source.where(Transaction.user_id == user_id)
+    session.exec(clear)
+    session.exec(
+        insert(AccountBalance).from_select(
+            ["user_id", "account_id", "balance", "txn_count"], source
+        )
+    )
+
+
+def get_account_balances(
+    *, session: Session, user_id: uuid.UUID
+) -> list[AccountBalancePublic]:
+    """Every account of the user with its stored balance, in one query."""
+    statement = (
+        select(
+            Account.id.label("account_id"),
+            Account.name,
+            Account.type,
+            Account.currency,
+            Account.is_active,
+            func.coalesce(AccountBalance.balance, 0.0).label("balance"),
+            func.coalesce(AccountBalance.txn_count, 0).label("txn_count"),
+        )
+        .outerjoin(AccountBalance, AccountBalance.account_id == Account.id)
+        .where(Account.user_id == user_id)
+        .order_by(Account.created_at, Account.id)
+    )
+    return [AccountBalancePublic(**row._mapping) for row in session.exec(statement)]
+
+
+def get_balance_history(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    account_id: uuid.UUID,
+    start_date: date | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> BalanceHistoryPublic:
+    """Transactions of an account, oldest first, each with the balance after it.
+
+    The running balance is SUM() OVER (ORDER BY txn_date, id) seeded with the
+    balance before the page. The cursor carries that balance along with the
+    last (txn_date, id), so every page is an index range scan of limit rows
+    instead of re-summing the account's history.
+    """
+    signed = signed_amount()
+    statement = select(
+        Transaction.id,
+        Transaction.txn_date,
+        Transaction.type,
+        Transaction.amount,
+        Transaction.merchant,
+    ).where(Transaction.user_id == user_id, Transaction.account_id == account_id)
+
+    if cursor is not None:
+        last_date, last_id, opening = decode_cursor(
+            cursor, Transaction.txn_date, Transaction.id, AccountBalance.balance
+        )
+        statement = statement.where(
+            tuple_(Transaction.txn_date, Transaction.id)
+            > tuple_(
+                literal(last_date, Transaction.txn_date.type),
+                literal(last_id, Transaction.id.type),
+            )
+        )
+    elif start_date is not None:
+        opening = session.exec(
+            select(func.coalesce(func.sum(signed), 0.0)).where(
+                Transaction.user_id == user_id,
+                Transaction.account_id == account_id,
+                Transaction.txn_date < start_date,
+            )
+        ).one()
+        statement = statement.where(Transaction.txn_date >= start_date)
+    else:
+        opening = 0.0
+
+    running = literal(opening) + func.sum(signed).over(
+        order_by=(Transaction.txn_date, Transaction.id)
+    )
+    statement = (
+        statement.add_columns(running)
+        .order_by(Transaction.txn_date, Transaction.id)
+        .limit(limit + 1)
+    )
+    rows = list(session.exec(statement))
+    entries = [
+        BalanceHistoryEntry(
+            transaction_id=txn_id,
+            txn_date=txn_date,
+            type=txn_type,
+            amount=amount,
+            merchant=merchant,
+            running_balance=running_balance,
+        )
+        for txn_id, txn_date, txn_type, amount, merchant, running_balance in rows[:limit]
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last = entries[-1]
+        next_cursor = encode_cursor(last.txn_date, last.transaction_id, last.running_balance)
+    return BalanceHistoryPublic(
+        data=entries, opening_balance=opening, next_cursor=next_cursor
+    )
@@ -4,6 +4,7 @@ from typing import Any
 
 from sqlmodel import Session, select
 
+from app.crud.pagination import paginate_offset
 from app.models import AllocationRule, AllocationRuleCreate, AllocationRuleUpdate
 
 
@@ -44,16 +45,15 @@ def get_allocation_rule(
 def get_allocation_rules(
     *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
 ) -> tuple[list[AllocationRule], int]:
-    statement = (
-        select(AllocationRule)
-        .where(AllocationRule.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
+    return paginate_offset(
+        session,
+        select(AllocationRule).where(AllocationRule.user_id == user_id),
+        id_column=AllocationRule.id,
+        sort="created_at",
+        sort_spec={"created_at": AllocationRule.created_at},
+        skip=skip,
+        limit=limit,
     )
-    allocation_rules = list(session.exec(statement).all())
-    count_statement = select(AllocationRule).where(AllocationRule.user_id == user_id)
-    count = len(session.exec(count_statement).all())
-    return allocation_rules, count
 
 
 def delete_allocation_rule(
@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime
+
+from sqlmodel import Session, delete, func, select
+
+from app.crud.pagination import paginate_offset
+from app.models import AnalyticsSnapshot
+
+
+def get_analytics_snapshot(
+    *, session: Session, snapshot_id: uuid.UUID
+) -> AnalyticsSnapshot | None:
+    statement = select(AnalyticsSnapshot).where(AnalyticsSnapshot.id == snapshot_id)
+    return session.exec(statement).first()
+
+
+def get_latest_analytics_snapshot(
+    *, session: Session, user_id: uuid.UUID, incremental: bool | None = None
+) -> AnalyticsSnapshot | None:
+    """Newest snapshot of a user; incremental=False for the newest full one."""
+    statement = select(AnalyticsSnapshot).where(AnalyticsSnapshot.user_id == user_id)
+    if incremental is not None:
+        statement = statement.where(AnalyticsSnapshot.is_incremental == incremental)
+    statement = statement.order_by(AnalyticsSnapshot.watermark.desc()).limit(1)
+    return session.exec(statement).first()
+
+
+def count_analytics_snapshots_since(
+    *, session: Session, user_id: uuid.UUID, watermark: datetime
+) -> int:
+    statement = select(func.count()).where(
+        AnalyticsSnapshot.user_id == user_id, AnalyticsSnapshot.watermark > watermark
+    )
+    return session.exec(statement).one()
+
+
+def delete_analytics_snapshots_before(
+    *, session: Session, user_id: uuid.UUID, watermark: datetime
+) -> list[str]:
+    """Delete the rows of snapshots older than watermark; return their paths. No commit.
+
+    The caller removes the directories once the delete is committed.
+    """
+    statement = (
+        delete(AnalyticsSnapshot)
+        .where(AnalyticsSnapshot.user_id == user_id, AnalyticsSnapshot.watermark < watermark)
+        .returning(AnalyticsSnapshot.path)
+    )
+    return list(session.exec(statement).scalars().all())
+
+
+def get_analytics_snapshots(
+    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
+) -> tuple[list[AnalyticsSnapshot], int]:
+    return paginate_offset(
+        session,
+        select(AnalyticsSnapshot),
+        id_column=AnalyticsSnapshot.id,
+        sort="-watermark",
+        sort_spec={"watermark": AnalyticsSnapshot.watermark},
+        filters={"user_id": user_id},
+        filter_spec={"user_id": AnalyticsSnapshot.user_id},
+        skip=skip,
+        limit=limit,
+    )
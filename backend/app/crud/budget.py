@@ -0,0 +1,323 @@
+import uuid
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+from typing import Any
+
+from sqlalchemy import case, delete, literal, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.crud.fx_rate import convert_rows, get_monthly_rates, rate_for
+from app.models import (
+    AllocationRule,
+    BudgetAlert,
+    BudgetGroupTotal,
+    Category,
+    CategoryGroup,
+    LedgerAggregate,
+    TxnType,
+)
+
+# Groups that get an envelope; income funds them
+BUDGET_GROUPS = (CategoryGroup.needs, CategoryGroup.wants, CategoryGroup.savings_debt)
+
+BudgetKey = tuple[uuid.UUID, date, CategoryGroup]  # (user_id, month, group)
+
+BUDGET_TOTAL_INSERT_CHUNK = 5000
+
+
+def group_percents(rules: Iterable[AllocationRule]) -> dict[CategoryGroup, float]:
+    """Allocation percent per budget group; several rules for a group add up."""
+    percents = dict.fromkeys(BUDGET_GROUPS, 0.0)
+    for rule in rules:
+        if rule.grp in percents:
+            percents[rule.grp] += rule.percent
+    return percents
+
+
+def budget_amount(
+    grp: CategoryGroup | None, txn_type: TxnType, amount: float
+) -> tuple[CategoryGroup, float] | None:
+    """Which group total a transaction moves, and by how much.
+
+    Expenses add to their budget group and refunds subtract; income in an
+    income category or without one funds the allocations. Expenses outside
+    the budget groups count towards no envelope.
+    """
+    if grp in BUDGET_GROUPS:
+        return grp, amount if txn_type == TxnType.expense else -amount
+    if txn_type == TxnType.income:
+        return CategoryGroup.income, amount
+    return None
+
+
+def apply_budget_deltas(
+    *, session: Session, deltas: Iterable[tuple[tuple[Any, ...], float, int]]
+) -> None:
+    """Move group totals by ledger (key, amount, count) deltas. No commit.
+
+    Category groups are looked up with one query and amounts are converted
+    to BASE_CURRENCY with the cached monthly rates; the folded totals are
+    upserted and checked against the alert thresholds. Amounts in a
+    currency without rates are left out until rates are loaded, which
+    rebuilds the totals.
+    """
+    deltas = list(deltas)
+    rates = get_monthly_rates(
+        session=session, keys=[(key[5], key[1]) for key, _, _ in deltas]
+    )
+    category_ids = {key[3] for key, _, _ in deltas if key[3] is not None}
+    groups: dict[uuid.UUID, CategoryGroup] = {}
+    if category_ids:
+        groups = dict(
+            session.exec(
+                select(Category.id, Category.grp).where(Category.id.in_(category_ids))
+            ).all()
+        )
+    folded: dict[BudgetKey, float] = {}
+    for (user_id, month, txn_type, category_id, _, currency), amount, _ in deltas:
+        rate = rate_for(rates, currency, month)
+        if rate is None:
+            continue
+        amount *= rate
+        target = budget_amount(groups.get(category_id), txn_type, amount)
+        if target is not None:
+            key = (user_id, month, target[0])
+            folded[key] = folded.get(key, 0.0) + target[1]
+    write_budget_totals(session=session, deltas=folded)
+
+
+def shift_category_budget_totals(
+    *,
+    session: Session,
+    category_id: uuid.UUID,
+    from_grp: CategoryGroup | None,
+    to_grp: CategoryGroup | None,
+) -> None:
+    """Move a category's amounts between group totals. No commit.
+
+    Used when a category changes group (both given) or is deleted along
+    with its transactions (to_grp None). Reads the ledger aggregates, so
+    the cost is one row per month and account rather than per transaction.
+    """
+    statement = (
+        select(
+            LedgerAggregate.user_id,
+            LedgerAggregate.type,
+            LedgerAggregate.month,
+            LedgerAggregate.currency,
+            func.sum(LedgerAggregate.total_amount),
+        )
+        .where(LedgerAggregate.category_id == category_id)
+        .group_by(
+            LedgerAggregate.user_id,
+            LedgerAggregate.month,
+            LedgerAggregate.type,
+            LedgerAggregate.currency,
+        )
+    )
+    folded: dict[BudgetKey, float] = {}
+    for user_id, txn_type, month, total in convert_rows(
+        session, session.exec(statement)
+    ):
+        for grp, sign in ((from_grp, -1), (to_grp, 1)):
+            target = budget_amount(grp, txn_type, total) if grp else None
+            if target is not None:
+                key = (user_id, month, target[0])
+                folded[key] = folded.get(key, 0.0) + sign * target[1]
+    write_budget_totals(session=session, deltas=folded)
+
+
+def remove_account_budget_totals(*, session: Session, account_id: uuid.UUID) -> None:
+    """Take an account's amounts out of the group totals. No commit.
+
+    Used before the account is deleted along with its transactions; reads
+    its ledger aggregates and applies them as negative deltas.
+    """
+    aggregates = session.exec(
+        select(LedgerAggregate).where(LedgerAggregate.account_id == account_id)
+    ).all()
+    apply_budget_deltas(
+        session=session,
+        deltas=[
+            (
+                (a.user_id, a.month, a.type, a.category_id, a.account_id, a.currency),
+                -a.total_amount,
+                -a.txn_count,
+            )
+            for a in aggregates
+        ],
+    )
+
+
+def write_budget_totals(*, session: Session, deltas: dict[BudgetKey, float]) -> None:
+    """Upsert folded group total deltas, then raise any alerts they trigger."""
+    deltas = {key: amount for key, amount in deltas.items() if amount}
+    if not deltas:
+        return
+    statement = insert(BudgetGroupTotal).values(
+        [
+            {"user_id": user_id, "month": month, "grp": grp, "amount": amount}
+            for (user_id, month, grp), amount in deltas.items()
+        ]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "month", "grp"],
+        set_={"amount": BudgetGroupTotal.amount + statement.excluded.amount},
+    )
+    session.exec(statement)
+
+    # Only more spending or less funding can cross a threshold upwards
+    to_check: dict[tuple[uuid.UUID, date], set[CategoryGroup]] = {}
+    for (user_id, month, grp), amount in deltas.items():
+        if grp == CategoryGroup.income and amount < 0:
+            to_check[(user_id, month)] = set(BUDGET_GROUPS)
+        elif grp != CategoryGroup.income and amount > 0:
+            to_check.setdefault((user_id, month), set()).add(grp)
+    if to_check:
+        check_budget_thresholds(session=session, groups=to_check)
+
+
+def check_budget_thresholds(
+    *, session: Session, groups: dict[tuple[uuid.UUID, date], set[CategoryGroup]]
+) -> None:
+    """Raise alerts for (user, month) groups at or over a threshold. No commit.
+
+    Reads only the totals of the given months and the users' rules, so the
+    cost does not depend on how many transactions a month has. An alert
+    exists at most once per (user, month, group, threshold).
+    """
+    totals = {
+        (user_id, month, grp): amount
+        for user_id, month, grp, amount in session.exec(
+            select(
+                BudgetGroupTotal.user_id,
+                BudgetGroupTotal.month,
+                BudgetGroupTotal.grp,
+                BudgetGroupTotal.amount,
+            ).where(
+                tuple_(BudgetGroupTotal.user_id, BudgetGroupTotal.month).in_(list(groups))
+            )
+        )
+    }
+    rules: dict[uuid.UUID, list[AllocationRule]] = {}
+    user_ids = {user_id for user_id, _ in groups}
+    for rule in session.exec(
+        select(AllocationRule).where(AllocationRule.user_id.in_(user_ids))
+    ):
+        rules.setdefault(rule.user_id, []).append(rule)
+
+    alerts = []
+    for (user_id, month), grps in groups.items():
+        funding = totals.get((user_id, month, CategoryGroup.income), 0.0)
+        percents = group_percents(rules.get(user_id, []))
+        for grp in grps:
+            allocated = funding * percents[grp] / 100
+            spent = totals.get((user_id, month, grp), 0.0)
+            if allocated <= 0:
+                continue
+            for threshold in settings.BUDGET_ALERT_THRESHOLDS:
+                if spent * 100 >= allocated * threshold:
+                    alerts.append(
+                        {
+                            "id": uuid.uuid4(),
+                            "user_id": user_id,
+                            "month": month,
+                            "grp": grp,
+                            "threshold": threshold,
+                            "allocated": allocated,
+                            "spent": spent,
+                            "created_at": datetime.now(timezone.utc),
+                        }
+                    )
+    if alerts:
+        session.exec(
+            insert(BudgetAlert)
+            .values(alerts)
+            .on_conflict_do_nothing(constraint="uq_budgetalert_key")
+        )
+
+
+def rebuild_budget_totals(*, session: Session, user_id: uuid.UUID | None = None) -> None:
+    """Recompute group totals from the ledger aggregates. No commit, no alerts.
+
+    Sums are grouped per currency in SQL and converted with the monthly
+    rates before they are folded and inserted.
+    """
+    in_budget = Category.grp.in_(BUDGET_GROUPS)
+    bucket = case(
+        (in_budget, Category.grp),
+        else_=literal(CategoryGroup.income, Category.grp.type),
+    )
+    amount = case(
+        (in_budget & (LedgerAggregate.type == TxnType.income), -LedgerAggregate.total_amount),
+        else_=LedgerAggregate.total_amount,
+    )
+    rows = (
+        select(
+            LedgerAggregate.user_id,
+            bucket.label("grp"),
+            LedgerAggregate.month,
+            LedgerAggregate.currency,
+            amount.label("amount"),
+        )
+        .outerjoin(Category, LedgerAggregate.category_id == Category.id)
+        .where(or_(in_budget, LedgerAggregate.type == TxnType.income))
+    )
+    clear = delete(BudgetGroupTotal)
+    if user_id is not None:
+        clear = clear.where(BudgetGroupTotal.user_id == user_id)
+        rows = rows.where(LedgerAggregate.user_id == user_id)
+    # Grouped outside so GROUP BY does not repeat the bound CASE parameters
+    rows = rows.subquery()
+    source = select(
+        rows.c.user_id, rows.c.grp, rows.c.month, rows.c.currency, func.sum(rows.c.amount)
+    ).group_by(rows.c.user_id, rows.c.grp, rows.c.month, rows.c.currency)
+    totals: dict[BudgetKey, float] = {}
+    for row_user_id, grp, month, amount in convert_rows(session, session.exec(source)):
+        key = (row_user_id, month, grp)
+        totals[key] = totals.get(key, 0.0) + amount
+    session.exec(clear)
+    values = [
+        {"user_id": key[0], "month": key[1], "grp": key[2], "amount": amount}
+        for key, amount in totals.items()
+    ]
+    for offset in range(0, len(values), BUDGET_TOTAL_INSERT_CHUNK):
+        session.exec(
+            insert(BudgetGroupTotal).values(
+                values[offset : offset + BUDGET_TOTAL_INSERT_CHUNK]
+            )
+        )
+
+
+def get_budget_alerts(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    since: datetime | None = None,
+    include_acknowledged: bool = False,
+    limit: int = 100,
+) -> list[BudgetAlert]:
+    """Newest alerts first; since makes repeated polls return only new ones."""
+    statement = select(BudgetAlert).where(BudgetAlert.user_id == user_id)
+    if since is not None:
+        statement = statement.where(BudgetAlert.created_at > since)
+    if not include_acknowledged:
+        statement = statement.where(BudgetAlert.acknowledged_at.is_(None))
+    statement = statement.order_by(
+        BudgetAlert.created_at.desc(), BudgetAlert.id.desc()
+    ).limit(limit)
+    return list(session.exec(statement).all())
+
+
+def get_budget_alert(*, session: Session, alert_id: uuid.UUID) -> BudgetAlert | None:
+    return session.get(BudgetAlert, alert_id)
+
+
+def acknowledge_budget_alert(*, session: Session, db_alert: BudgetAlert) -> BudgetAlert:
+    db_alert.acknowledged_at = datetime.now(timezone.utc)
+    session.add(db_alert)
+    session.commit()
+    session.refresh(db_alert)
+    return db_alert
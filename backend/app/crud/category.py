@@ -4,6 +4,10 @@ from typing import Any
 
 from sqlmodel import Session, select
 
+from app.crud.account_balance import remove_category_from_balances
+from app.crud.budget import shift_category_budget_totals
+from app.crud.pagination import paginate_offset
+from app.crud.report_version import bump_all_report_versions
 from app.models import Category, CategoryCreate, CategoryUpdate
 
 
@@ -22,8 +26,18 @@ def update_category(
 ) -> Any:
     category_data = category_in.model_dump(exclude_unset=True)
     extra_data = {"updated_at": datetime.now(timezone.utc)}
+    old_grp = db_category.grp
     db_category.sqlmodel_update(category_data, update=extra_data)
     session.add(db_category)
+    if db_category.grp != old_grp:
+        shift_category_budget_totals(
+            session=session,
+            category_id=db_category.id,
+            from_grp=old_grp,
+            to_grp=db_category.grp,
+        )
+    # Report breakdowns are labelled with category names
+    bump_all_report_versions(session=session, user_id=db_category.user_id)
     session.commit()
     session.refresh(db_category)
     return db_category
@@ -37,19 +51,27 @@ def get_category(*, session: Session, category_id: uuid.UUID) -> Category | None
 def get_categories(
     *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
 ) -> tuple[list[Category], int]:
-    statement = (
-        select(Category).where(Category.user_id == user_id).offset(skip).limit(limit)
+    return paginate_offset(
+        session,
+        select(Category).where(Category.user_id == user_id),
+        id_column=Category.id,
+        sort="created_at",
+        sort_spec={"created_at": Category.created_at},
+        skip=skip,
+        limit=limit,
     )
-    categories = list(session.exec(statement).all())
-    count_statement = select(Category).where(Category.user_id == user_id)
-    count = len(session.exec(count_statement).all())
-    return categories, count
 
 
 def delete_category(*, session: Session, category_id: uuid.UUID) -> Category | None:
     statement = select(Category).where(Category.id == category_id)
     category = session.exec(statement).first()
     if category:
+        # Its transactions are cascade-deleted with it
+        remove_category_from_balances(session=session, category_id=category.id)
+        shift_category_budget_totals(
+            session=session, category_id=category.id, from_grp=category.grp, to_grp=None
+        )
         session.delete(category)
+        bump_all_report_versions(session=session, user_id=category.user_id)
         session.commit()
     return category
@@ -1,25 +1,62 @@
 import uuid
+from collections.abc import Iterator
 from typing import Any
 
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import exists, literal, null, union_all, update
 from sqlmodel import Session, select, func
 
+from app.crud.merchant_key import merchant_key
+from app.crud.pagination import paginate_offset
+from app.crud.search import contains_unaccented
+from app.crud.transaction import bulk_create_transactions
 from app.models import (
+    Account,
     EmailTransaction,
+    EmailTransactionBulkFilter,
+    EmailTransactionConversion,
+    EmailTransactionConversionResult,
     EmailTransactionCreate,
+    EmailTransactionPublic,
+    EmailTransactionStatus,
     EmailTransactionUpdate,
     EmailTxnCategoryAmount,
     EmailTxnMonthlyAmount,
     EmailTxnDashboard,
     Category,
+    GmailConnection,
+    ReconciliationMatch,
+    Transaction,
+    TransactionCreate,
 )
 
+EMAIL_TRANSACTION_EXPORT_COLUMNS = [
+    "id",
+    "gmail_connection_id",
+    "email_id",
+    "received_at",
+    "subject",
+    "sender",
+    "amount",
+    "merchant",
+    "account_number",
+    "transaction_type",
+    "status",
+    "category_id",
+    "category_name",
+    "linked_transaction_id",
+    "created_at",
+]
+
 
 def create_email_transaction(
     *, session: Session, email_transaction_in: EmailTransactionCreate
 ) -> EmailTransaction:
     """Create a new email transaction."""
-    db_obj = EmailTransaction.model_validate(email_transaction_in)
+    db_obj = EmailTransaction.model_validate(
+        email_transaction_in,
+        update={"merchant_key": merchant_key(email_transaction_in.merchant)},
+    )
     session.add(db_obj)
     session.commit()
     session.refresh(db_obj)
@@ -96,6 +133,9 @@ def update_email_transaction(
     transaction_data = transaction_in.model_dump(exclude_unset=True)
     for field, value in transaction_data.items():
         setattr(db_transaction, field, value)
+    if "merchant" in transaction_data:
+        db_transaction.merchant_key = merchant_key(db_transaction.merchant)
+    db_transaction.updated_at = datetime.now(timezone.utc)
     
     session.add(db_transaction)
     session.commit()
@@ -125,23 +165,52 @@ def get_email_transaction_by_email_id(
 
 
 def bulk_update_email_transactions(
-    *, session: Session, transaction_ids: list[uuid.UUID], updates: EmailTransactionUpdate
-) -> list[EmailTransaction]:
-    """Bulk update multiple email transactions."""
-    statement = select(EmailTransaction).where(EmailTransaction.id.in_(transaction_ids))
-    transactions = session.exec(statement).all()
-    
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    updates: EmailTransactionUpdate,
+    transaction_ids: list[uuid.UUID] | None = None,
+    filters: EmailTransactionBulkFilter | None = None,
+) -> list[uuid.UUID]:
+    """Apply the same update to many email transactions in one statement.
+
+    Rows are selected by id list or by filter and restricted to the user's
+    Gmail connections; a single UPDATE ... RETURNING does the work, so the
+    cost is one round trip regardless of how many rows match. Returns the
+    ids that were updated.
+    """
+    user_connections = select(GmailConnection.id).where(GmailConnection.user_id == user_id)
+    clauses = [EmailTransaction.gmail_connection_id.in_(user_connections)]
+    if transaction_ids is not None:
+        clauses.append(EmailTransaction.id.in_(transaction_ids))
+    if filters is not None:
+        if filters.gmail_connection_id is not None:
+            clauses.append(EmailTransaction.gmail_connection_id == filters.gmail_connection_id)
+        if filters.merchant:
+            clauses.append(contains_unaccented(EmailTransaction.merchant, filters.merchant))
+        if filters.sender:
+            clauses.append(contains_unaccented(EmailTransaction.sender, filters.sender))
+        if filters.status is not None:
+            clauses.append(EmailTransaction.status == filters.status)
+        if filters.received_from is not None:
+            clauses.append(EmailTransaction.received_at >= filters.received_from)
+        if filters.received_to is not None:
+            clauses.append(EmailTransaction.received_at < filters.received_to + timedelta(days=1))
+
     update_data = updates.model_dump(exclude_unset=True)
-    for transaction in transactions:
-        for field, value in update_data.items():
-            setattr(transaction, field, value)
-        session.add(transaction)
-    
+    if "merchant" in update_data:
+        update_data["merchant_key"] = merchant_key(update_data["merchant"])
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    statement = (
+        update(EmailTransaction)
+        .where(*clauses)
+        .values(**update_data)
+        .returning(EmailTransaction.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_ids = list(session.exec(statement).scalars().all())
     session.commit()
-    for transaction in transactions:
-        session.refresh(transaction)
-    
-    return transactions
+    return updated_ids
 
 
 def get_email_txn_dashboard(
@@ -209,50 +278,289 @@ def get_email_txn_dashboard(
     return EmailTxnDashboard(by_category=by_category, monthly=monthly)
 
 
+EMAIL_TRANSACTION_SORTS = {
+    "received_at": EmailTransaction.received_at,
+    # Missing amounts sort as zero so keyset cursors never compare NULLs
+    "amount": func.coalesce(EmailTransaction.amount, 0.0),
+}
+EMAIL_TRANSACTION_SORT_BY = {
+    "date_desc": "-received_at",
+    "amount_desc": "-amount",
+    "amount_asc": "amount",
+}
+EMAIL_TRANSACTION_FILTERS = {
+    "gmail_connection_id": EmailTransaction.gmail_connection_id,
+    "status": EmailTransaction.status,
+}
+
+
 def get_email_transactions_for_all_connections(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100, status: str | None = None, sort_by: str = "date_desc"
-) -> tuple[list[EmailTransaction], int]:
-    """Get email transactions for all user's Gmail connections."""
-    # Get all user's Gmail connections
-    from app.crud import gmail_connection as gmail_crud
-    connections = gmail_crud.get_gmail_connections(session=session, user_id=user_id)
-    
-    if not connections:
-        return [], 0
-    
-    # Get all transactions from all connections
-    all_transactions = []
-    total_count = 0
-    
-    for conn in connections:
-        if status:
-            conn_transactions = get_email_transactions(
-                session=session, gmail_connection_id=conn.id, skip=0, limit=10000
-            )
-            conn_transactions = [t for t in conn_transactions if t.status == status]
-            conn_count = count_email_transactions(
-                session=session, gmail_connection_id=conn.id, status=status
-            )
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    status: str | None = None,
+    sort_by: str = "date_desc",
+    gmail_connection_id: uuid.UUID | None = None,
+) -> tuple[list[EmailTransactionPublic], int]:
+    """Page of email transactions across the user's Gmail connections.
+
+    Filtering, sorting and paging happen in one query joined to the
+    connection (for ownership) and category (for its name).
+    """
+    statement = (
+        select(EmailTransaction, Category.name)
+        .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+        .outerjoin(Category, EmailTransaction.category_id == Category.id)
+        .where(GmailConnection.user_id == user_id)
+    )
+    items, count = paginate_offset(
+        session,
+        statement,
+        id_column=EmailTransaction.id,
+        sort=EMAIL_TRANSACTION_SORT_BY.get(sort_by, "-received_at"),
+        sort_spec=EMAIL_TRANSACTION_SORTS,
+        filters={"gmail_connection_id": gmail_connection_id, "status": status},
+        filter_spec=EMAIL_TRANSACTION_FILTERS,
+        skip=skip,
+        limit=limit,
+    )
+    transactions = [
+        EmailTransactionPublic.model_validate(transaction, update={"category_name": name})
+        for transaction, name in items
+    ]
+    return transactions, count
+
+
+def iter_email_transactions_for_export(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    gmail_connection_id: uuid.UUID | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    account_number: str | None = None,
+    category_id: uuid.UUID | None = None,
+    status: str | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[tuple[Any, ...]]:
+    """Yield export rows (EMAIL_TRANSACTION_EXPORT_COLUMNS order) from a server-side cursor.
+
+    The raw email body is left out on purpose: it dominates row size and is
+    not useful for spending analysis.
+    """
+    statement = (
+        select(
+            EmailTransaction.id,
+            EmailTransaction.gmail_connection_id,
+            EmailTransaction.email_id,
+            EmailTransaction.received_at,
+            EmailTransaction.subject,
+            EmailTransaction.sender,
+            EmailTransaction.amount,
+            EmailTransaction.merchant,
+            EmailTransaction.account_number,
+            EmailTransaction.transaction_type,
+            EmailTransaction.status,
+            EmailTransaction.category_id,
+            Category.name,
+            EmailTransaction.linked_transaction_id,
+            EmailTransaction.created_at,
+        )
+        .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+        .join(Category, EmailTransaction.category_id == Category.id, isouter=True)
+        .where(GmailConnection.user_id == user_id)
+    )
+    if gmail_connection_id is not None:
+        statement = statement.where(EmailTransaction.gmail_connection_id == gmail_connection_id)
+    if start_date is not None:
+        statement = statement.where(EmailTransaction.received_at >= start_date)
+    if end_date is not None:
+        # end_date is inclusive, received_at is a timestamp
+        statement = statement.where(EmailTransaction.received_at < end_date + timedelta(days=1))
+    if account_number is not None:
+        statement = statement.where(EmailTransaction.account_number == account_number)
+    if category_id is not None:
+        statement = statement.where(EmailTransaction.category_id == category_id)
+    if status is not None:
+        statement = statement.where(EmailTransaction.status == status)
+    statement = statement.order_by(EmailTransaction.received_at, EmailTransaction.id)
+
+    result = session.exec(statement.execution_options(yield_per=chunk_size))
+    for row in result:
+        yield tuple(row)
+
+
+def convert_email_transactions(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    conversions: list[EmailTransactionConversion],
+) -> list[EmailTransactionConversionResult]:
+    """Create ledger transactions from many email transactions at once.
+
+    The email transactions are loaded with one IN query; the accounts (with
+    their currency, which the new transactions take) and categories are
+    checked together with one UNION ALL query. Every valid item is inserted
+    in a single flush and linked back to its email, and everything is
+    committed together. Invalid items are reported per item and do not
+    block the others.
+    """
+    email_ids = {c.email_transaction_id for c in conversions}
+    email_statement = (
+        select(EmailTransaction)
+        .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+        .where(EmailTransaction.id.in_(email_ids), GmailConnection.user_id == user_id)
+    )
+    email_transactions = {e.id: e for e in session.exec(email_statement).all()}
+
+    references = select(
+        literal("account").label("kind"), Account.id, Account.currency
+    ).where(
+        Account.id.in_({c.account_id for c in conversions}),
+        Account.user_id == user_id,
+    )
+    requested_category_ids = {c.category_id for c in conversions if c.category_id}
+    if requested_category_ids:
+        references = union_all(
+            references,
+            select(literal("category"), Category.id, null()).where(
+                Category.id.in_(requested_category_ids),
+                Category.user_id == user_id,
+            ),
+        )
+    account_currencies: dict[uuid.UUID, str] = {}
+    category_ids: set[uuid.UUID] = set()
+    for kind, owned_id, currency in session.execute(references):
+        if kind == "account":
+            account_currencies[owned_id] = currency
         else:
-            conn_transactions = get_email_transactions(
-                session=session, gmail_connection_id=conn.id, skip=0, limit=10000
+            category_ids.add(owned_id)
+
+    results: list[EmailTransactionConversionResult] = []
+    pending: list[tuple[EmailTransactionConversionResult, EmailTransaction, EmailTransactionConversion]] = []
+    seen: set[uuid.UUID] = set()
+    for conversion in conversions:
+        result = EmailTransactionConversionResult(
+            email_transaction_id=conversion.email_transaction_id
+        )
+        results.append(result)
+        email_transaction = email_transactions.get(conversion.email_transaction_id)
+        if email_transaction is None:
+            result.error = "Email transaction not found"
+        elif conversion.email_transaction_id in seen:
+            result.error = "Email transaction appears more than once in the request"
+        elif email_transaction.linked_transaction_id is not None:
+            result.error = "Email transaction is already linked to a transaction"
+        elif not email_transaction.amount or email_transaction.amount <= 0:
+            result.error = "Email transaction has no amount"
+        elif conversion.account_id not in account_currencies:
+            result.error = "Account not found"
+        elif conversion.category_id and conversion.category_id not in category_ids:
+            result.error = "Category not found"
+        else:
+            pending.append((result, email_transaction, conversion))
+        seen.add(conversion.email_transaction_id)
+
+    if not pending:
+        return results
+
+    transactions_in = [
+        TransactionCreate(
+            txn_date=email_transaction.received_at.date(),
+            type=conversion.type,
+            amount=email_transaction.amount,
+            currency=account_currencies[conversion.account_id],
+            merchant=email_transaction.merchant,
+            note=conversion.note or f"Created from email: {email_transaction.subject}"[:500],
+            account_id=conversion.account_id,
+            category_id=conversion.category_id,
+        )
+        for _, email_transaction, conversion in pending
+    ]
+    db_transactions = bulk_create_transactions(
+        session=session, transactions_in=transactions_in, user_id=user_id
+    )
+
+    now = datetime.now(timezone.utc)
+    for (result, email_transaction, conversion), db_transaction in zip(
+        pending, db_transactions, strict=True
+    ):
+        email_transaction.linked_transaction_id = db_transaction.id
+        email_transaction.category_id = conversion.category_id
+        email_transaction.status = EmailTransactionStatus.processed
+        email_transaction.updated_at = now
+        session.add(email_transaction)
+        result.transaction_id = db_transaction.id
+
+    session.commit()
+    return results
+
+
+def link_email_transactions(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    matches: list[ReconciliationMatch],
+) -> list[ReconciliationMatch]:
+    """Link email transactions to existing ledger transactions in bulk.
+
+    Ownership is checked with one query per side; a match is skipped when
+    either row is not the user's, is already linked, or appears twice in the
+    request. Valid links are written as one executemany UPDATE by primary key.
+    """
+    email_ids = {m.email_transaction_id for m in matches}
+    transaction_ids = {m.transaction_id for m in matches}
+    linkable_emails = set(
+        session.exec(
+            select(EmailTransaction.id)
+            .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+            .where(
+                EmailTransaction.id.in_(email_ids),
+                GmailConnection.user_id == user_id,
+                EmailTransaction.linked_transaction_id.is_(None),
             )
-            conn_count = count_email_transactions(
-                session=session, gmail_connection_id=conn.id
+        ).all()
+    )
+    linkable_transactions = set(
+        session.exec(
+            select(Transaction.id).where(
+                Transaction.id.in_(transaction_ids),
+                Transaction.user_id == user_id,
+                ~exists().where(EmailTransaction.linked_transaction_id == Transaction.id),
             )
-        
-        all_transactions.extend(conn_transactions)
-        total_count += conn_count
-    
-    # Sort transactions based on sort_by parameter
-    if sort_by == "amount_desc":
-        all_transactions.sort(key=lambda x: x.amount or 0, reverse=True)
-    elif sort_by == "amount_asc":
-        all_transactions.sort(key=lambda x: x.amount or 0, reverse=False)
-    else:  # Default: date_desc
-        all_transactions.sort(key=lambda x: x.received_at, reverse=True)
-    
-    # Apply pagination
-    paginated_transactions = all_transactions[skip:skip + limit]
-    
-    return paginated_transactions, total_count
+        ).all()
+    )
+
+    linked: list[ReconciliationMatch] = []
+    used_emails: set[uuid.UUID] = set()
+    used_transactions: set[uuid.UUID] = set()
+    for match in matches:
+        if (
+            match.email_transaction_id not in linkable_emails
+            or match.transaction_id not in linkable_transactions
+            or match.email_transaction_id in used_emails
+            or match.transaction_id in used_transactions
+        ):
+            continue
+        used_emails.add(match.email_transaction_id)
+        used_transactions.add(match.transaction_id)
+        linked.append(match)
+
+    if linked:
+        now = datetime.now(timezone.utc)
+        session.exec(
+            update(EmailTransaction),
+            params=[
+                {
+                    "id": match.email_transaction_id,
+                    "linked_transaction_id": match.transaction_id,
+                    "status": EmailTransactionStatus.processed,
+                    "updated_at": now,
+                }
+                for match in linked
+            ],
+        )
+        session.commit()
+    return linked
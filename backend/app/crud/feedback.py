@@ -2,6 +2,7 @@ from typing import Optional
 
 from sqlmodel import Session, select
 
+from app.crud.pagination import paginate_offset
 from app.models import Feedback, FeedbackCreate, FeedbackPublic, FeedbackUpdate
 
 
@@ -19,11 +20,15 @@ def get_feedback(*, db: Session, id: str, user_id: str) -> Optional[Feedback]:
 
 
 def get_feedbacks(*, db: Session, user_id: str, skip: int = 0, limit: int = 100) -> tuple[list[Feedback], int]:
-    statement = select(Feedback).where(Feedback.user_id == user_id).offset(skip).limit(limit)
-    data = list(db.exec(statement).all())
-    count_statement = select(Feedback).where(Feedback.user_id == user_id)
-    total = len(list(db.exec(count_statement).all()))
-    return data, total
+    return paginate_offset(
+        db,
+        select(Feedback).where(Feedback.user_id == user_id),
+        id_column=Feedback.id,
+        sort="-created_at",
+        sort_spec={"created_at": Feedback.created_at},
+        skip=skip,
+        limit=limit,
+    )
 
 
 def update_feedback(*, db: Session, db_obj: Feedback, feedback_in: FeedbackUpdate) -> Feedback:
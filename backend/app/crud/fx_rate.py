@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.crud.pagination import Page, paginate
+from app.models import FxRate
+
+logger = logging.getLogger(__name__)
+
+FX_RATE_UPSERT_CHUNK = 5000
+
+RateKey = tuple[str, date]  # (currency, first day of the month)
+
+
+class FxRateCache:
+    """Monthly rates to BASE_CURRENCY per (currency, month).
+
+    Filled a whole (currencies, months) range at a time; None marks a
+    currency with no rates, so misses are cached too. Loading rates clears
+    it in this process; other processes drop their copy once it is older
+    than ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._rates: dict[RateKey, float | None] = {}
+        self._filled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[RateKey]) -> dict[RateKey, float | None]:
+        with self._lock:
+            if time.monotonic() - self._filled_at > self.ttl_seconds:
+                self._rates.clear()
+                self._filled_at = time.monotonic()
+            return {key: self._rates[key] for key in keys if key in self._rates}
+
+    def put_many(self, rates: dict[RateKey, float | None]) -> None:
+        with self._lock:
+            self._rates.update(rates)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rates.clear()
+            self._filled_at = time.monotonic()
+
+
+fx_rate_cache = FxRateCache(settings.FX_RATE_CACHE_TTL_SECONDS)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def _load_monthly_rates(
+    *, session: Session, currencies: set[str], start: date, end: date
+) -> dict[RateKey, float | None]:
+    """Rates of every month in [start, end] for the currencies, in two queries.
+
+    A month's rate is the average of its daily rates. Months without rates
+    carry the previous rate forward (the last one before start seeds it);
+    months before a currency's first rate use that first rate, and a
+    currency with no rates at all gets None: its amounts cannot be converted.
+    """
+    month = func.date_trunc(literal_column("'month'"), FxRate.rate_date).cast(
+        FxRate.rate_date.type
+    )
+    averages: dict[RateKey, float] = {
+        (currency, rate_month): rate
+        for currency, rate_month, rate in session.exec(
+            select(FxRate.currency, month, func.avg(FxRate.rate))
+            .where(
+                FxRate.currency.in_(currencies),
+                FxRate.rate_date >= start,
+                FxRate.rate_date < _next_month(end),
+            )
+            .group_by(FxRate.currency, month)
+        )
+    }
+    previous: dict[str, float] = dict(
+        session.exec(
+            select(FxRate.currency, FxRate.rate)
+            .where(FxRate.currency.in_(currencies), FxRate.rate_date < start)
+            .order_by(FxRate.currency, FxRate.rate_date.desc())
+            .distinct(FxRate.currency)
+        ).all()
+    )
+
+    months = [start]
+    while months[-1] < end:
+        months.append(_next_month(months[-1]))
+    rates: dict[RateKey, float | None] = {}
+    for currency in currencies:
+        current = previous.get(currency)
+        if current is None:
+            current = next(
+                (averages[(currency, m)] for m in months if (currency, m) in averages),
+                None,
+            )
+            if current is None:
+                logger.warning(f"No FX rates for {currency}, leaving its amounts out")
+        for m in months:
+            current = averages.get((currency, m), current)
+            rates[(currency, m)] = current
+    return rates
+
+
+def get_monthly_rates(
+    *, session: Session, keys: Iterable[tuple[str, date]]
+) -> dict[RateKey, float | None]:
+    """Rates to BASE_CURRENCY for (currency, any day of the month) keys.
+
+    Keys are normalized to (upper-case currency, month start). Cache misses
+    are loaded as one range covering all of them.
+    """
+    base = settings.BASE_CURRENCY
+    wanted = {(currency.upper(), day.replace(day=1)) for currency, day in keys}
+    wanted = {key for key in wanted if key[0] != base}
+    rates = fx_rate_cache.get_many(wanted)
+    missing = wanted - rates.keys()
+    if missing:
+        loaded = _load_monthly_rates(
+            session=session,
+            currencies={currency for currency, _ in missing},
+            start=min(month for _, month in missing),
+            end=max(month for _, month in missing),
+        )
+        fx_rate_cache.put_many(loaded)
+        rates.update(loaded)
+    return rates
+
+
+def rate_for(
+    rates: dict[RateKey, float | None], currency: str, day: date
+) -> float | None:
+    """Look up a rate fetched by get_monthly_rates; the base currency is 1.
+
+    None means the amount cannot be converted: the currency has no rates,
+    or the key was not fetched. Callers leave such amounts out rather than
+    count them 1:1.
+    """
+    currency = currency.upper()
+    if currency == settings.BASE_CURRENCY:
+        return 1.0
+    return rates.get((currency, day.replace(day=1)))
+
+
+def convert_rows(session: Session, rows: Iterable[tuple[Any, ...]]) -> list[tuple[Any, ...]]:
+    """Turn rows ending in (month, currency, amount) into (..., month, amount in base).
+
+    All rates are fetched together, so converting a grouped report costs at
+    most the two rate queries on a cold cache. Rows in a currency without
+    rates are left out.
+    """
+    rows = list(rows)
+    rates = get_monthly_rates(
+        session=session, keys=((row[-2], row[-3]) for row in rows)
+    )
+    converted = []
+    for row in rows:
+        rate = rate_for(rates, row[-2], row[-3])
+        if rate is not None:
+            converted.append((*row[:-2], float(row[-1] or 0) * rate))
+    return converted
+
+
+def upsert_fx_rates(*, session: Session, rows: list[dict[str, Any]]) -> None:
+    """Insert or overwrite (currency, rate_date, rate) rows. No commit."""
+    for offset in range(0, len(rows), FX_RATE_UPSERT_CHUNK):
+        statement = insert(FxRate).values(rows[offset : offset + FX_RATE_UPSERT_CHUNK])
+        statement = statement.on_conflict_do_update(
+            index_elements=["currency", "rate_date"],
+            set_={"rate": statement.excluded.rate},
+        )
+        session.exec(statement)
+
+
+def get_fx_rates(
+    *,
+    session: Session,
+    currency: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> Page[FxRate]:
+    statement = select(FxRate)
+    if currency is not None:
+        statement = statement.where(FxRate.currency == currency.upper())
+    if start_date is not None:
+        statement = statement.where(FxRate.rate_date >= start_date)
+    if end_date is not None:
+        statement = statement.where(FxRate.rate_date <= end_date)
+    return paginate(
+        session,
+        statement,
+        id_column=FxRate.currency,
+        sort="-rate_date",
+        sort_spec={"rate_date": FxRate.rate_date},
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        count_mode="window",
+    )
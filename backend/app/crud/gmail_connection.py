@@ -3,6 +3,7 @@ from typing import Any
 
 from sqlmodel import Session, select
 
+from app.crud.pagination import paginate_offset
 from app.models import GmailConnection, GmailConnectionCreate, GmailConnectionUpdate
 
 
@@ -41,15 +42,17 @@ def get_gmail_connection(*, session: Session, connection_id: uuid.UUID) -> Gmail
 
 def get_gmail_connections(
     *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> list[GmailConnection]:
-    """Get all Gmail connections for a user."""
-    statement = (
-        select(GmailConnection)
-        .where(GmailConnection.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
+) -> tuple[list[GmailConnection], int]:
+    """Get a page of a user's Gmail connections and their total count."""
+    return paginate_offset(
+        session,
+        select(GmailConnection).where(GmailConnection.user_id == user_id),
+        id_column=GmailConnection.id,
+        sort="created_at",
+        sort_spec={"created_at": GmailConnection.created_at},
+        skip=skip,
+        limit=limit,
     )
-    return session.exec(statement).all()
 
 
 def update_gmail_connection(
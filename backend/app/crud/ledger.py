@@ -0,0 +1,204 @@
+import uuid
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+from sqlalchemy import delete, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+from sqlmodel.sql.expression import Select
+
+from app.crud.account_balance import apply_balance_deltas, rebuild_account_balances
+from app.crud.budget import apply_budget_deltas, rebuild_budget_totals
+from app.models import LedgerAggregate, LedgerAggregateMismatch, Transaction, TxnType
+
+LEDGER_KEY_COLUMNS = ["user_id", "month", "type", "category_id", "account_id", "currency"]
+AMOUNT_TOLERANCE = 0.005
+
+LedgerKey = tuple[uuid.UUID, date, TxnType, uuid.UUID | None, uuid.UUID, str]
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def ledger_key(transaction: Transaction) -> LedgerKey:
+    return (
+        transaction.user_id,
+        month_start(transaction.txn_date),
+        transaction.type,
+        transaction.category_id,
+        transaction.account_id,
+        transaction.currency,
+    )
+
+
+def apply_ledger_deltas(
+    *, session: Session, deltas: Iterable[tuple[LedgerKey, float, int]]
+) -> None:
+    """Add (key, amount, count) deltas to the aggregate table.
+
+    Deltas for the same key are folded first, then written with one
+    INSERT ... ON CONFLICT DO UPDATE; rows whose count drops to zero are
+    removed. Account balances and budget group totals move by the same
+    deltas. Nothing is committed
+    so the caller's transaction write and the aggregate update commit
+    together.
+    """
+    folded: dict[LedgerKey, list[float]] = {}
+    for key, amount, count in deltas:
+        entry = folded.setdefault(key, [0.0, 0])
+        entry[0] += amount
+        entry[1] += count
+    folded = {key: entry for key, entry in folded.items() if entry[1] or entry[0]}
+    if not folded:
+        return
+
+    statement = insert(LedgerAggregate).values(
+        [
+            {
+                "id": uuid.uuid4(),
+                **dict(zip(LEDGER_KEY_COLUMNS, key, strict=True)),
+                "total_amount": amount,
+                "txn_count": count,
+            }
+            for key, (amount, count) in folded.items()
+        ]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=LEDGER_KEY_COLUMNS,
+        set_={
+            "total_amount": LedgerAggregate.total_amount + statement.excluded.total_amount,
+            "txn_count": LedgerAggregate.txn_count + statement.excluded.txn_count,
+        },
+    )
+    session.exec(statement)
+    apply_balance_deltas(
+        session=session,
+        deltas=[
+            (
+                (key[0], key[4]),
+                amount if key[2] == TxnType.income else -amount,
+                count,
+            )
+            for key, (amount, count) in folded.items()
+        ],
+    )
+    apply_budget_deltas(
+        session=session,
+        deltas=[(key, amount, count) for key, (amount, count) in folded.items()],
+    )
+    if any(count < 0 for _, count in folded.values()):
+        user_ids = {key[0] for key in folded}
+        session.exec(
+            delete(LedgerAggregate).where(
+                LedgerAggregate.user_id.in_(user_ids), LedgerAggregate.txn_count <= 0
+            )
+        )
+
+
+def add_to_ledger(
+    *, session: Session, transactions: Iterable[Transaction], sign: int = 1
+) -> None:
+    """Count transactions into (sign=1) or out of (sign=-1) their aggregates."""
+    apply_ledger_deltas(
+        session=session,
+        deltas=[(ledger_key(t), sign * t.amount, sign) for t in transactions],
+    )
+
+
+def _aggregate_statement(user_id: uuid.UUID | None) -> Select[Any]:
+    # Literal unit so the SELECT and GROUP BY expressions are identical
+    month = func.date_trunc(literal_column("'month'"), Transaction.txn_date).cast(
+        LedgerAggregate.month.type
+    )
+    statement: Select[Any] = select(
+        Transaction.user_id,
+        month.label("month"),
+        Transaction.type,
+        Transaction.category_id,
+        Transaction.account_id,
+        Transaction.currency,
+        func.sum(Transaction.amount),
+        func.count(),
+    ).group_by(
+        Transaction.user_id,
+        month,
+        Transaction.type,
+        Transaction.category_id,
+        Transaction.account_id,
+        Transaction.currency,
+    )
+    if user_id is not None:
+        statement = statement.where(Transaction.user_id == user_id)
+    return statement
+
+
+def rebuild_ledger_aggregates(
+    *, session: Session, user_id: uuid.UUID | None = None
+) -> int:
+    """Recompute aggregates, account balances and budget totals from transactions.
+
+    Covers one user, or everyone; returns the aggregate row count.
+    """
+    clear = delete(LedgerAggregate)
+    if user_id is not None:
+        clear = clear.where(LedgerAggregate.user_id == user_id)
+    session.exec(clear)
+
+    source = _aggregate_statement(user_id).add_columns(func.gen_random_uuid())
+    session.exec(
+        insert(LedgerAggregate).from_select(
+            [*LEDGER_KEY_COLUMNS, "total_amount", "txn_count", "id"], source
+        )
+    )
+    rebuild_account_balances(session=session, user_id=user_id)
+    rebuild_budget_totals(session=session, user_id=user_id)
+    count_statement = select(func.count()).select_from(LedgerAggregate)
+    if user_id is not None:
+        count_statement = count_statement.where(LedgerAggregate.user_id == user_id)
+    rows = session.exec(count_statement).one()
+    session.commit()
+    return rows
+
+
+def check_ledger_aggregates(
+    *, session: Session, user_id: uuid.UUID | None = None
+) -> list[LedgerAggregateMismatch]:
+    """Compare stored aggregates with a fresh GROUP BY over transactions."""
+    expected = {
+        tuple(row[:6]): (float(row[6]), row[7])
+        for row in session.exec(_aggregate_statement(user_id))
+    }
+    stored_statement = select(
+        LedgerAggregate.user_id,
+        LedgerAggregate.month,
+        LedgerAggregate.type,
+        LedgerAggregate.category_id,
+        LedgerAggregate.account_id,
+        LedgerAggregate.currency,
+        LedgerAggregate.total_amount,
+        LedgerAggregate.txn_count,
+    )
+    if user_id is not None:
+        stored_statement = stored_statement.where(LedgerAggregate.user_id == user_id)
+    actual = {tuple(row[:6]): (row[6], row[7]) for row in session.exec(stored_statement)}
+
+    mismatches: list[LedgerAggregateMismatch] = []
+    for key in expected.keys() | actual.keys():
+        expected_amount, expected_count = expected.get(key, (0.0, 0))
+        actual_amount, actual_count = actual.get(key, (0.0, 0))
+        if (
+            expected_count != actual_count
+            or abs(expected_amount - actual_amount) > AMOUNT_TOLERANCE
+        ):
+            mismatches.append(
+                LedgerAggregateMismatch(
+                    **dict(zip(LEDGER_KEY_COLUMNS, key, strict=True)),
+                    expected_amount=expected_amount,
+                    actual_amount=actual_amount,
+                    expected_count=expected_count,
+                    actual_count=actual_count,
+                )
+            )
+    return mismatches
@@ -0,0 +1,128 @@
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.models import MerchantCategoryStat, Transaction
+from app.utils import normalize_text
+
+MERCHANT_TOKEN_PREFIX = "m:"
+WORD_TOKEN_PREFIX = "w:"
+MIN_WORD_LENGTH = 3
+UPSERT_CHUNK_SIZE = 1000
+
+
+def category_tokens(merchant: str | None, description: str | None = None) -> list[str]:
+    """Index tokens for a merchant and optional free-text description.
+
+    The whole normalized merchant is one token (the strongest signal), each
+    word of the merchant and description is another.
+    """
+    tokens: list[str] = []
+    merchant_text = normalize_text(merchant)
+    if merchant_text:
+        tokens.append(f"{MERCHANT_TOKEN_PREFIX}{merchant_text}"[:255])
+    seen: set[str] = set()
+    for word in f"{merchant_text} {normalize_text(description)}".split():
+        if len(word) < MIN_WORD_LENGTH or word in seen or set(word) == {"#"}:
+            continue
+        seen.add(word)
+        tokens.append(f"{WORD_TOKEN_PREFIX}{word}"[:255])
+    return tokens
+
+
+def _upsert_counts(
+    *, session: Session, user_id: uuid.UUID, counts: Counter[tuple[str, uuid.UUID]]
+) -> None:
+    items = list(counts.items())
+    for start in range(0, len(items), UPSERT_CHUNK_SIZE):
+        statement = insert(MerchantCategoryStat).values(
+            [
+                {"user_id": user_id, "token": token, "category_id": category_id, "hits": hits}
+                for (token, category_id), hits in items[start : start + UPSERT_CHUNK_SIZE]
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "token", "category_id"],
+            set_={"hits": MerchantCategoryStat.hits + statement.excluded.hits},
+        )
+        session.exec(statement)
+
+
+def record_category_usage(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    usages: Iterable[tuple[str | None, str | None, uuid.UUID | None]],
+) -> None:
+    """Add (merchant, description, category_id) observations to the index.
+
+    Runs as one upsert per chunk and does not commit; the caller's commit
+    makes the index update atomic with the transaction write.
+    """
+    counts: Counter[tuple[str, uuid.UUID]] = Counter()
+    for merchant, description, category_id in usages:
+        if category_id is None:
+            continue
+        for token in category_tokens(merchant, description):
+            counts[(token, category_id)] += 1
+    if counts:
+        _upsert_counts(session=session, user_id=user_id, counts=counts)
+
+
+def rebuild_merchant_category_index(
+    *, session: Session, user_id: uuid.UUID, chunk_size: int = 5000
+) -> int:
+    """Rebuild a user's index from all categorized transactions; return the entry count."""
+    session.exec(delete(MerchantCategoryStat).where(MerchantCategoryStat.user_id == user_id))
+    statement = select(
+        Transaction.merchant, Transaction.note, Transaction.category_id
+    ).where(Transaction.user_id == user_id, Transaction.category_id.is_not(None))
+    counts: Counter[tuple[str, uuid.UUID]] = Counter()
+    for merchant, note, category_id in session.exec(
+        statement.execution_options(yield_per=chunk_size)
+    ):
+        for token in category_tokens(merchant, note):
+            counts[(token, category_id)] += 1
+    if counts:
+        _upsert_counts(session=session, user_id=user_id, counts=counts)
+    session.commit()
+    return len(counts)
+
+
+def get_merchant_category_index(
+    *, session: Session, user_id: uuid.UUID
+) -> dict[str, tuple[uuid.UUID, int]]:
+    """Map each token to its most used category and that category's hit count."""
+    statement = (
+        select(
+            MerchantCategoryStat.token,
+            MerchantCategoryStat.category_id,
+            MerchantCategoryStat.hits,
+        )
+        .where(MerchantCategoryStat.user_id == user_id)
+        .distinct(MerchantCategoryStat.token)
+        .order_by(
+            MerchantCategoryStat.token,
+            MerchantCategoryStat.hits.desc(),
+            MerchantCategoryStat.category_id,
+        )
+    )
+    return {
+        token: (category_id, hits)
+        for token, category_id, hits in session.exec(statement)
+    }
+
+
+def count_merchant_category_stats(
+    *, session: Session, user_id: uuid.UUID
+) -> tuple[int, int]:
+    """Return (distinct tokens, token/category entries) for a user's index."""
+    statement = select(
+        func.count(func.distinct(MerchantCategoryStat.token)), func.count()
+    ).where(MerchantCategoryStat.user_id == user_id)
+    tokens, entries = session.exec(statement).one()
+    return tokens, entries
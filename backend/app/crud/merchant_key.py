@@ -0,0 +1,204 @@
+import difflib
+import re
+import uuid
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import null, update
+from sqlmodel import Session, select
+
+from app.models import EmailTransaction, GmailConnection, Transaction
+from app.utils import normalize_text
+
+MERCHANT_KEY_MAX_WORDS = 3
+FUZZY_CUTOFF = 0.8
+BACKFILL_BATCH_SIZE = 5000
+
+# Normalized word sequence -> canonical merchant key. Wallets and marketplaces
+# come first in bank descriptions ("ShopeePay 8438... - VCCB APAY..."), so the
+# leftmost match decides.
+MERCHANT_RULES = {
+    "shopee": "shopee",
+    "shopeepay": "shopee",
+    "shopee pay": "shopee",
+    "shopeefood": "shopeefood",
+    "shopee food": "shopeefood",
+    "grab": "grab",
+    "grabpay": "grab",
+    "grabfood": "grab",
+    "grab food": "grab",
+    "gojek": "gojek",
+    "xanh sm": "xanh sm",
+    "remitano": "remitano",
+    "binance": "binance",
+    "momo": "momo",
+    "vi momo": "momo",
+    "zalopay": "zalopay",
+    "zalo pay": "zalopay",
+    "vnpay": "vnpay",
+    "tiki": "tiki",
+    "lazada": "lazada",
+    "tiktok shop": "tiktok shop",
+    "highlands": "highlands coffee",
+    "highlands coffee": "highlands coffee",
+    "the coffee house": "the coffee house",
+    "phuc long": "phuc long",
+    "starbucks": "starbucks",
+    "circle k": "circle k",
+    "winmart": "winmart",
+    "vinmart": "winmart",
+    "bach hoa xanh": "bach hoa xanh",
+    "coopmart": "coopmart",
+    "co op mart": "coopmart",
+    "gs": "gs25",
+    "ministop": "ministop",
+    "familymart": "familymart",
+    "eleven": "7-eleven",
+    "aeon": "aeon",
+    "lotte mart": "lotte mart",
+    "pharmacity": "pharmacity",
+    "long chau": "long chau",
+    "guardian": "guardian",
+    "kfc": "kfc",
+    "lotteria": "lotteria",
+    "jollibee": "jollibee",
+    "netflix": "netflix",
+    "spotify": "spotify",
+    "youtube": "youtube",
+    "google": "google",
+    "apple com": "apple",
+    "evn": "evn",
+    "viettel": "viettel",
+    "vinaphone": "vinaphone",
+    "mobifone": "mobifone",
+}
+
+# Words of bank descriptions that never name the merchant
+NOISE_WORDS = frozenset(
+    "ck ct chuyen tien khoan thanh toan tt gd giao dich ma so tk tai den tu qua "
+    "ref ft ibft napas vcb vccb tcb mb acb bidv apay nft qr pos payment pay to "
+    "from transfer trf mbvcb the card".split()
+)
+
+WORD = re.compile(r"[a-z]+")
+
+
+class _Trie:
+    """Word trie over MERCHANT_RULES; finds the leftmost, longest rule."""
+
+    def __init__(self, rules: dict[str, str]) -> None:
+        self.root: dict[str | None, Any] = {}
+        for phrase, key in rules.items():
+            node = self.root
+            for word in phrase.split():
+                node = node.setdefault(word, {})
+            node[None] = key
+
+    def match(self, words: list[str]) -> str | None:
+        for start in range(len(words)):
+            node = self.root
+            found: str | None = None
+            for word in words[start:]:
+                child = node.get(word)
+                if child is None:
+                    break
+                node = child
+                found = node.get(None, found)
+            if found is not None:
+                return found
+        return None
+
+
+_rules = _Trie(MERCHANT_RULES)
+_canonical_keys = sorted(set(MERCHANT_RULES.values()))
+
+
+@lru_cache(maxsize=8192)
+def _closest_canonical(key: str) -> str | None:
+    matches = difflib.get_close_matches(key, _canonical_keys, n=1, cutoff=FUZZY_CUTOFF)
+    return matches[0] if matches else None
+
+
+@lru_cache(maxsize=65536)
+def _key_for_text(text: str) -> str | None:
+    normalized = normalize_text(text)
+    key = _rules.match(WORD.findall(normalized))
+    if key is not None:
+        return key
+    # Words glued to digits ("apay#nft#") are references, not names
+    words = [
+        word
+        for word in normalized.split()
+        if "#" not in word and len(word) > 1 and word not in NOISE_WORDS
+    ]
+    if not words:
+        return None
+    key = " ".join(words[:MERCHANT_KEY_MAX_WORDS])
+    return _closest_canonical(key) or key
+
+
+def merchant_key(merchant: str | None, description: str | None = None) -> str | None:
+    """Canonical merchant of raw merchant text, falling back to the description.
+
+    Rules are tried first, then the leading meaningful words form the key,
+    snapped to a rule merchant when they are a near miss ("shoppe").
+    Results are cached, so bulk ingest pays once per distinct text.
+    """
+    for text in (merchant, description):
+        if text:
+            key = _key_for_text(text)
+            if key is not None:
+                return key[:255]
+    return None
+
+
+def _backfill_sources(user_id: uuid.UUID | None) -> list[tuple[Any, Any]]:
+    """(model, select of id, merchant, description, merchant_key) per table."""
+    transactions = select(
+        Transaction.id, Transaction.merchant, Transaction.note, Transaction.merchant_key
+    )
+    emails = select(
+        EmailTransaction.id, EmailTransaction.merchant, null(), EmailTransaction.merchant_key
+    )
+    if user_id is not None:
+        transactions = transactions.where(Transaction.user_id == user_id)
+        emails = emails.join(
+            GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id
+        ).where(GmailConnection.user_id == user_id)
+    return [(Transaction, transactions), (EmailTransaction, emails)]
+
+
+def backfill_merchant_keys(
+    *,
+    session: Session,
+    user_id: uuid.UUID | None = None,
+    only_missing: bool = True,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> int:
+    """Compute stored merchant keys in id-ordered batches; return rows updated.
+
+    Each batch is one keyset read and one executemany UPDATE by primary key,
+    committed on its own so a long backfill can be interrupted and resumed.
+    Run with only_missing=False after changing the rules.
+    """
+    updated = 0
+    for model, source in _backfill_sources(user_id):
+        if only_missing:
+            source = source.where(model.merchant_key.is_(None))
+        last_id = None
+        while True:
+            statement = source if last_id is None else source.where(model.id > last_id)
+            rows = session.exec(statement.order_by(model.id).limit(batch_size)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            changes = [
+                {"id": row_id, "merchant_key": key}
+                for row_id, merchant, description, stored in rows
+                if (key := merchant_key(merchant, description)) != stored
+            ]
+            if changes:
+                session.exec(update(model), params=changes)
+                session.commit()
+                updated += len(changes)
+    return updated
@@ -0,0 +1,204 @@
+import base64
+import enum
+import json
+import uuid
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, Literal, TypeVar
+
+from sqlalchemy import ColumnElement, literal, tuple_
+from sqlmodel import Session, func, select
+
+T = TypeVar("T")
+
+# A filter is either a column compared for equality or a function building the clause
+FilterSpec = Mapping[str, ColumnElement[Any] | Callable[[Any], ColumnElement[bool]]]
+SortSpec = Mapping[str, ColumnElement[Any]]
+CountMode = Literal["subquery", "window"]
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    count: int | None
+    next_cursor: str | None = None
+
+
+def apply_filters(
+    statement: Any, filters: Mapping[str, Any] | None, spec: FilterSpec
+) -> Any:
+    """Add the clauses of the given filters; None values are ignored.
+
+    Only names present in spec are accepted, so request parameters can be
+    passed through without exposing arbitrary columns.
+    """
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        if name not in spec:
+            raise ValueError(f"Unknown filter: {name}")
+        target = spec[name]
+        statement = statement.where(target(value) if callable(target) else target == value)
+    return statement
+
+
+def parse_sort(sort: str, spec: SortSpec) -> tuple[ColumnElement[Any], bool]:
+    """Resolve "name" / "-name" against the whitelist; return (column, descending)."""
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    if name not in spec:
+        raise ValueError(f"Unknown sort: {name}")
+    return spec[name], descending
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value: Any, column: ColumnElement[Any]) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = json.dumps([_encode_value(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, *columns: ColumnElement[Any]) -> tuple[Any, ...]:
+    """Decode a cursor made by encode_cursor, typing each value like its column."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Wrong cursor length")
+        return tuple(
+            _decode_value(value, column)
+            for value, column in zip(values, columns, strict=True)
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def count_rows(session: Session, statement: Any) -> int:
+    """COUNT(*) over the statement as a subquery, without its ordering or paging."""
+    subquery = statement.order_by(None).limit(None).offset(None).subquery()
+    return session.exec(select(func.count()).select_from(subquery)).one()
+
+
+def paginate(
+    session: Session,
+    statement: Any,
+    *,
+    id_column: ColumnElement[Any],
+    sort: str,
+    sort_spec: SortSpec,
+    filters: Mapping[str, Any] | None = None,
+    filter_spec: FilterSpec | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_mode: CountMode | None = "subquery",
+) -> Page[Any]:
+    """Run a filtered, sorted page of statement.
+
+    With a cursor the page starts right after the row it encodes (keyset
+    mode) and skip is ignored; otherwise skip/limit apply. One extra row is
+    fetched to know whether a next_cursor exists, so clients can switch to
+    keyset paging after the first page.
+
+    count_mode "subquery" issues a separate COUNT(*) over the filtered
+    statement; "window" reads COUNT(*) OVER () from the page itself (one
+    round trip) and leaves count None on keyset pages, where a count would
+    cost a scan of the whole filtered set; None skips counting. Items are whatever
+    statement selects: entities for a single-entity select, rows when
+    related columns are projected alongside. Keyset mode needs a non-null
+    sort column.
+    """
+    filtered = apply_filters(statement, filters, filter_spec or {})
+    sort_column, descending = parse_sort(sort, sort_spec)
+    use_window = count_mode == "window" and cursor is None
+    count = None
+    if count_mode == "subquery":
+        count = count_rows(session, filtered)
+
+    statement = filtered
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor, sort_column, id_column)
+        key = tuple_(sort_column, id_column)
+        cursor_key = tuple_(
+            literal(sort_value, sort_column.type), literal(row_id, id_column.type)
+        )
+        statement = statement.where(key < cursor_key if descending else key > cursor_key)
+    else:
+        statement = statement.offset(skip)
+
+    single_entity = len(statement.column_descriptions) == 1
+    extra_columns = [sort_column, id_column]
+    if use_window:
+        extra_columns.append(func.count().over())
+    order = (sort_column.desc(), id_column.desc()) if descending else (sort_column, id_column)
+    statement = statement.add_columns(*extra_columns).order_by(*order).limit(limit + 1)
+
+    # execute(), not exec(): the latter would return only the entity of a
+    # single-entity select and drop the extra columns
+    rows = list(session.execute(statement))
+    width = len(extra_columns)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if use_window:
+        # An empty page past the end has no window row to read the total from
+        count = rows[0][-1] if rows else (count_rows(session, filtered) if skip else 0)
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last[-width], last[-width + 1])
+    items = [row[0] if single_entity else row[:-width] for row in rows]
+    return Page(items=items, count=count, next_cursor=next_cursor)
+
+
+def paginate_offset(
+    session: Session,
+    statement: Any,
+    *,
+    id_column: ColumnElement[Any],
+    sort: str,
+    sort_spec: SortSpec,
+    filters: Mapping[str, Any] | None = None,
+    filter_spec: FilterSpec | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> tuple[list[Any], int]:
+    """Items and total of an offset page, for listings without cursor paging.
+
+    The total is read with COUNT(*) OVER () from the page itself, so the
+    listing costs one round trip and is always counted.
+    """
+    page = paginate(
+        session,
+        statement,
+        id_column=id_column,
+        sort=sort,
+        sort_spec=sort_spec,
+        filters=filters,
+        filter_spec=filter_spec,
+        skip=skip,
+        limit=limit,
+        count_mode="window",
+    )
+    # Only keyset pages go uncounted
+    assert page.count is not None
+    return page.items, page.count
@@ -0,0 +1,27 @@
+import uuid
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.models import RecurringSeries
+
+
+def get_recurring_series(
+    *, session: Session, user_id: uuid.UUID
+) -> list[RecurringSeries]:
+    """Stored series of a user, soonest next occurrence first."""
+    statement = (
+        select(RecurringSeries)
+        .where(RecurringSeries.user_id == user_id)
+        .order_by(RecurringSeries.next_date, RecurringSeries.id)
+    )
+    return list(session.exec(statement).all())
+
+
+def replace_recurring_series(
+    *, session: Session, user_id: uuid.UUID, series: list[RecurringSeries]
+) -> None:
+    """Swap a user's stored series for a fresh detection result and commit."""
+    session.exec(delete(RecurringSeries).where(RecurringSeries.user_id == user_id))
+    session.add_all(series)
+    session.commit()
@@ -0,0 +1,346 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    DateTime,
+    Float,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    literal_column,
+    true,
+    values,
+)
+from sqlmodel import Session, col, func, select
+
+from app.core.config import settings
+from app.crud.fx_rate import convert_rows, get_monthly_rates, rate_for
+from app.crud.ledger import month_start
+from app.models import (
+    Account,
+    Category,
+    CategoryGroup,
+    LedgerAggregate,
+    Transaction,
+    TxnType,
+)
+
+# (category_id, name, month, total, previous, average, year_ago)
+CategoryTrendRow = tuple[
+    uuid.UUID | None, str | None, date, float, float | None, float, float | None
+]
+
+
+def get_month_bounds(year: int, month: int) -> tuple[date, date]:
+    """Return the first day of the month and the first day of the next month."""
+    start_date = date(year, month, 1)
+    if month == 12:
+        return start_date, date(year + 1, 1, 1)
+    return start_date, date(year, month + 1, 1)
+
+
+def _period_filter(
+    user_id: uuid.UUID, start_date: date, end_date: date
+) -> list[ColumnElement[bool]]:
+    return [
+        col(Transaction.user_id) == user_id,
+        col(Transaction.txn_date) >= start_date,
+        col(Transaction.txn_date) < end_date,
+    ]
+
+
+def _aggregate_period_filter(
+    user_id: uuid.UUID, start_date: date, end_date: date
+) -> list[ColumnElement[bool]]:
+    # Aggregates are keyed by the first day of the month
+    return [
+        col(LedgerAggregate.user_id) == user_id,
+        col(LedgerAggregate.month) >= month_start(start_date),
+        col(LedgerAggregate.month) < end_date,
+    ]
+
+
+def get_type_totals(
+    *, session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> dict[TxnType, tuple[float, int]]:
+    """Sum and count of transactions per type for the months in [start_date, end_date).
+
+    Sums are in BASE_CURRENCY, like every report total here: the database
+    groups per month and currency and the monthly rates convert the rows.
+    """
+    statement = (
+        select(
+            LedgerAggregate.type,
+            func.sum(LedgerAggregate.txn_count),
+            LedgerAggregate.month,
+            LedgerAggregate.currency,
+            func.sum(LedgerAggregate.total_amount),
+        )
+        .where(*_aggregate_period_filter(user_id, start_date, end_date))
+        .group_by(LedgerAggregate.type, LedgerAggregate.month, LedgerAggregate.currency)
+    )
+    totals = dict.fromkeys(TxnType, (0.0, 0))
+    for txn_type, count, _, total in convert_rows(session, session.exec(statement)):
+        amount, previous_count = totals[txn_type]
+        totals[txn_type] = (amount + total, previous_count + int(count or 0))
+    return totals
+
+
+def get_unconverted_amounts(
+    *, session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> dict[date, dict[str, float]]:
+    """Amounts the totals above leave out for want of FX rates, per month and currency.
+
+    Keyed by the first day of the month, then by upper-case currency; the
+    amounts are in that currency, income and expenses together. Months
+    where everything converted are absent.
+    """
+    currency = func.upper(LedgerAggregate.currency)
+    statement = (
+        select(LedgerAggregate.month, currency, func.sum(LedgerAggregate.total_amount))
+        .where(
+            *_aggregate_period_filter(user_id, start_date, end_date),
+            currency != settings.BASE_CURRENCY,
+        )
+        .group_by(LedgerAggregate.month, currency)
+    )
+    rows = session.exec(statement).all()
+    rates = get_monthly_rates(
+        session=session, keys=((code, month) for month, code, _ in rows)
+    )
+    unconverted: dict[date, dict[str, float]] = {}
+    for month, code, amount in rows:
+        if rate_for(rates, code, month) is None:
+            by_currency = unconverted.setdefault(month, {})
+            by_currency[code] = by_currency.get(code, 0.0) + float(amount or 0)
+    return unconverted
+
+
+def get_category_breakdown(
+    *, session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> dict[str, float]:
+    """Net spend per category name: expenses add, income subtracts."""
+    signed_amount = case(
+        (LedgerAggregate.type == TxnType.expense, LedgerAggregate.total_amount),
+        else_=-LedgerAggregate.total_amount,
+    )
+    statement = (
+        select(
+            Category.name,
+            LedgerAggregate.month,
+            LedgerAggregate.currency,
+            func.sum(signed_amount),
+        )
+        .join(Category, LedgerAggregate.category_id == Category.id)
+        .where(*_aggregate_period_filter(user_id, start_date, end_date))
+        .group_by(Category.name, LedgerAggregate.month, LedgerAggregate.currency)
+    )
+    return _sum_by_name(convert_rows(session, session.exec(statement)))
+
+
+def get_account_breakdown(
+    *, session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> dict[str, float]:
+    """Net cash flow per account name: income adds, expenses subtract."""
+    signed_amount = case(
+        (LedgerAggregate.type == TxnType.expense, -LedgerAggregate.total_amount),
+        else_=LedgerAggregate.total_amount,
+    )
+    statement = (
+        select(
+            Account.name,
+            LedgerAggregate.month,
+            LedgerAggregate.currency,
+            func.sum(signed_amount),
+        )
+        .join(Account, LedgerAggregate.account_id == Account.id)
+        .where(*_aggregate_period_filter(user_id, start_date, end_date))
+        .group_by(Account.name, LedgerAggregate.month, LedgerAggregate.currency)
+    )
+    return _sum_by_name(convert_rows(session, session.exec(statement)))
+
+
+def _sum_by_name(rows: list[tuple[str, date, float]]) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for name, _, amount in rows:
+        totals[name] = totals.get(name, 0.0) + amount
+    return totals
+
+
+def get_monthly_type_totals(
+    *, session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> dict[tuple[int, int], dict[TxnType, tuple[float, int]]]:
+    """Sum and count per (year, month) and type for the months in [start_date, end_date)."""
+    statement = (
+        select(
+            LedgerAggregate.type,
+            func.sum(LedgerAggregate.txn_count),
+            LedgerAggregate.month,
+            LedgerAggregate.currency,
+            func.sum(LedgerAggregate.total_amount),
+        )
+        .where(*_aggregate_period_filter(user_id, start_date, end_date))
+        .group_by(LedgerAggregate.month, LedgerAggregate.type, LedgerAggregate.currency)
+    )
+    totals: dict[tuple[int, int], dict[TxnType, tuple[float, int]]] = {}
+    for txn_type, count, month, total in convert_rows(session, session.exec(statement)):
+        month_totals = totals.setdefault(
+            (month.year, month.month), dict.fromkeys(TxnType, (0.0, 0))
+        )
+        amount, previous_count = month_totals[txn_type]
+        month_totals[txn_type] = (amount + total, previous_count + int(count or 0))
+    return totals
+
+
+def get_monthly_group_totals(
+    *, session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> list[tuple[date, CategoryGroup | None, TxnType, float]]:
+    """(month, category group, type, sum) rows for the months in [start_date, end_date).
+
+    The group is None for uncategorized transactions.
+    """
+    statement = (
+        select(
+            Category.grp,
+            LedgerAggregate.type,
+            LedgerAggregate.month,
+            LedgerAggregate.currency,
+            func.sum(LedgerAggregate.total_amount),
+        )
+        .outerjoin(Category, LedgerAggregate.category_id == Category.id)
+        .where(*_aggregate_period_filter(user_id, start_date, end_date))
+        .group_by(
+            LedgerAggregate.month, Category.grp, LedgerAggregate.type, LedgerAggregate.currency
+        )
+    )
+    totals: dict[tuple[date, CategoryGroup | None, TxnType], float] = {}
+    for grp, txn_type, month, total in convert_rows(session, session.exec(statement)):
+        key = (month, grp, txn_type)
+        totals[key] = totals.get(key, 0.0) + total
+    return [(*key, total) for key, total in totals.items()]
+
+
+def get_category_trend_rows(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    start_month: date,
+    end_month: date,
+    txn_type: TxnType,
+) -> list[CategoryTrendRow]:
+    """Per category and month in [start_month, end_month]: (category_id, name,
+    month, total, previous month, 3-month average, same month a year ago).
+
+    One windowed query over the ledger aggregates, which are already
+    truncated to months: a dense (category x month) grid starting a year
+    early feeds LAG(1), LAG(12) and a 3-row AVG, so the first months of the
+    range see their real history. Totals are in BASE_CURRENCY, converted
+    with the cached monthly rates joined in as a VALUES list.
+    """
+    scan_start = date(start_month.year - 1, start_month.month, 1)
+    in_range = (
+        LedgerAggregate.user_id == user_id,
+        LedgerAggregate.type == txn_type,
+        LedgerAggregate.month >= scan_start,
+        LedgerAggregate.month <= end_month,
+    )
+    currency_months = session.exec(
+        select(LedgerAggregate.currency, LedgerAggregate.month).where(*in_range).distinct()
+    ).all()
+    rates = get_monthly_rates(session=session, keys=currency_months)
+
+    amount = LedgerAggregate.total_amount
+    monthly = select(LedgerAggregate.category_id, LedgerAggregate.month)
+    if rates:
+        rate_table = values(
+            column("currency", String), column("month", Date), column("rate", Float),
+            name="rates",
+        ).data([(currency, month, rate) for (currency, month), rate in rates.items()])
+        # A NULL rate (currency without rates) leaves the row out of the SUM
+        amount = amount * case(
+            (func.upper(LedgerAggregate.currency) == settings.BASE_CURRENCY, 1.0),
+            else_=rate_table.c.rate,
+        )
+        monthly = monthly.outerjoin(
+            rate_table,
+            and_(
+                rate_table.c.currency == func.upper(LedgerAggregate.currency),
+                rate_table.c.month == LedgerAggregate.month,
+            ),
+        )
+    monthly = (
+        monthly.add_columns(func.sum(amount).label("total"))
+        .where(*in_range)
+        .group_by(LedgerAggregate.category_id, LedgerAggregate.month)
+        .cte("monthly")
+    )
+    months = select(
+        cast(
+            func.generate_series(
+                cast(scan_start, DateTime),
+                cast(end_month, DateTime),
+                literal_column("interval '1 month'"),
+            ),
+            Date,
+        ).label("month")
+    ).cte("months")
+    categories = select(monthly.c.category_id).distinct().cte("categories")
+    grid = (
+        select(
+            categories.c.category_id,
+            months.c.month,
+            func.coalesce(monthly.c.total, 0.0).label("total"),
+        )
+        .select_from(categories.join(months, true()))
+        .outerjoin(
+            monthly,
+            and_(
+                monthly.c.category_id.is_not_distinct_from(categories.c.category_id),
+                monthly.c.month == months.c.month,
+            ),
+        )
+        .subquery("grid")
+    )
+    window = {"partition_by": grid.c.category_id, "order_by": grid.c.month}
+    trends = select(
+        grid.c.category_id,
+        grid.c.month,
+        grid.c.total,
+        func.lag(grid.c.total, 1).over(**window).label("previous"),
+        func.avg(grid.c.total).over(**window, rows=(-2, 0)).label("average"),
+        func.lag(grid.c.total, 12).over(**window).label("year_ago"),
+    ).subquery("trends")
+    statement = (
+        select(
+            trends.c.category_id,
+            Category.name,
+            trends.c.month,
+            trends.c.total,
+            trends.c.previous,
+            trends.c.average,
+            trends.c.year_ago,
+        )
+        .outerjoin(Category, Category.id == trends.c.category_id)
+        .where(trends.c.month >= start_month)
+        .order_by(trends.c.category_id, trends.c.month)
+    )
+    return list(session.exec(statement).all())
+
+
+def get_transactions_by_month(
+    *, session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> dict[tuple[int, int], list[Transaction]]:
+    """Transactions in [start_date, end_date) from one ordered query, split by (year, month)."""
+    statement = (
+        select(Transaction)
+        .where(*_period_filter(user_id, start_date, end_date))
+        .order_by(Transaction.txn_date, Transaction.id)
+    )
+    by_month: dict[tuple[int, int], list[Transaction]] = {}
+    for txn in session.exec(statement):
+        by_month.setdefault((txn.txn_date.year, txn.txn_date.month), []).append(txn)
+    return by_month
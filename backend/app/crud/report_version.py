@@ -0,0 +1,70 @@
+import uuid
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.models import ReportVersion
+
+
+def bump_report_versions(
+    *, session: Session, user_id: uuid.UUID, months: Iterable[date]
+) -> None:
+    """Invalidate cached reports for the given months (any day within them).
+
+    One upsert, no commit: the bump lands atomically with the write that
+    caused it.
+    """
+    month_starts = sorted({month.replace(day=1) for month in months})
+    if not month_starts:
+        return
+    statement = insert(ReportVersion).values(
+        [{"user_id": user_id, "month": month, "version": 1} for month in month_starts]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "month"],
+        set_={"version": ReportVersion.version + 1},
+    )
+    session.exec(statement)
+
+
+def bump_all_report_versions(*, session: Session, user_id: uuid.UUID) -> None:
+    """Invalidate every cached month of a user, e.g. after a category rename. No commit."""
+    session.exec(
+        update(ReportVersion)
+        .where(ReportVersion.user_id == user_id)
+        .values(version=ReportVersion.version + 1)
+    )
+
+
+def bump_report_versions_since(*, session: Session, month: date) -> None:
+    """Invalidate every user's months from month on, e.g. after FX rates change. No commit."""
+    session.exec(
+        update(ReportVersion)
+        .where(ReportVersion.month >= month.replace(day=1))
+        .values(version=ReportVersion.version + 1)
+    )
+
+
+def get_report_versions(
+    *, session: Session, user_id: uuid.UUID, start_month: date, end_month: date
+) -> dict[date, int]:
+    """Versions of the months in [start_month, end_month]; missing months are version 0."""
+    statement = select(ReportVersion.month, ReportVersion.version).where(
+        ReportVersion.user_id == user_id,
+        ReportVersion.month >= start_month.replace(day=1),
+        ReportVersion.month <= end_month,
+    )
+    return dict(session.exec(statement).all())
+
+
+def get_report_version_token(*, session: Session, user_id: uuid.UUID) -> tuple[int, int]:
+    """(months, sum of versions) of a user: changes whenever any month is bumped."""
+    count, total = session.exec(
+        select(func.count(), func.coalesce(func.sum(ReportVersion.version), 0)).where(
+            ReportVersion.user_id == user_id
+        )
+    ).one()
+    return count, int(total)
@@ -3,6 +3,9 @@ from typing import Any
 
 from sqlmodel import Session, select
 
+from app.crud.pagination import paginate_offset
+from app.crud.search import title_search
+
 from app.models import (
     Resource,
     ResourceCreate,
@@ -81,17 +84,20 @@ def get_resources(
     limit: int = 100,
 ) -> ResourcesPublic:
     """Get resources for a user, optionally filtered by milestone."""
-    statement = select(Resource).where(Resource.user_id == user_id)
-    
-    if milestone_id is not None:
-        statement = statement.where(Resource.milestone_id == milestone_id)
-    
-    statement = statement.offset(skip).limit(limit)
-    resources = session.exec(statement).all()
-    
+    items, count = paginate_offset(
+        session,
+        select(Resource).where(Resource.user_id == user_id),
+        id_column=Resource.id,
+        sort="created_at",
+        sort_spec={"created_at": Resource.created_at},
+        filters={"milestone_id": milestone_id},
+        filter_spec={"milestone_id": Resource.milestone_id},
+        skip=skip,
+        limit=limit,
+    )
     return ResourcesPublic(
-        data=[_resource_to_public(resource) for resource in resources],
-        count=len(resources),
+        data=[_resource_to_public(resource) for resource in items],
+        count=count,
     )
 
 
@@ -172,15 +178,19 @@ def get_resource_subjects(
             ResourceSubject.resource_id == resource_id,
             Resource.user_id == user_id,
         )
-        .order_by(ResourceSubject.order_index)
-        .offset(skip)
-        .limit(limit)
     )
-    subjects = session.exec(statement).all()
-    
+    items, count = paginate_offset(
+        session,
+        statement,
+        id_column=ResourceSubject.id,
+        sort="order_index",
+        sort_spec={"order_index": ResourceSubject.order_index},
+        skip=skip,
+        limit=limit,
+    )
     return ResourceSubjectsPublic(
-        data=[_resource_subject_to_public(subject) for subject in subjects],
-        count=len(subjects),
+        data=[_resource_subject_to_public(subject) for subject in items],
+        count=count,
     )
 
 
@@ -263,16 +273,15 @@ def search_subjects_for_user(
         .where(Resource.user_id == user_id)
     )
     
-    # Add search condition if provided
+    # Add search condition if provided, best matches first
+    order_by = [ResourceSubject.created_at.desc()]
     if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        statement = statement.where(
-            ResourceSubject.title.ilike(search_term) |
-            ResourceSubject.description.ilike(search_term)
-        )
-    
+        matches, rank = title_search(search.strip(), ResourceSubject.title, ResourceSubject.description)
+        statement = statement.where(matches)
+        order_by.insert(0, rank.desc())
+
     # Execute query with pagination
-    statement = statement.order_by(ResourceSubject.created_at.desc()).offset(skip).limit(limit)
+    statement = statement.order_by(*order_by).offset(skip).limit(limit)
     subjects = session.exec(statement).all()
     
     return subjects
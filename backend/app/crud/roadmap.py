@@ -5,6 +5,9 @@ from typing import Any
 from sqlmodel import Session, select
 from sqlalchemy.orm import selectinload
 
+from app.crud.pagination import paginate_offset
+from app.crud.search import title_search
+
 from app.models import (
     Roadmap,
     RoadmapCreate,
@@ -89,17 +92,22 @@ def get_roadmap_with_milestones(
 
 def get_roadmaps(
     *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> list[RoadmapPublic]:
+) -> tuple[list[RoadmapPublic], int]:
     statement = (
         select(Roadmap)
         .where(Roadmap.user_id == user_id)
         .options(selectinload(Roadmap.milestones))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Roadmap.created_at.desc())
     )
-    roadmaps = list(session.exec(statement))
-    return [_roadmap_to_public(roadmap) for roadmap in roadmaps]
+    items, count = paginate_offset(
+        session,
+        statement,
+        id_column=Roadmap.id,
+        sort="-created_at",
+        sort_spec={"created_at": Roadmap.created_at},
+        skip=skip,
+        limit=limit,
+    )
+    return [_roadmap_to_public(roadmap) for roadmap in items], count
 
 
 def delete_roadmap(*, session: Session, roadmap_id: uuid.UUID) -> Roadmap | None:
@@ -144,15 +152,16 @@ def get_milestone(*, session: Session, milestone_id: uuid.UUID) -> RoadmapMilest
 
 def get_milestones_by_roadmap(
     *, session: Session, roadmap_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> list[RoadmapMilestone]:
-    statement = (
-        select(RoadmapMilestone)
-        .where(RoadmapMilestone.roadmap_id == roadmap_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(RoadmapMilestone.created_at)
+) -> tuple[list[RoadmapMilestone], int]:
+    return paginate_offset(
+        session,
+        select(RoadmapMilestone).where(RoadmapMilestone.roadmap_id == roadmap_id),
+        id_column=RoadmapMilestone.id,
+        sort="created_at",
+        sort_spec={"created_at": RoadmapMilestone.created_at},
+        skip=skip,
+        limit=limit,
     )
-    return list(session.exec(statement))
 
 
 def get_all_milestones_by_roadmap(
@@ -224,16 +233,15 @@ def search_milestones_for_user(
         .where(Roadmap.user_id == user_id)
     )
     
-    # Add search condition if provided
+    # Add search condition if provided, best matches first
+    order_by = [RoadmapMilestone.created_at.desc()]
     if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        statement = statement.where(
-            RoadmapMilestone.title.ilike(search_term) |
-            RoadmapMilestone.description.ilike(search_term)
-        )
-    
+        matches, rank = title_search(search.strip(), RoadmapMilestone.title, RoadmapMilestone.description)
+        statement = statement.where(matches)
+        order_by.insert(0, rank.desc())
+
     # Execute query with pagination
-    statement = statement.order_by(RoadmapMilestone.created_at.desc()).offset(skip).limit(limit)
+    statement = statement.order_by(*order_by).offset(skip).limit(limit)
     milestones = session.exec(statement).all()
     
     return milestones
@@ -0,0 +1,176 @@
+import re
+import uuid
+from typing import Any, Literal
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Float,
+    String,
+    cast,
+    false,
+    literal_column,
+    null,
+    union_all,
+)
+from sqlmodel import Session, func, select
+
+from app.crud.pagination import Page, paginate
+from app.models import EmailTransaction, GmailConnection, SearchHit, Transaction
+
+SearchKind = Literal["transaction", "email_transaction"]
+
+TRANSACTION_SEARCH_VECTOR = Transaction.__table__.c.search_vector
+EMAIL_SEARCH_VECTOR = EmailTransaction.__table__.c.search_vector
+
+WORD = re.compile(r"\w+")
+MIN_TRIGRAM_LENGTH = 3
+# Column order of the union; SearchHit fields by position
+HIT_FIELDS = ("kind", "id", "day", "merchant", "text", "amount", "currency", "rank")
+
+
+def unaccent(value: Any) -> ColumnElement[str]:
+    """immutable_unaccent(): the wrapper the search and trigram indexes are built on."""
+    return func.immutable_unaccent(value, type_=String)
+
+
+def contains_unaccented(column: Any, value: str) -> ColumnElement[bool]:
+    """Case- and accent-insensitive substring match served by the trigram indexes."""
+    escaped = value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return unaccent(column).ilike(unaccent(f"%{escaped}%"), escape="/")
+
+
+def simple_tsquery(text: str) -> ColumnElement[Any]:
+    """to_tsquery('simple', ...) over the unaccented text, like the search vectors."""
+    return func.to_tsquery(literal_column("'simple'::regconfig"), unaccent(text))
+
+
+def word_vector(column: Any) -> ColumnElement[Any]:
+    """to_tsvector('simple', immutable_unaccent(column)): the title word indexes."""
+    return func.to_tsvector(literal_column("'simple'::regconfig"), unaccent(column))
+
+
+def title_search(
+    value: str, title: Any, description: Any
+) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+    """Filter and relevance of a substring search over a title and description.
+
+    Both columns are matched through their trigram indexes. A value shorter
+    than MIN_TRIGRAM_LENGTH has no trigrams to narrow the scan with, so
+    its words are prefix-matched through the word indexes instead. Relevance
+    is the word similarity to the title plus half of that to the description.
+    """
+    needle = unaccent(value)
+    rank = func.word_similarity(needle, unaccent(title)) + 0.5 * func.coalesce(
+        func.word_similarity(needle, unaccent(description)), 0
+    )
+    if len(value) >= MIN_TRIGRAM_LENGTH:
+        matches = contains_unaccented(title, value) | contains_unaccented(description, value)
+    else:
+        tsquery_text = prefix_tsquery(value)
+        if tsquery_text is None:
+            matches = false()
+        else:
+            query = simple_tsquery(tsquery_text)
+            matches = (
+                word_vector(title).op("@@")(query) | word_vector(description).op("@@")(query)
+            )
+    return matches, cast(rank, Float)
+
+
+def prefix_tsquery(text: str) -> str | None:
+    """'grab foo' -> 'grab:* & foo:*', so partly typed words still match."""
+    words = WORD.findall(text.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def search_ledger(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    text: str,
+    kinds: set[SearchKind],
+    limit: int = 50,
+    cursor: str | None = None,
+) -> Page[SearchHit]:
+    """Transactions and email transactions matching text, best match first.
+
+    A row matches when every word prefix-matches its search vector (merchant
+    weighted above note/subject) or the whole text occurs inside its
+    merchant; both checks are accent-insensitive and answered by GIN indexes.
+    Rank is ts_rank plus the merchant's word similarity to the text, and the
+    pages are keyset-paginated on (rank, id).
+    """
+    tsquery_text = prefix_tsquery(text)
+    if tsquery_text is None:
+        raise ValueError("Search text has no words")
+    query = simple_tsquery(tsquery_text)
+    needle = text.strip()
+
+    def matches(vector: Any, merchant: Any) -> ColumnElement[bool]:
+        clause = vector.op("@@")(query)
+        # Trigrams cannot narrow down a shorter pattern; the prefix query covers it
+        if len(needle) >= MIN_TRIGRAM_LENGTH:
+            clause = clause | contains_unaccented(merchant, needle)
+        return clause
+
+    def ranked(vector: Any, merchant: Any) -> ColumnElement[float]:
+        similarity = func.word_similarity(unaccent(needle), unaccent(merchant))
+        return cast(func.ts_rank(vector, query) + func.coalesce(similarity, 0), Float)
+
+    parts = []
+    if "transaction" in kinds:
+        parts.append(
+            select(
+                literal_column("'transaction'").label("kind"),
+                Transaction.id,
+                Transaction.txn_date.label("day"),
+                Transaction.merchant,
+                Transaction.note.label("text"),
+                Transaction.amount,
+                Transaction.currency,
+                ranked(TRANSACTION_SEARCH_VECTOR, Transaction.merchant).label("rank"),
+            ).where(
+                Transaction.user_id == user_id,
+                matches(TRANSACTION_SEARCH_VECTOR, Transaction.merchant),
+            )
+        )
+    if "email_transaction" in kinds:
+        user_connections = select(GmailConnection.id).where(
+            GmailConnection.user_id == user_id
+        )
+        parts.append(
+            select(
+                literal_column("'email_transaction'").label("kind"),
+                EmailTransaction.id,
+                cast(EmailTransaction.received_at, Date).label("day"),
+                EmailTransaction.merchant,
+                EmailTransaction.subject.label("text"),
+                EmailTransaction.amount,
+                cast(null(), String).label("currency"),
+                ranked(EMAIL_SEARCH_VECTOR, EmailTransaction.merchant).label("rank"),
+            ).where(
+                EmailTransaction.gmail_connection_id.in_(user_connections),
+                matches(EMAIL_SEARCH_VECTOR, EmailTransaction.merchant),
+            )
+        )
+    hits = union_all(*parts).subquery("hits")
+    page = paginate(
+        session,
+        select(hits),
+        id_column=hits.c.id,
+        sort="-rank",
+        sort_spec={"rank": hits.c.rank},
+        limit=limit,
+        cursor=cursor,
+        count_mode="window",
+    )
+    return Page(
+        items=[
+            SearchHit(**dict(zip(HIT_FIELDS, row, strict=True))) for row in page.items
+        ],
+        count=page.count,
+        next_cursor=page.next_cursor,
+    )
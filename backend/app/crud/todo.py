@@ -2,8 +2,12 @@ import uuid
 from datetime import date, datetime, timezone
 from typing import Any
 
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import Session, select, func
 
+from app.crud.pagination import paginate_offset
+from app.crud.search import title_search
+
 from app.models import (
     ChecklistItem,
     ChecklistItemCreate,
@@ -12,6 +16,7 @@ from app.models import (
     ItemCreate,
     Todo,
     TodoCreate,
+    TodoPublic,
     TodoUpdate,
 )
 
@@ -43,19 +48,71 @@ def update_todo(*, session: Session, db_todo: Todo, todo_in: TodoUpdate) -> Any:
 
 
 def get_todo(*, session: Session, todo_id: uuid.UUID) -> Todo | None:
-    statement = select(Todo).where(Todo.id == todo_id)
+    """Todo with its subject and milestone joined in, so todo_to_public needs no query."""
+    statement = (
+        select(Todo)
+        .where(Todo.id == todo_id)
+        .options(joinedload(Todo.subject), joinedload(Todo.milestone))
+    )
     session_todo = session.exec(statement).first()
     return session_todo
 
 
+def todo_to_public(todo: Todo) -> TodoPublic:
+    """Public todo with its subject and milestone embedded.
+
+    Reads the loaded relations; load them with the todo (see get_todo and
+    get_todos) or each access costs a query.
+    """
+    todo_dict = todo.model_dump()
+    if todo.subject is not None:
+        todo_dict["subject"] = todo.subject.model_dump()
+    if todo.milestone is not None:
+        todo_dict["milestone"] = todo.milestone.model_dump()
+    return TodoPublic.model_validate(todo_dict)
+
+
+TODO_FILTERS = {
+    "owner_id": Todo.owner_id,
+}
+
+
 def get_todos(
-    *, session: Session, owner_id: uuid.UUID, skip: int = 0, limit: int = 100
+    *,
+    session: Session,
+    owner_id: uuid.UUID | None,
+    skip: int = 0,
+    limit: int = 100,
+    search: str | None = None,
 ) -> tuple[list[Todo], int]:
-    statement = select(Todo).where(Todo.owner_id == owner_id).offset(skip).limit(limit)
-    todos = list(session.exec(statement).all())
-    count_statement = select(func.count()).select_from(Todo).where(Todo.owner_id == owner_id)
-    count = session.exec(count_statement).one()
-    return todos, count
+    """Page of todos, newest first; owner_id None lists every owner's todos.
+
+    A search matches title or description through their trigram indexes
+    and orders the page by relevance, then newest first. The page and its
+    total come from one statement, and subjects and milestones are loaded
+    with one IN query each for the whole page.
+    """
+    statement = select(Todo).options(
+        selectinload(Todo.subject), selectinload(Todo.milestone)
+    )
+    sort, sort_spec = "-created_at", {"created_at": Todo.created_at}
+    if search and search.strip():
+        matches, rank = title_search(search.strip(), Todo.title, Todo.description)
+        # paginate() appends its (rank, id) ordering after this one, so
+        # equally relevant todos come newest first rather than by random id
+        statement = statement.where(matches).order_by(rank.desc(), Todo.created_at.desc())
+        sort, sort_spec = "-rank", {"rank": rank}
+    return paginate_offset(
+        session,
+        statement,
+        id_column=Todo.id,
+        sort=sort,
+        sort_spec=sort_spec,
+        filters={"owner_id": owner_id},
+        filter_spec=TODO_FILTERS,
+        skip=skip,
+        limit=limit,
+    )
 
 
 def delete_todo(*, session: Session, todo_id: uuid.UUID) -> Todo | None:
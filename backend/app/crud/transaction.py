@@ -1,31 +1,199 @@
 import uuid
-from datetime import datetime, timezone
+from collections.abc import Iterator
+from datetime import date, datetime, timezone
 from typing import Any
 
+from sqlalchemy import insert, literal, union_all
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session, select
 
-from app.models import Transaction, TransactionCreate, TransactionUpdate
+from app.crud.ledger import add_to_ledger, apply_ledger_deltas, ledger_key, month_start
+from app.crud.merchant_category import record_category_usage
+from app.crud.merchant_key import merchant_key
+from app.crud.pagination import Page, paginate
+from app.crud.report_version import bump_report_versions
+from app.crud.search import contains_unaccented
+from app.models import (
+    Account,
+    Category,
+    Transaction,
+    TransactionBatchItemResult,
+    TransactionBatchOp,
+    TransactionBatchOperation,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionPublic,
+    TransactionUpdate,
+)
+
+TRANSACTION_EXPORT_COLUMNS = [
+    "id",
+    "txn_date",
+    "type",
+    "amount",
+    "currency",
+    "merchant",
+    "note",
+    "account_id",
+    "account_name",
+    "category_id",
+    "category_name",
+    "created_at",
+    "updated_at",
+]
 
 
 def create_transaction(
     *, session: Session, transaction_in: TransactionCreate, user_id: uuid.UUID
 ) -> Transaction:
     db_transaction = Transaction.model_validate(
-        transaction_in, update={"user_id": user_id}
+        transaction_in,
+        update={
+            "user_id": user_id,
+            "merchant_key": merchant_key(transaction_in.merchant, transaction_in.note),
+        },
     )
     session.add(db_transaction)
+    add_to_ledger(session=session, transactions=[db_transaction])
+    bump_report_versions(
+        session=session, user_id=user_id, months=[db_transaction.txn_date]
+    )
+    record_category_usage(
+        session=session,
+        user_id=user_id,
+        usages=[(db_transaction.merchant, db_transaction.note, db_transaction.category_id)],
+    )
     session.commit()
     session.refresh(db_transaction)
     return db_transaction
 
 
+def bulk_create_transactions(
+    *,
+    session: Session,
+    transactions_in: list[TransactionCreate],
+    user_id: uuid.UUID,
+) -> list[Transaction]:
+    """Insert several transactions in one flush without committing.
+
+    The caller owns the database transaction and commits once, so related
+    rows written alongside stay atomic with the inserts.
+    """
+    db_transactions = [
+        Transaction.model_validate(
+            transaction_in,
+            update={
+                "user_id": user_id,
+                "merchant_key": merchant_key(transaction_in.merchant, transaction_in.note),
+            },
+        )
+        for transaction_in in transactions_in
+    ]
+    session.add_all(db_transactions)
+    session.flush()
+    add_to_ledger(session=session, transactions=db_transactions)
+    bump_report_versions(
+        session=session, user_id=user_id, months=[t.txn_date for t in db_transactions]
+    )
+    record_category_usage(
+        session=session,
+        user_id=user_id,
+        usages=[(t.merchant, t.note, t.category_id) for t in db_transactions],
+    )
+    return db_transactions
+
+
+def insert_transaction_rows(
+    *, session: Session, user_id: uuid.UUID, rows: list[dict[str, Any]]
+) -> None:
+    """Insert validated transaction rows with one executemany INSERT, no commit.
+
+    Skips building ORM objects, which dominates the cost of large imports;
+    aggregates, report versions and the category index are updated from
+    the same dicts.
+    """
+    if not rows:
+        return
+    now = datetime.now(timezone.utc)
+    params = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "category_id": None,
+            "currency": "VND",
+            "merchant": None,
+            "note": None,
+            "created_at": now,
+            "updated_at": now,
+            **row,
+        }
+        for row in rows
+    ]
+    for p in params:
+        p["merchant_key"] = merchant_key(p["merchant"], p["note"])
+    session.exec(insert(Transaction), params=params)
+    apply_ledger_deltas(
+        session=session,
+        deltas=[
+            (
+                (
+                    user_id,
+                    month_start(p["txn_date"]),
+                    p["type"],
+                    p["category_id"],
+                    p["account_id"],
+                    p["currency"],
+                ),
+                p["amount"],
+                1,
+            )
+            for p in params
+        ],
+    )
+    bump_report_versions(
+        session=session, user_id=user_id, months=[p["txn_date"] for p in params]
+    )
+    record_category_usage(
+        session=session,
+        user_id=user_id,
+        usages=[(p["merchant"], p["note"], p["category_id"]) for p in params],
+    )
+
+
 def update_transaction(
     *, session: Session, db_transaction: Transaction, transaction_in: TransactionUpdate
 ) -> Any:
     transaction_data = transaction_in.model_dump(exclude_unset=True)
     extra_data = {"updated_at": datetime.now(timezone.utc)}
+    old_key, old_amount = ledger_key(db_transaction), db_transaction.amount
+    old_date = db_transaction.txn_date
+    if transaction_data.keys() & {"merchant", "note"}:
+        extra_data["merchant_key"] = merchant_key(
+            transaction_data.get("merchant", db_transaction.merchant),
+            transaction_data.get("note", db_transaction.note),
+        )
     db_transaction.sqlmodel_update(transaction_data, update=extra_data)
     session.add(db_transaction)
+    # Moves between months, categories or accounts leave the old aggregate
+    apply_ledger_deltas(
+        session=session,
+        deltas=[
+            (old_key, -old_amount, -1),
+            (ledger_key(db_transaction), db_transaction.amount, 1),
+        ],
+    )
+    bump_report_versions(
+        session=session,
+        user_id=db_transaction.user_id,
+        months=[old_date, db_transaction.txn_date],
+    )
+    if transaction_data.keys() & {"category_id", "merchant", "note"}:
+        # Count the new filing; the periodic rebuild drops the superseded one
+        record_category_usage(
+            session=session,
+            user_id=db_transaction.user_id,
+            usages=[(db_transaction.merchant, db_transaction.note, db_transaction.category_id)],
+        )
     session.commit()
     session.refresh(db_transaction)
     return db_transaction
@@ -38,25 +206,64 @@ def get_transaction(
     return session.exec(statement).first()
 
 
+TRANSACTION_SORTS = {
+    "txn_date": Transaction.txn_date,
+    "created_at": Transaction.created_at,
+    "amount": Transaction.amount,
+}
+TRANSACTION_FILTERS = {
+    "start_date": lambda value: Transaction.txn_date >= value,
+    "end_date": lambda value: Transaction.txn_date <= value,
+    "account_id": Transaction.account_id,
+    "category_id": Transaction.category_id,
+    "type": Transaction.type,
+    "min_amount": lambda value: Transaction.amount >= value,
+    "max_amount": lambda value: Transaction.amount <= value,
+    "currency": Transaction.currency,
+    # Accent-insensitive; served by the trigram indexes on merchant and note
+    "q": lambda value: contains_unaccented(Transaction.merchant, value)
+    | contains_unaccented(Transaction.note, value),
+}
+
+
 def get_transactions(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> tuple[list[Transaction], int]:
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    sort: str = "-txn_date",
+    filters: dict[str, Any] | None = None,
+    cursor: str | None = None,
+) -> Page[TransactionPublic]:
+    """Page of a user's transactions with category names joined in.
+
+    filters keys are those of TRANSACTION_FILTERS; dates and amounts are
+    inclusive bounds. Ties in the sort are broken by id.
+    """
     statement = (
-        select(Transaction)
+        select(Transaction, Category.name)
+        .outerjoin(Category, Transaction.category_id == Category.id)
         .where(Transaction.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
     )
-    transactions = list(session.exec(statement).all())
-    
-    # Eager load category for each transaction
-    for transaction in transactions:
-        if transaction.category_id:
-            session.refresh(transaction, ['category'])
-    
-    count_statement = select(Transaction).where(Transaction.user_id == user_id)
-    count = len(session.exec(count_statement).all())
-    return transactions, count
+    page = paginate(
+        session,
+        statement,
+        id_column=Transaction.id,
+        sort=sort,
+        sort_spec=TRANSACTION_SORTS,
+        filters=filters,
+        filter_spec=TRANSACTION_FILTERS,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        count_mode="window",
+    )
+    page.items = [
+        TransactionPublic.model_validate(transaction, update={"category_name": name})
+        for transaction, name in page.items
+    ]
+    return page
 
 
 def delete_transaction(
@@ -65,6 +272,252 @@ def delete_transaction(
     statement = select(Transaction).where(Transaction.id == transaction_id)
     transaction = session.exec(statement).first()
     if transaction:
+        add_to_ledger(session=session, transactions=[transaction], sign=-1)
+        bump_report_versions(
+            session=session, user_id=transaction.user_id, months=[transaction.txn_date]
+        )
         session.delete(transaction)
         session.commit()
     return transaction
+
+
+def iter_transactions_for_export(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    account_id: uuid.UUID | None = None,
+    category_id: uuid.UUID | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[tuple[Any, ...]]:
+    """Yield export rows (TRANSACTION_EXPORT_COLUMNS order) from a server-side cursor.
+
+    Rows are fetched ``chunk_size`` at a time, so memory stays flat regardless
+    of how many transactions the user has.
+    """
+    statement = (
+        select(
+            Transaction.id,
+            Transaction.txn_date,
+            Transaction.type,
+            Transaction.amount,
+            Transaction.currency,
+            Transaction.merchant,
+            Transaction.note,
+            Transaction.account_id,
+            Account.name,
+            Transaction.category_id,
+            Category.name,
+            Transaction.created_at,
+            Transaction.updated_at,
+        )
+        .join(Account, Transaction.account_id == Account.id)
+        .join(Category, Transaction.category_id == Category.id, isouter=True)
+        .where(Transaction.user_id == user_id)
+    )
+    if start_date is not None:
+        statement = statement.where(Transaction.txn_date >= start_date)
+    if end_date is not None:
+        statement = statement.where(Transaction.txn_date <= end_date)
+    if account_id is not None:
+        statement = statement.where(Transaction.account_id == account_id)
+    if category_id is not None:
+        statement = statement.where(Transaction.category_id == category_id)
+    statement = statement.order_by(Transaction.txn_date, Transaction.id)
+
+    result = session.exec(statement.execution_options(yield_per=chunk_size))
+    for row in result:
+        yield tuple(row)
+
+
+def _owned_references(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    account_ids: set[uuid.UUID],
+    category_ids: set[uuid.UUID],
+) -> tuple[set[uuid.UUID], set[uuid.UUID]]:
+    """Which of the given account and category ids belong to the user, in one query."""
+    parts = []
+    if account_ids:
+        parts.append(
+            select(literal("account").label("kind"), Account.id).where(
+                Account.id.in_(account_ids), Account.user_id == user_id
+            )
+        )
+    if category_ids:
+        parts.append(
+            select(literal("category").label("kind"), Category.id).where(
+                Category.id.in_(category_ids), Category.user_id == user_id
+            )
+        )
+    owned: dict[str, set[uuid.UUID]] = {"account": set(), "category": set()}
+    if parts:
+        statement = parts[0] if len(parts) == 1 else union_all(*parts)
+        for kind, owned_id in session.execute(statement):
+            owned[kind].add(owned_id)
+    return owned["account"], owned["category"]
+
+
+def apply_transaction_batch(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    operations: list[TransactionBatchOperation],
+    atomic: bool = True,
+) -> TransactionBatchResult:
+    """Apply create/update/delete operations in order, in one database transaction.
+
+    Referenced accounts and categories are checked with one UNION ALL query
+    and the transactions to update or delete are loaded with one IN query,
+    all scoped to the user. Ledger aggregates, report versions and category
+    usage are updated once for the whole batch, then everything commits
+    together.
+
+    atomic=True stops at the first failing operation and rolls everything
+    back. Otherwise each operation runs in its own SAVEPOINT so a failing
+    one is reported and skipped while the others commit. Operations may
+    refer to transactions created earlier in the batch through the
+    client-supplied id of the create.
+    """
+    target_ids = {
+        operation.id
+        for operation in operations
+        if operation.op != TransactionBatchOp.create
+    }
+    payloads = [
+        operation.create or operation.update
+        for operation in operations
+        if operation.op != TransactionBatchOp.delete
+    ]
+    owned_accounts, owned_categories = _owned_references(
+        session=session,
+        user_id=user_id,
+        account_ids={p.account_id for p in payloads if p.account_id},
+        category_ids={p.category_id for p in payloads if p.category_id},
+    )
+    transactions: dict[uuid.UUID, Transaction] = {}
+    if target_ids:
+        transactions = {
+            t.id: t
+            for t in session.exec(
+                select(Transaction).where(
+                    Transaction.id.in_(target_ids), Transaction.user_id == user_id
+                )
+            )
+        }
+
+    deltas: list[tuple[Any, float, int]] = []
+    months: list[date] = []
+    usages: list[tuple[str | None, str | None, uuid.UUID | None]] = []
+
+    def check_references(payload: TransactionCreate | TransactionUpdate) -> None:
+        if payload.account_id is not None and payload.account_id not in owned_accounts:
+            raise ValueError("Account not found")
+        if payload.category_id is not None and payload.category_id not in owned_categories:
+            raise ValueError("Category not found")
+
+    def apply(operation: TransactionBatchOperation) -> Transaction | None:
+        if operation.op == TransactionBatchOp.create:
+            check_references(operation.create)
+            if operation.id is not None and operation.id in transactions:
+                raise ValueError("Transaction id already used in this batch")
+            update: dict[str, Any] = {
+                "user_id": user_id,
+                "merchant_key": merchant_key(
+                    operation.create.merchant, operation.create.note
+                ),
+            }
+            if operation.id is not None:
+                update["id"] = operation.id
+            db_transaction = Transaction.model_validate(operation.create, update=update)
+            session.add(db_transaction)
+            session.flush()
+            transactions[db_transaction.id] = db_transaction
+            deltas.append((ledger_key(db_transaction), db_transaction.amount, 1))
+            months.append(db_transaction.txn_date)
+            usages.append(
+                (db_transaction.merchant, db_transaction.note, db_transaction.category_id)
+            )
+            return db_transaction
+
+        db_transaction = transactions.get(operation.id)
+        if db_transaction is None:
+            raise ValueError("Transaction not found")
+        old_key, old_amount = ledger_key(db_transaction), db_transaction.amount
+        old_date = db_transaction.txn_date
+        if operation.op == TransactionBatchOp.delete:
+            session.delete(db_transaction)
+            session.flush()
+            del transactions[operation.id]
+            deltas.append((old_key, -old_amount, -1))
+            months.append(old_date)
+            return None
+
+        check_references(operation.update)
+        transaction_data = operation.update.model_dump(exclude_unset=True)
+        if "account_id" in transaction_data and transaction_data["account_id"] is None:
+            raise ValueError("account_id cannot be null")
+        extra_data: dict[str, Any] = {"updated_at": datetime.now(timezone.utc)}
+        if transaction_data.keys() & {"merchant", "note"}:
+            extra_data["merchant_key"] = merchant_key(
+                transaction_data.get("merchant", db_transaction.merchant),
+                transaction_data.get("note", db_transaction.note),
+            )
+        db_transaction.sqlmodel_update(transaction_data, update=extra_data)
+        session.flush()
+        deltas.extend(
+            [(old_key, -old_amount, -1), (ledger_key(db_transaction), db_transaction.amount, 1)]
+        )
+        months.extend([old_date, db_transaction.txn_date])
+        if transaction_data.keys() & {"category_id", "merchant", "note"}:
+            usages.append(
+                (db_transaction.merchant, db_transaction.note, db_transaction.category_id)
+            )
+        return db_transaction
+
+    result = TransactionBatchResult()
+    for index, operation in enumerate(operations):
+        item = TransactionBatchItemResult(
+            index=index, op=operation.op, transaction_id=operation.id
+        )
+        result.results.append(item)
+        try:
+            if atomic:
+                db_transaction = apply(operation)
+            else:
+                with session.begin_nested():
+                    db_transaction = apply(operation)
+        except ValueError as e:
+            item.error = str(e)
+        except SQLAlchemyError:
+            item.error = "The operation could not be saved"
+        else:
+            item.ok = True
+            if db_transaction is not None:
+                item.transaction_id = db_transaction.id
+                # Serialized now: commit expires the instances
+                item.transaction = TransactionPublic.model_validate(db_transaction)
+            result.succeeded += 1
+            continue
+        result.failed += 1
+        if atomic:
+            break
+
+    if atomic and result.failed:
+        session.rollback()
+        for item in result.results:
+            item.ok = False
+            item.transaction = None
+        for item in result.results[:-1]:
+            item.error = "Rolled back"
+        result.succeeded = 0
+        return result
+
+    apply_ledger_deltas(session=session, deltas=deltas)
+    bump_report_versions(session=session, user_id=user_id, months=months)
+    record_category_usage(session=session, user_id=user_id, usages=usages)
+    session.commit()
+    result.committed = True
+    return result
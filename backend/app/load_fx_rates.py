@@ -0,0 +1,31 @@
+import argparse
+import logging
+import sys
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.services.fx_service import load_fx_rates
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load daily FX rates from a CSV with date, currency and rate columns."
+    )
+    parser.add_argument("path", help="CSV file; - reads standard input")
+    args = parser.parse_args()
+
+    lines = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+    with lines, Session(engine) as session:
+        result = load_fx_rates(session=session, lines=lines)
+    for error in result.errors:
+        logger.warning(f"Row {error.row}: {error.error}")
+    logger.info(f"Loaded {result.loaded} rates, {result.failed} rows failed")
+    sys.exit(1 if result.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,9 @@ from datetime import date, datetime, timezone
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from sqlalchemy import Column, Computed, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.utils import convert_empty_string_to_none
@@ -163,6 +165,16 @@ class CategoryGroup(str, Enum):
     income = "income"
 
 
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class StatementFormat(str, Enum):
+    csv = "csv"
+    ofx = "ofx"
+
+
 class TodoStatus(str, Enum):
     backlog = "backlog"
     todo = "todo"
@@ -368,7 +380,7 @@ class AccountUpdate(BaseModel):
 
 class Account(AccountBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
+    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, index=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -390,6 +402,49 @@ class AccountsPublic(SQLModel):
     count: int
 
 
+# ========= ACCOUNT BALANCES =========
+class AccountBalance(SQLModel, table=True):
+    """Current balance of an account (income minus expenses), maintained on every write."""
+
+    account_id: uuid.UUID = Field(
+        foreign_key="account.id", primary_key=True, ondelete="CASCADE"
+    )
+    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    balance: float = 0.0
+    txn_count: int = 0
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AccountBalancePublic(SQLModel):
+    account_id: uuid.UUID
+    name: str
+    type: AccountType
+    currency: str
+    is_active: bool
+    balance: float = 0.0
+    txn_count: int = 0
+
+
+class AccountBalancesPublic(SQLModel):
+    data: list[AccountBalancePublic]
+    count: int
+
+
+class BalanceHistoryEntry(SQLModel):
+    transaction_id: uuid.UUID
+    txn_date: date
+    type: TxnType
+    amount: float
+    merchant: str | None = None
+    running_balance: float
+
+
+class BalanceHistoryPublic(SQLModel):
+    data: list[BalanceHistoryEntry]
+    opening_balance: float = 0.0
+    next_cursor: str | None = None
+
+
 # ========= CATEGORY =========
 class CategoryBase(SQLModel):
     name: str = Field(max_length=255)
@@ -468,10 +523,47 @@ class TransactionUpdate(BaseModel):
 
 
 class Transaction(TransactionBase, table=True):
+    # Every list filter starts with user_id; id keeps the sort deterministic
+    # and lets keyset cursors resume inside the index
+    __table_args__ = (
+        Index("ix_transaction_user_id_txn_date", "user_id", "txn_date", "id"),
+        Index(
+            "ix_transaction_user_id_account_id_txn_date",
+            "user_id",
+            "account_id",
+            "txn_date",
+            "id",
+        ),
+        Index(
+            "ix_transaction_user_id_category_id_txn_date",
+            "user_id",
+            "category_id",
+            "txn_date",
+            "id",
+        ),
+        Index("ix_transaction_user_id_amount", "user_id", "amount", "id"),
+        Index("ix_transaction_user_id_merchant_key", "user_id", "merchant_key"),
+        # Maintained by Postgres and never loaded into the model; see crud.search.
+        # Trigram indexes on immutable_unaccent(merchant/note) are in the migration.
+        Column(
+            "search_vector",
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', immutable_unaccent(coalesce(merchant, ''))), 'A')"
+                " || setweight(to_tsvector('simple', immutable_unaccent(coalesce(note, ''))), 'B')",
+                persisted=True,
+            ),
+        ),
+        Index("ix_transaction_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     account_id: uuid.UUID = Field(foreign_key="account.id", nullable=False)
     category_id: uuid.UUID | None = Field(foreign_key="category.id")
+    # Canonical merchant from crud.merchant_key, set on every write
+    merchant_key: str | None = Field(default=None, max_length=255)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -486,13 +578,81 @@ class TransactionPublic(TransactionBase):
     account_id: uuid.UUID
     category_id: uuid.UUID | None
     category_name: str | None = None
+    merchant_key: str | None = None
     created_at: datetime
     updated_at: datetime
 
 
 class TransactionsPublic(SQLModel):
     data: list[TransactionPublic]
-    count: int
+    count: int | None  # None on cursor pages
+    next_cursor: str | None = None
+
+
+# ========= TRANSACTION BATCH =========
+class TransactionBatchOp(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
+
+class TransactionBatchMode(str, Enum):
+    atomic = "atomic"  # any failure rolls back the whole batch
+    partial = "partial"  # failed operations are skipped, the rest commit
+
+
+class TransactionBatchOperation(SQLModel):
+    op: TransactionBatchOp
+    # Target of update/delete; optional client-generated id for create, so
+    # later operations in the same batch can refer to the new transaction
+    id: uuid.UUID | None = None
+    create: TransactionCreate | None = None
+    update: TransactionUpdate | None = None
+
+    @model_validator(mode='after')
+    def validate_payload(self):
+        if self.op == TransactionBatchOp.create and self.create is None:
+            raise ValueError("'create' is required for create operations")
+        if self.op != TransactionBatchOp.create and self.id is None:
+            raise ValueError("'id' is required for update and delete operations")
+        if self.op == TransactionBatchOp.update and self.update is None:
+            raise ValueError("'update' is required for update operations")
+        return self
+
+
+class TransactionBatchRequest(SQLModel):
+    mode: TransactionBatchMode = TransactionBatchMode.atomic
+    operations: list[TransactionBatchOperation] = Field(min_length=1, max_length=1000)
+
+
+class TransactionBatchItemResult(SQLModel):
+    index: int
+    op: TransactionBatchOp
+    ok: bool = False
+    transaction_id: uuid.UUID | None = None
+    transaction: TransactionPublic | None = None
+    error: str | None = None
+
+
+class TransactionBatchResult(SQLModel):
+    committed: bool = False
+    succeeded: int = 0
+    failed: int = 0
+    results: list[TransactionBatchItemResult] = []
+
+
+# ========= TRANSACTION IMPORT =========
+class TransactionImportError(SQLModel):
+    row: int
+    error: str
+
+
+class TransactionImportResult(SQLModel):
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    dry_run: bool = False
+    errors: list[TransactionImportError] = []
 
 
 # ========= ALLOCATION RULE =========
@@ -531,13 +691,190 @@ class AllocationRulesPublic(SQLModel):
     count: int
 
 
+# ========= BUDGET =========
+class BudgetGroupSeries(SQLModel):
+    """One category group's envelope over BudgetReport.months, one value per month."""
+
+    grp: CategoryGroup
+    percent: float
+    allocated: list[float]
+    spent: list[float]
+    remaining: list[float]
+    # Running sum of remaining: what the envelope holds after each month
+    carryover: list[float]
+    total_allocated: float
+    total_spent: float
+
+
+class BudgetReport(SQLModel):
+    months: list[date]
+    income: list[float]
+    # Expenses without a category, or filed under an income category
+    unassigned_spent: list[float]
+    groups: list[BudgetGroupSeries]
+    # Amounts left out for want of FX rates, per currency in that currency
+    unconverted: dict[str, float] = {}
+
+
+class BudgetGroupTotal(SQLModel, table=True):
+    """Running monthly total per category group, maintained on every write.
+
+    Budget groups hold net spending (expenses minus refunds); the income
+    group holds the income that funds the allocations.
+    """
+
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    month: date = Field(primary_key=True)  # first day of the month
+    grp: CategoryGroup = Field(primary_key=True)
+    amount: float = 0.0
+
+
+class BudgetAlert(SQLModel, table=True):
+    """A group's spending reached a threshold percent of its allocation in a month."""
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "month", "grp", "threshold", name="uq_budgetalert_key"
+        ),
+        Index("ix_budgetalert_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    month: date
+    grp: CategoryGroup
+    threshold: int
+    allocated: float
+    spent: float
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    acknowledged_at: datetime | None = None
+
+
+class BudgetAlertPublic(SQLModel):
+    id: uuid.UUID
+    month: date
+    grp: CategoryGroup
+    threshold: int
+    allocated: float
+    spent: float
+    created_at: datetime
+    acknowledged_at: datetime | None
+
+
+class BudgetAlertsPublic(SQLModel):
+    data: list[BudgetAlertPublic]
+    count: int
+
+
+# ========= LEDGER AGGREGATES =========
+class LedgerAggregate(SQLModel, table=True):
+    """Per-user monthly sum and count of transactions, maintained on every write."""
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "month",
+            "type",
+            "category_id",
+            "account_id",
+            "currency",
+            name="uq_ledgeraggregate_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    month: date  # first day of the month
+    type: TxnType
+    category_id: uuid.UUID | None = Field(
+        default=None, foreign_key="category.id", ondelete="CASCADE"
+    )
+    account_id: uuid.UUID = Field(
+        foreign_key="account.id", nullable=False, ondelete="CASCADE"
+    )
+    # Totals stay in the transactions' own currency; reports convert them
+    currency: str = Field(default="VND", max_length=10)
+    total_amount: float = 0.0
+    txn_count: int = 0
+
+
+class LedgerAggregateMismatch(SQLModel):
+    user_id: uuid.UUID
+    month: date
+    type: TxnType
+    category_id: uuid.UUID | None
+    account_id: uuid.UUID
+    currency: str
+    expected_amount: float
+    actual_amount: float
+    expected_count: int
+    actual_count: int
+
+
+# ========= FX RATES =========
+class FxRate(SQLModel, table=True):
+    """Daily rate of a currency: one unit is worth rate units of BASE_CURRENCY."""
+
+    currency: str = Field(max_length=10, primary_key=True)
+    rate_date: date = Field(primary_key=True)
+    rate: float = Field(gt=0)
+
+
+class FxRatePublic(SQLModel):
+    currency: str
+    rate_date: date
+    rate: float
+
+
+class FxRatesPublic(SQLModel):
+    data: list[FxRatePublic]
+    count: int | None  # None on cursor pages
+    next_cursor: str | None = None
+
+
+class FxRateImportError(SQLModel):
+    row: int
+    error: str
+
+
+class FxRateImportResult(SQLModel):
+    loaded: int = 0
+    failed: int = 0
+    errors: list[FxRateImportError] = []
+
+
 # ========= FINANCIAL REPORTS =========
+class ReportVersion(SQLModel, table=True):
+    """Bumped whenever data behind a user's monthly reports changes."""
+
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    month: date = Field(primary_key=True)  # first day of the month
+    version: int = 0
+
+
+class ReportCacheStats(SQLModel):
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
 class MonthlyFinancialReport(SQLModel):
     year: int
     month: int
     total_expenses: float = 0.0
     net_amount: float = 0.0
     expense_count: int = 0
+    # Amounts left out of the totals for want of FX rates, per currency
+    unconverted: dict[str, float] = {}
     transactions: list[TransactionPublic] = []
     allocation_rules: list[AllocationRulePublic] = []
 
@@ -550,6 +887,8 @@ class MonthlyFinancialSummary(SQLModel):
     expense_count: int = 0
     category_breakdown: dict[str, float] = {}
     account_breakdown: dict[str, float] = {}
+    # Amounts left out of the totals for want of FX rates, per currency
+    unconverted: dict[str, float] = {}
 
 
 class MonthlyFinancialReports(SQLModel):
@@ -557,6 +896,27 @@ class MonthlyFinancialReports(SQLModel):
     count: int
 
 
+class CategoryGrowthSeries(SQLModel):
+    """One category's monthly series; lists line up with CategoryGrowthReport.months.
+
+    Growth values are fractions (0.25 is +25%) and None where the
+    comparison month had nothing.
+    """
+
+    category_id: uuid.UUID | None
+    category_name: str | None
+    totals: list[float]
+    mom_growth: list[float | None]
+    rolling_average: list[float]  # this and the two previous months
+    yoy_growth: list[float | None]
+
+
+class CategoryGrowthReport(SQLModel):
+    type: TxnType
+    months: list[date]
+    series: list[CategoryGrowthSeries]  # largest total over the range first
+
+
 # ========= GMAIL INTEGRATION =========
 class GmailConnectionBase(SQLModel):
     gmail_email: EmailStr = Field(max_length=255)
@@ -623,6 +983,7 @@ class EmailTransactionBase(SQLModel):
 
 class EmailTransactionCreate(EmailTransactionBase):
     gmail_connection_id: uuid.UUID
+    category_id: uuid.UUID | None = None  # pre-filled from the merchant category index
 
 
 class EmailTransactionUpdate(BaseModel):
@@ -636,10 +997,31 @@ class EmailTransactionUpdate(BaseModel):
 
 
 class EmailTransaction(EmailTransactionBase, table=True):
+    # Same search setup as Transaction, over merchant and subject
+    __table_args__ = (
+        Column(
+            "search_vector",
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', immutable_unaccent(coalesce(merchant, ''))), 'A')"
+                " || setweight(to_tsvector('simple', immutable_unaccent(coalesce(subject, ''))), 'B')",
+                persisted=True,
+            ),
+        ),
+        Index("ix_emailtransaction_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_emailtransaction_gmail_connection_id_merchant_key",
+            "gmail_connection_id",
+            "merchant_key",
+        ),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     gmail_connection_id: uuid.UUID = Field(foreign_key="gmailconnection.id", nullable=False)
     linked_transaction_id: uuid.UUID | None = Field(default=None, foreign_key="transaction.id", ondelete="SET NULL")
     category_id: uuid.UUID | None = Field(default=None, foreign_key="category.id")
+    merchant_key: str | None = Field(default=None, max_length=255)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -653,6 +1035,7 @@ class EmailTransactionPublic(EmailTransactionBase):
     gmail_connection_id: uuid.UUID
     linked_transaction_id: uuid.UUID | None
     category_id: uuid.UUID | None
+    merchant_key: str | None = None
     category_name: str | None = None
     created_at: datetime
     updated_at: datetime
@@ -681,6 +1064,121 @@ class EmailTxnDashboard(SQLModel):
     monthly: list[EmailTxnMonthlyAmount] = []
 
 
+# ========= EMAIL TRANSACTION BULK UPDATE =========
+class EmailTransactionBulkFilter(SQLModel):
+    gmail_connection_id: uuid.UUID | None = None
+    merchant: str | None = Field(default=None, max_length=255)  # case-insensitive contains
+    sender: str | None = Field(default=None, max_length=255)  # case-insensitive contains
+    status: EmailTransactionStatus | None = None
+    received_from: date | None = None  # inclusive
+    received_to: date | None = None  # inclusive
+
+
+class EmailTransactionBulkUpdate(SQLModel):
+    ids: list[uuid.UUID] | None = Field(default=None, min_length=1, max_length=10000)
+    filter: EmailTransactionBulkFilter | None = None
+    update: EmailTransactionUpdate
+
+    @model_validator(mode='after')
+    def validate_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        if self.filter is not None and not any(
+            value != "" for value in self.filter.model_dump(exclude_none=True).values()
+        ):
+            raise ValueError("'filter' needs at least one criterion")
+        # A transaction is linked to at most one email, so never fan a link out
+        if self.update.linked_transaction_id is not None and (
+            self.ids is None or len(set(self.ids)) != 1
+        ):
+            raise ValueError("'linked_transaction_id' can only be set on a single id")
+        return self
+
+
+class EmailTransactionBulkUpdateResult(SQLModel):
+    ids: list[uuid.UUID]
+    count: int
+
+
+# ========= RECONCILIATION =========
+class ReconciliationMatch(SQLModel):
+    email_transaction_id: uuid.UUID
+    transaction_id: uuid.UUID
+
+
+class ReconciliationProposal(ReconciliationMatch):
+    amount: float
+    received_at: datetime
+    txn_date: date
+    day_diff: int
+    account_id: uuid.UUID
+    email_merchant: str | None = None
+    transaction_merchant: str | None = None
+
+
+class ReconciliationProposals(SQLModel):
+    data: list[ReconciliationProposal]
+    count: int
+
+
+class ReconciliationConfirmRequest(SQLModel):
+    matches: list[ReconciliationMatch] = Field(min_length=1, max_length=5000)
+
+
+class ReconciliationConfirmResult(SQLModel):
+    linked: list[ReconciliationMatch]
+    count: int
+    skipped: int
+
+
+# ========= EMAIL TRANSACTION BULK CONVERSION =========
+class EmailTransactionConversion(SQLModel):
+    email_transaction_id: uuid.UUID
+    account_id: uuid.UUID
+    category_id: uuid.UUID | None = None
+    type: TxnType
+    note: str | None = Field(default=None, max_length=500)
+
+    @field_validator('category_id', mode='before')
+    @classmethod
+    def validate_category_id(cls, v):
+        return convert_empty_string_to_none(v)
+
+
+class EmailTransactionConversionRequest(SQLModel):
+    items: list[EmailTransactionConversion] = Field(min_length=1, max_length=1000)
+
+
+class EmailTransactionConversionResult(SQLModel):
+    email_transaction_id: uuid.UUID
+    transaction_id: uuid.UUID | None = None
+    error: str | None = None
+
+
+class EmailTransactionConversionResults(SQLModel):
+    data: list[EmailTransactionConversionResult]
+    created_count: int
+    count: int
+
+
+# ========= SEARCH =========
+class SearchHit(SQLModel):
+    kind: str  # "transaction" or "email_transaction"
+    id: uuid.UUID
+    day: date  # txn_date, or the day the email was received
+    merchant: str | None
+    text: str | None  # note or email subject
+    amount: float | None
+    currency: str | None
+    rank: float
+
+
+class SearchResults(SQLModel):
+    data: list[SearchHit]
+    count: int | None
+    next_cursor: str | None = None
+
+
 # ========= ROADMAP =========
 class RoadmapStatus(str, Enum):
     planning = "planning"
@@ -946,3 +1444,155 @@ class FeedbackPublic(FeedbackBase):
 class FeedbacksPublic(SQLModel):
     data: list[FeedbackPublic]
     count: int
+
+
+# ========= ANALYTICS SNAPSHOT =========
+class SnapshotFormat(str, Enum):
+    parquet = "parquet"
+    arrow = "arrow"
+
+
+class AnalyticsSnapshotBase(SQLModel):
+    format: SnapshotFormat = Field(default=SnapshotFormat.parquet)
+    is_incremental: bool = Field(default=False)
+    # Rows with updated_at in (since, watermark] are included
+    since: datetime | None = None
+    watermark: datetime
+    transactions_count: int = 0
+    email_transactions_count: int = 0
+    categories_count: int = 0
+    accounts_count: int = 0
+
+
+class AnalyticsSnapshot(AnalyticsSnapshotBase, table=True):
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
+    )
+    path: str = Field(max_length=1000)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AnalyticsSnapshotPublic(AnalyticsSnapshotBase):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    created_at: datetime
+
+
+class AnalyticsSnapshotsPublic(SQLModel):
+    data: list[AnalyticsSnapshotPublic]
+    count: int
+
+
+# ========= ANALYTICS QUERIES =========
+class CategoryTrendSeries(SQLModel):
+    category_id: uuid.UUID | None  # None collects uncategorized transactions
+    category_name: str | None
+    totals: list[float]  # one per month of CategoryTrends.months
+    total: float
+
+
+class CategoryTrends(SQLModel):
+    type: TxnType
+    months: list[date]
+    series: list[CategoryTrendSeries]  # largest total first
+
+
+class RollingTotals(SQLModel):
+    type: TxnType
+    window_days: int
+    dates: list[date]
+    totals: list[float]  # per day
+    rolling_average: list[float]  # mean daily total of the window ending that day
+
+
+class MerchantTotal(SQLModel):
+    merchant: str
+    total: float
+    count: int
+
+
+class MerchantTotals(SQLModel):
+    data: list[MerchantTotal]
+    count: int
+
+
+# ========= MERCHANT CATEGORY INDEX =========
+class MerchantCategoryStat(SQLModel, table=True):
+    """How often a normalized merchant/description token was filed under a category."""
+
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    token: str = Field(max_length=255, primary_key=True)
+    category_id: uuid.UUID = Field(
+        foreign_key="category.id", primary_key=True, ondelete="CASCADE"
+    )
+    hits: int = Field(default=0, ge=0)
+
+
+class CategorizationStats(SQLModel):
+    tokens: int  # distinct tokens in the index
+    entries: int  # (token, category) pairs
+    lookups: int  # ingest lookups since process start
+    hits: int  # lookups that pre-filled a category
+    hit_rate: float
+    email_transactions: int
+    categorized_email_transactions: int
+
+
+# ========= RECURRING SERIES =========
+class RecurringSeriesBase(SQLModel):
+    merchant_key: str = Field(max_length=255)  # normalized merchant the series groups by
+    merchant: str | None = Field(default=None, max_length=255)  # latest spelling seen
+    type: TxnType
+    account_id: uuid.UUID | None = None
+    category_id: uuid.UUID | None = None
+    interval_days: float  # median gap between occurrences
+    amount: float  # median amount
+    occurrences: int
+    first_date: date
+    last_date: date
+    next_date: date
+    # 0..1, lower when gaps or amounts vary more
+    confidence: float
+    from_email: bool = False  # detected from unlinked email transactions
+
+
+class RecurringSeries(RecurringSeriesBase, table=True):
+    __table_args__ = (
+        UniqueConstraint("user_id", "merchant_key", "type", name="uq_recurringseries_key"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    account_id: uuid.UUID | None = Field(
+        default=None, foreign_key="account.id", ondelete="SET NULL"
+    )
+    category_id: uuid.UUID | None = Field(
+        default=None, foreign_key="category.id", ondelete="SET NULL"
+    )
+    detected_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class RecurringSeriesPublic(RecurringSeriesBase):
+    id: uuid.UUID
+    detected_at: datetime
+
+
+class RecurringSeriesListPublic(SQLModel):
+    data: list[RecurringSeriesPublic]
+    count: int
+
+
+class CashFlowProjectionMonth(SQLModel):
+    month: date
+    income: float = 0.0
+    expense: float = 0.0
+    net: float = 0.0
+
+
+class CashFlowProjection(SQLModel):
+    data: list[CashFlowProjectionMonth]
+    series_count: int
+    detected_at: datetime | None = None
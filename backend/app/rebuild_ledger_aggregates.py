@@ -0,0 +1,46 @@
+import argparse
+import logging
+import sys
+import uuid
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.crud.ledger import check_ledger_aggregates, rebuild_ledger_aggregates
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def check(user_id: uuid.UUID | None) -> int:
+    with Session(engine) as session:
+        mismatches = check_ledger_aggregates(session=session, user_id=user_id)
+    for mismatch in mismatches:
+        logger.warning(f"Ledger aggregate mismatch: {mismatch}")
+    logger.info(f"Found {len(mismatches)} mismatched ledger aggregates")
+    return len(mismatches)
+
+
+def rebuild(user_id: uuid.UUID | None) -> None:
+    with Session(engine) as session:
+        rows = rebuild_ledger_aggregates(session=session, user_id=user_id)
+    logger.info(f"Rebuilt {rows} ledger aggregate rows")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check or rebuild the monthly ledger aggregates from transactions."
+    )
+    parser.add_argument("--user-id", type=uuid.UUID, default=None)
+    parser.add_argument(
+        "--check", action="store_true", help="Only report mismatches, exit 1 if any"
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check(args.user_id) else 0)
+    rebuild(args.user_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import operator
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import accumulate, compress, pairwise, repeat
+from typing import Any
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.config import settings
+from app.crud.fx_rate import rate_for
+from app.crud.merchant_key import merchant_key
+from app.models import (
+    Category,
+    CategoryTrends,
+    CategoryTrendSeries,
+    LedgerAggregate,
+    MerchantTotal,
+    MerchantTotals,
+    RollingTotals,
+    Transaction,
+    TxnType,
+)
+from app.services.budget_service import month_starts, scale, subtract, zeros
+from app.services.report_cache import ReportCache
+
+FETCH_CHUNK_SIZE = 10000
+
+TYPE_CODES = {TxnType.expense: 0, TxnType.income: 1}
+
+
+@dataclass
+class TransactionColumns:
+    """One user's transactions as column-oriented parallel arrays, sorted by date.
+
+    Categories, accounts and merchants are stored as codes into the lists
+    below (-1 for none), amounts are already in BASE_CURRENCY.
+    """
+
+    days: array = field(default_factory=lambda: array("l"))  # date ordinals
+    amounts: array = field(default_factory=lambda: array("d"))
+    types: array = field(default_factory=lambda: array("b"))  # TYPE_CODES
+    categories: array = field(default_factory=lambda: array("l"))
+    accounts: array = field(default_factory=lambda: array("l"))
+    merchants: array = field(default_factory=lambda: array("l"))
+    category_ids: list[uuid.UUID] = field(default_factory=list)
+    account_ids: list[uuid.UUID] = field(default_factory=list)
+    merchant_names: list[str] = field(default_factory=list)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.days,
+            self.amounts,
+            self.types,
+            self.categories,
+            self.accounts,
+            self.merchants,
+        )
+        # Code lists are small next to the columns; count them roughly
+        labels = 16 * (len(self.category_ids) + len(self.account_ids))
+        labels += sum(len(name) + 49 for name in self.merchant_names)
+        return sum(len(a) * a.itemsize for a in arrays) + labels
+
+    def span(self, start: date, end: date) -> tuple[int, int]:
+        """Row range [lo, hi) of the days in [start, end]."""
+        return (
+            bisect_left(self.days, start.toordinal()),
+            bisect_left(self.days, end.toordinal() + 1),
+        )
+
+    def mask(
+        self, lo: int, hi: int, txn_type: TxnType, account_id: uuid.UUID | None = None
+    ) -> list[bool]:
+        """Which rows in [lo, hi) have the type and, if given, the account."""
+        selected = map(operator.eq, self.types[lo:hi], repeat(TYPE_CODES[txn_type]))
+        if account_id is None:
+            return list(selected)
+        if account_id not in self.account_ids:
+            return [False] * (hi - lo)
+        code = self.account_ids.index(account_id)
+        in_account = map(operator.eq, self.accounts[lo:hi], repeat(code))
+        return list(map(operator.and_, selected, in_account))
+
+
+analytics_cache: ReportCache[TransactionColumns] = ReportCache(
+    settings.ANALYTICS_CACHE_MAX_BYTES, sizeof=lambda columns: columns.nbytes
+)
+
+
+def _encoder(codes: dict[Any, int], labels: list[Any]) -> Callable[[Any, Any], int]:
+    def encode(key: Any, label: Any) -> int:
+        if key is None:
+            return -1
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(labels)
+            labels.append(label)
+        return code
+
+    return encode
+
+
+def load_columns(*, session: Session, user_id: uuid.UUID) -> TransactionColumns:
+    """Read a user's transactions into columns in one pass over the date index."""
+    rates = crud.get_monthly_rates(
+        session=session,
+        keys=session.exec(
+            select(LedgerAggregate.currency, LedgerAggregate.month)
+            .where(LedgerAggregate.user_id == user_id)
+            .distinct()
+        ).all(),
+    )
+    columns = TransactionColumns()
+    encode_category = _encoder({}, columns.category_ids)
+    encode_account = _encoder({}, columns.account_ids)
+    encode_merchant = _encoder({}, columns.merchant_names)
+    statement = (
+        select(
+            Transaction.txn_date,
+            Transaction.amount,
+            Transaction.currency,
+            Transaction.type,
+            Transaction.category_id,
+            Transaction.account_id,
+            Transaction.merchant,
+            Transaction.merchant_key,
+        )
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.txn_date, Transaction.id)
+    )
+    rows = session.exec(statement.execution_options(yield_per=FETCH_CHUNK_SIZE))
+    for txn_date, amount, currency, txn_type, category_id, account_id, merchant, key in (
+        rows
+    ):
+        rate = rate_for(rates, currency, txn_date)
+        if rate is None:
+            # No rates for the currency; like the reports, leave it out
+            continue
+        columns.days.append(txn_date.toordinal())
+        columns.amounts.append(amount * rate)
+        columns.types.append(TYPE_CODES[txn_type])
+        columns.categories.append(encode_category(category_id, category_id))
+        columns.accounts.append(encode_account(account_id, account_id))
+        # Rows written before the backfill have no stored key yet
+        key = key or merchant_key(merchant)
+        columns.merchants.append(encode_merchant(key, merchant or key))
+    return columns
+
+
+def get_columns(*, session: Session, user_id: uuid.UUID) -> TransactionColumns:
+    """The cached columns of a user, reloaded after any write to their ledger.
+
+    The token is read before loading, so a write racing the load only costs
+    one extra reload on the next request.
+    """
+    version = crud.get_report_version_token(session=session, user_id=user_id)
+    columns = analytics_cache.get(user_id, version)
+    if columns is None:
+        columns = load_columns(session=session, user_id=user_id)
+        analytics_cache.put(user_id, version, columns)
+    return columns
+
+
+def category_trends(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    start_month: date,
+    end_month: date,
+    txn_type: TxnType = TxnType.expense,
+    account_id: uuid.UUID | None = None,
+) -> CategoryTrends:
+    """Monthly totals per category for every month in [start_month, end_month]."""
+    columns = get_columns(session=session, user_id=user_id)
+    months = month_starts(start_month, end_month)
+    _, end = crud.get_month_bounds(end_month.year, end_month.month)
+    # Row boundaries of each month: bisection on the sorted day column
+    bounds = [bisect_left(columns.days, month.toordinal()) for month in [*months, end]]
+    series: dict[int, array] = {}
+    for index, (lo, hi) in enumerate(pairwise(bounds)):
+        mask = columns.mask(lo, hi, txn_type, account_id)
+        for code, amount in zip(
+            compress(columns.categories[lo:hi], mask),
+            compress(columns.amounts[lo:hi], mask),
+            strict=True,
+        ):
+            if code not in series:
+                series[code] = zeros(len(months))
+            series[code][index] += amount
+
+    names = dict(
+        session.exec(
+            select(Category.id, Category.name).where(Category.user_id == user_id)
+        ).all()
+    )
+    result = []
+    for code, totals in series.items():
+        category_id = columns.category_ids[code] if code >= 0 else None
+        result.append(
+            CategoryTrendSeries(
+                category_id=category_id,
+                category_name=names.get(category_id),
+                totals=totals.tolist(),
+                total=sum(totals),
+            )
+        )
+    result.sort(key=lambda item: item.total, reverse=True)
+    return CategoryTrends(type=txn_type, months=months, series=result)
+
+
+def rolling_totals(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    start_date: date,
+    end_date: date,
+    window_days: int,
+    txn_type: TxnType = TxnType.expense,
+    account_id: uuid.UUID | None = None,
+) -> RollingTotals:
+    """Daily totals and their trailing window_days mean for every day in the range.
+
+    Windows reaching before start_date include the days before it. Window
+    sums are differences of one running-sum array and its shifted copy.
+    """
+    columns = get_columns(session=session, user_id=user_id)
+    first = start_date - timedelta(days=window_days - 1)
+    origin = first.toordinal()
+    daily = zeros((end_date - first).days + 1)
+    lo, hi = columns.span(first, end_date)
+    mask = columns.mask(lo, hi, txn_type, account_id)
+    for day, amount in zip(
+        compress(columns.days[lo:hi], mask),
+        compress(columns.amounts[lo:hi], mask),
+        strict=True,
+    ):
+        daily[day - origin] += amount
+
+    running = array("d", accumulate(daily, initial=0.0))
+    window_sums = subtract(running[window_days:], running[:-window_days])
+    return RollingTotals(
+        type=txn_type,
+        window_days=window_days,
+        dates=[
+            start_date + timedelta(days=offset) for offset in range(len(window_sums))
+        ],
+        totals=daily[window_days - 1 :].tolist(),
+        rolling_average=scale(window_sums, 1 / window_days).tolist(),
+    )
+
+
+def top_merchants(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    start_date: date,
+    end_date: date,
+    limit: int = 10,
+    txn_type: TxnType = TxnType.expense,
+    account_id: uuid.UUID | None = None,
+) -> MerchantTotals:
+    """Merchants with the largest totals in [start_date, end_date]."""
+    columns = get_columns(session=session, user_id=user_id)
+    lo, hi = columns.span(start_date, end_date)
+    mask = columns.mask(lo, hi, txn_type, account_id)
+    totals: Counter[int] = Counter()
+    counts: Counter[int] = Counter()
+    for code, amount in zip(
+        compress(columns.merchants[lo:hi], mask),
+        compress(columns.amounts[lo:hi], mask),
+        strict=True,
+    ):
+        if code >= 0:
+            totals[code] += amount
+            counts[code] += 1
+    data = [
+        MerchantTotal(
+            merchant=columns.merchant_names[code], total=total, count=counts[code]
+        )
+        for code, total in totals.most_common(limit)
+    ]
+    return MerchantTotals(data=data, count=len(totals))
@@ -0,0 +1,111 @@
+import operator
+import uuid
+from array import array
+from collections.abc import Iterable
+from datetime import date
+from itertools import accumulate
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.crud.budget import BUDGET_GROUPS, group_percents
+from app.models import AllocationRule, BudgetGroupSeries, BudgetReport, TxnType
+
+
+def month_starts(start_month: date, end_month: date) -> list[date]:
+    """First day of every month from start_month to end_month, inclusive."""
+    months = []
+    year, month = start_month.year, start_month.month
+    while (year, month) <= (end_month.year, end_month.month):
+        months.append(date(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def zeros(length: int) -> array:
+    return array("d", bytes(8 * length))
+
+
+def subtract(a: Iterable[float], b: Iterable[float]) -> array:
+    return array("d", map(operator.sub, a, b))
+
+
+def scale(a: Iterable[float], factor: float) -> array:
+    return array("d", map(factor.__mul__, a))
+
+
+def compute_budget(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    start_month: date,
+    end_month: date,
+    rules: Iterable[AllocationRule] | None = None,
+) -> BudgetReport:
+    """Allocated vs spent vs remaining per budget group for every month in the range.
+
+    Grouped sums come from the ledger aggregates in one query and are
+    scattered into one float array per series; every month is then
+    evaluated at once with element-wise array operations.
+
+    Income (in income categories or uncategorized) funds each group with its
+    AllocationRule percent. Spending in a group is its expenses minus the
+    income filed under the same group's categories (refunds). carryover is
+    the envelope balance: remaining accumulated from the start of the range.
+    Amounts in a currency without FX rates are left out and reported in
+    unconverted.
+    """
+    months = month_starts(start_month, end_month)
+    position = {month: index for index, month in enumerate(months)}
+    _, end_date = crud.get_month_bounds(end_month.year, end_month.month)
+    if rules is None:
+        rules = session.exec(
+            select(AllocationRule).where(AllocationRule.user_id == user_id)
+        ).all()
+
+    income = zeros(len(months))
+    unassigned = zeros(len(months))
+    expenses = {grp: zeros(len(months)) for grp in BUDGET_GROUPS}
+    refunds = {grp: zeros(len(months)) for grp in BUDGET_GROUPS}
+    for month, grp, txn_type, total in crud.get_monthly_group_totals(
+        session=session, user_id=user_id, start_date=months[0], end_date=end_date
+    ):
+        index = position[month]
+        if grp in expenses:
+            (expenses if txn_type == TxnType.expense else refunds)[grp][index] += total
+        elif txn_type == TxnType.income:
+            income[index] += total
+        else:
+            unassigned[index] += total
+
+    unconverted: dict[str, float] = {}
+    for by_currency in crud.get_unconverted_amounts(
+        session=session, user_id=user_id, start_date=months[0], end_date=end_date
+    ).values():
+        for currency, amount in by_currency.items():
+            unconverted[currency] = unconverted.get(currency, 0.0) + amount
+
+    groups = []
+    for grp, percent in group_percents(rules).items():
+        allocated = scale(income, percent / 100)
+        spent = subtract(expenses[grp], refunds[grp])
+        remaining = subtract(allocated, spent)
+        groups.append(
+            BudgetGroupSeries(
+                grp=grp,
+                percent=percent,
+                allocated=allocated.tolist(),
+                spent=spent.tolist(),
+                remaining=remaining.tolist(),
+                carryover=list(accumulate(remaining)),
+                total_allocated=sum(allocated),
+                total_spent=sum(spent),
+            )
+        )
+    return BudgetReport(
+        months=months,
+        income=income.tolist(),
+        unassigned_spent=unassigned.tolist(),
+        groups=groups,
+        unconverted=unconverted,
+    )
@@ -0,0 +1,105 @@
+import logging
+import threading
+import uuid
+from collections import defaultdict
+
+from sqlmodel import Session, func, select
+
+from app import crud
+from app.crud.merchant_category import MERCHANT_TOKEN_PREFIX
+from app.models import CategorizationStats, EmailTransaction, GmailConnection, User
+
+logger = logging.getLogger(__name__)
+
+# Ingest lookups and hits per user since process start
+_metrics_lock = threading.Lock()
+_metrics: dict[uuid.UUID, list[int]] = defaultdict(lambda: [0, 0])
+
+
+def _record_lookup(user_id: uuid.UUID, hit: bool) -> None:
+    with _metrics_lock:
+        counters = _metrics[user_id]
+        counters[0] += 1
+        counters[1] += int(hit)
+
+
+class CategoryIndex:
+    """In-memory view of a user's merchant category index for one ingest run.
+
+    Loaded with a single query, then every suggestion is a handful of dict
+    lookups: an exact normalized-merchant match wins, otherwise the word
+    tokens vote with their hit counts.
+    """
+
+    def __init__(
+        self, user_id: uuid.UUID, entries: dict[str, tuple[uuid.UUID, int]]
+    ) -> None:
+        self.user_id = user_id
+        self.entries = entries
+
+    def suggest(
+        self, merchant: str | None, description: str | None = None
+    ) -> uuid.UUID | None:
+        tokens = crud.category_tokens(merchant, description)
+        if not tokens:
+            return None
+        category_id = None
+        if tokens[0].startswith(MERCHANT_TOKEN_PREFIX):
+            match = self.entries.get(tokens[0])
+            if match:
+                category_id = match[0]
+        if category_id is None:
+            votes: dict[uuid.UUID, int] = defaultdict(int)
+            for token in tokens:
+                match = self.entries.get(token)
+                if match:
+                    votes[match[0]] += match[1]
+            if votes:
+                category_id = max(votes, key=votes.__getitem__)
+        _record_lookup(self.user_id, category_id is not None)
+        return category_id
+
+
+def load_category_index(*, session: Session, user_id: uuid.UUID) -> CategoryIndex:
+    return CategoryIndex(
+        user_id, crud.get_merchant_category_index(session=session, user_id=user_id)
+    )
+
+
+def get_categorization_stats(
+    *, session: Session, user_id: uuid.UUID
+) -> CategorizationStats:
+    tokens, entries = crud.count_merchant_category_stats(session=session, user_id=user_id)
+    with _metrics_lock:
+        lookups, hits = _metrics.get(user_id, (0, 0))
+    total, categorized = session.exec(
+        select(func.count(), func.count(EmailTransaction.category_id))
+        .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+        .where(GmailConnection.user_id == user_id)
+    ).one()
+    return CategorizationStats(
+        tokens=tokens,
+        entries=entries,
+        lookups=lookups,
+        hits=hits,
+        hit_rate=hits / lookups if lookups else 0.0,
+        email_transactions=total,
+        categorized_email_transactions=categorized,
+    )
+
+
+def rebuild_all_category_indexes() -> int:
+    """Rebuild the merchant category index of every active user; return how many were rebuilt."""
+    from app.core.db import engine
+
+    rebuilt = 0
+    with Session(engine) as session:
+        user_ids = session.exec(select(User.id).where(User.is_active)).all()
+        for user_id in user_ids:
+            try:
+                crud.rebuild_merchant_category_index(session=session, user_id=user_id)
+                rebuilt += 1
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to rebuild category index for user {user_id}: {e}")
+    return rebuilt
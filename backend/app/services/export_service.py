@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+from app.models import ExportFormat
+
+# Flush the encoder buffer once it holds roughly this many bytes
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv",
+    ExportFormat.ndjson: "application/x-ndjson",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_encoded_rows(
+    rows: Iterable[Sequence[Any]], columns: Sequence[str], fmt: ExportFormat
+) -> Iterator[bytes]:
+    """Encode rows as CSV or NDJSON, yielding chunks of ~EXPORT_FLUSH_BYTES."""
+    buffer = io.StringIO()
+    if fmt == ExportFormat.csv:
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_csv_value(value) for value in row])
+            if buffer.tell() >= EXPORT_FLUSH_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+    else:
+        for row in rows:
+            buffer.write(
+                json.dumps(
+                    dict(zip(columns, row, strict=True)),
+                    default=_json_default,
+                    ensure_ascii=False,
+                )
+            )
+            buffer.write("\n")
+            if buffer.tell() >= EXPORT_FLUSH_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally without buffering the whole payload."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    rows: Iterable[Sequence[Any]],
+    *,
+    columns: Sequence[str],
+    fmt: ExportFormat,
+    filename: str,
+    compress: bool = False,
+) -> StreamingResponse:
+    """Build a streaming download response for an iterable of rows."""
+    body: Iterable[bytes] = iter_encoded_rows(rows, columns, fmt)
+    filename = f"{filename}.{fmt.value}"
+    media_type = MEDIA_TYPES[fmt]
+    if compress:
+        body = iter_gzip(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    return StreamingResponse(body, media_type=media_type, headers=headers)
@@ -0,0 +1,92 @@
+import csv
+from collections.abc import Iterable
+from typing import Any
+
+from sqlmodel import Session, func, select
+
+from app import crud
+from app.core.config import settings
+from app.models import FxRateImportError, FxRateImportResult, LedgerAggregate
+from app.services.statement_import import parse_date
+from app.utils import normalize_text
+
+MAX_REPORTED_ERRORS = 1000
+
+# Header (normalized) -> field
+COLUMN_ALIASES = {
+    "rate_date": ("date", "rate date", "rate_date", "day"),
+    "currency": ("currency", "code", "currency code"),
+    "rate": ("rate", "value", "fx rate"),
+}
+
+
+def load_fx_rates(*, session: Session, lines: Iterable[str]) -> FxRateImportResult:
+    """Load daily rates from a CSV with date, currency and rate columns.
+
+    rate is the value of one unit of the currency in BASE_CURRENCY. Rows
+    are upserted in chunks and committed once; the rate cache is cleared,
+    reports from the earliest loaded month on are invalidated for every
+    user, and the budget totals of users holding a loaded currency are
+    recomputed with the new rates.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("The file is empty")
+    positions = {normalize_text(name): index for index, name in enumerate(header)}
+    columns: dict[str, int] = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        index = next((positions[a] for a in aliases if a in positions), None)
+        if index is None:
+            raise ValueError(f"No {field} column found")
+        columns[field] = index
+
+    result = FxRateImportResult()
+    rows: dict[tuple[str, Any], dict[str, Any]] = {}
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        try:
+            currency = row[columns["currency"]].strip().upper()
+            if not currency or len(currency) > 10:
+                raise ValueError(f"Invalid currency: {currency!r}")
+            if currency == settings.BASE_CURRENCY:
+                raise ValueError(f"{currency} is the base currency")
+            rate_date = parse_date(row[columns["rate_date"]].strip())
+            # Rates are plain decimals; "1.234" must not read as a thousands group
+            text = row[columns["rate"]].strip()
+            try:
+                rate = float(text)
+            except ValueError:
+                raise ValueError(f"Invalid rate: {text!r}")
+            if not rate > 0:
+                raise ValueError("Rate must be greater than zero")
+        except (ValueError, IndexError) as e:
+            result.failed += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                message = str(e) if isinstance(e, ValueError) else "Missing column"
+                result.errors.append(FxRateImportError(row=reader.line_num, error=message))
+            continue
+        # The last row for a day wins, as a re-load would
+        rows[(currency, rate_date)] = {
+            "currency": currency,
+            "rate_date": rate_date,
+            "rate": rate,
+        }
+
+    if rows:
+        crud.upsert_fx_rates(session=session, rows=list(rows.values()))
+        crud.bump_report_versions_since(
+            session=session, month=min(date for _, date in rows)
+        )
+        crud.fx_rate_cache.clear()
+        user_ids = session.exec(
+            select(LedgerAggregate.user_id)
+            .where(func.upper(LedgerAggregate.currency).in_({c for c, _ in rows}))
+            .distinct()
+        ).all()
+        for user_id in user_ids:
+            crud.rebuild_budget_totals(session=session, user_id=user_id)
+        session.commit()
+    result.loaded = len(rows)
+    return result
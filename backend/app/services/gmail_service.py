@@ -438,6 +438,7 @@ def sync_all_active_connections(days: int = 1) -> Dict[str, int]:
     from app.core.db import engine
     from app.crud import email_transaction as email_crud, gmail_connection as gmail_crud
     from app.models import EmailTransactionCreate
+    from app.services.categorization_service import load_category_index
     from app.utils import decrypt_token
     
     results = {}
@@ -490,6 +491,7 @@ def sync_all_active_connections(days: int = 1) -> Dict[str, int]:
                     
                     # Process each email
                     processor = EmailTransactionProcessor()
+                    category_index = load_category_index(session=session, user_id=connection.user_id)
                     synced_count = 0
                     
                     for email in emails:
@@ -518,7 +520,8 @@ def sync_all_active_connections(days: int = 1) -> Dict[str, int]:
                                 merchant=transaction_info.get('merchant'),
                                 account_number=transaction_info.get('account_number'),
                                 transaction_type=transaction_info.get('transaction_type'),
-                                raw_content=email['body']
+                                raw_content=email['body'],
+                                category_id=category_index.suggest(transaction_info.get('merchant')),
                             )
                             
                             email_crud.create_email_transaction(
@@ -0,0 +1,168 @@
+import uuid
+from collections.abc import Iterator
+from datetime import date, timedelta
+from itertools import groupby
+from typing import Any
+
+from sqlalchemy import exists
+from sqlmodel import Session, select
+
+from app.models import (
+    EmailTransaction,
+    EmailTransactionStatus,
+    GmailConnection,
+    ReconciliationProposal,
+    Transaction,
+    TxnType,
+)
+
+# Bank email transaction_type -> ledger type; unknown types match either
+EMAIL_TYPE_TO_TXN_TYPE = {"debit": TxnType.expense, "credit": TxnType.income}
+FETCH_CHUNK_SIZE = 5000
+
+
+def _amount_key(amount: float) -> float:
+    return round(amount, 2)
+
+
+def _match_group(
+    emails: list[Any], transactions: list[Any], window_days: int
+) -> Iterator[ReconciliationProposal]:
+    """Pair rows sharing one amount, both lists sorted by date.
+
+    Candidate pairs inside the window are collected with a sliding lower
+    bound, then assigned closest-first so an exact-date pair is never lost
+    to a neighbour that happened to be scanned earlier.
+    """
+    window = timedelta(days=window_days)
+    candidates: list[tuple[int, int, int]] = []
+    lo = 0
+    for e, email in enumerate(emails):
+        email_date = email.received_at.date()
+        while lo < len(transactions) and transactions[lo].txn_date < email_date - window:
+            lo += 1
+        wanted_type = EMAIL_TYPE_TO_TXN_TYPE.get((email.transaction_type or "").lower())
+        t = lo
+        while t < len(transactions) and transactions[t].txn_date <= email_date + window:
+            if wanted_type is None or transactions[t].type == wanted_type:
+                candidates.append((abs((transactions[t].txn_date - email_date).days), e, t))
+            t += 1
+
+    used_emails: set[int] = set()
+    used_transactions: set[int] = set()
+    for _, e, t in sorted(candidates):
+        if e in used_emails or t in used_transactions:
+            continue
+        used_emails.add(e)
+        used_transactions.add(t)
+        email, txn = emails[e], transactions[t]
+        yield ReconciliationProposal(
+            email_transaction_id=email.id,
+            transaction_id=txn.id,
+            amount=email.amount,
+            received_at=email.received_at,
+            txn_date=txn.txn_date,
+            day_diff=(txn.txn_date - email.received_at.date()).days,
+            account_id=txn.account_id,
+            email_merchant=email.merchant,
+            transaction_merchant=txn.merchant,
+        )
+
+
+def propose_matches(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    window_days: int = 3,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    account_id: uuid.UUID | None = None,
+    gmail_connection_id: uuid.UUID | None = None,
+) -> list[ReconciliationProposal]:
+    """Propose links between unlinked email transactions and ledger transactions.
+
+    Both sides are streamed sorted by (amount, date) and merged like a
+    sort-merge join on amount, so the cost is one pass over each side plus
+    sorting done by the database; no email is compared against every
+    transaction. Within an amount, pairs must be within window_days of each
+    other and of a compatible direction.
+    """
+    email_statement = (
+        select(
+            EmailTransaction.id,
+            EmailTransaction.amount,
+            EmailTransaction.received_at,
+            EmailTransaction.transaction_type,
+            EmailTransaction.merchant,
+        )
+        .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+        .where(
+            GmailConnection.user_id == user_id,
+            EmailTransaction.linked_transaction_id.is_(None),
+            EmailTransaction.amount.is_not(None),
+            EmailTransaction.status != EmailTransactionStatus.ignored,
+        )
+    )
+    txn_statement = select(
+        Transaction.id,
+        Transaction.amount,
+        Transaction.txn_date,
+        Transaction.type,
+        Transaction.merchant,
+        Transaction.account_id,
+    ).where(
+        Transaction.user_id == user_id,
+        ~exists().where(EmailTransaction.linked_transaction_id == Transaction.id),
+    )
+    if gmail_connection_id is not None:
+        email_statement = email_statement.where(
+            EmailTransaction.gmail_connection_id == gmail_connection_id
+        )
+    if account_id is not None:
+        txn_statement = txn_statement.where(Transaction.account_id == account_id)
+    # Transactions just outside the email range can still match within the window
+    if start_date is not None:
+        email_statement = email_statement.where(EmailTransaction.received_at >= start_date)
+        txn_statement = txn_statement.where(
+            Transaction.txn_date >= start_date - timedelta(days=window_days)
+        )
+    if end_date is not None:
+        email_statement = email_statement.where(
+            EmailTransaction.received_at < end_date + timedelta(days=1)
+        )
+        txn_statement = txn_statement.where(
+            Transaction.txn_date <= end_date + timedelta(days=window_days)
+        )
+    email_statement = email_statement.order_by(
+        EmailTransaction.amount, EmailTransaction.received_at, EmailTransaction.id
+    )
+    txn_statement = txn_statement.order_by(
+        Transaction.amount, Transaction.txn_date, Transaction.id
+    )
+
+    email_groups = groupby(
+        session.exec(email_statement.execution_options(yield_per=FETCH_CHUNK_SIZE)),
+        key=lambda row: _amount_key(row.amount),
+    )
+    txn_groups = groupby(
+        session.exec(txn_statement.execution_options(yield_per=FETCH_CHUNK_SIZE)),
+        key=lambda row: _amount_key(row.amount),
+    )
+
+    proposals: list[ReconciliationProposal] = []
+    email_group = next(email_groups, None)
+    txn_group = next(txn_groups, None)
+    while email_group is not None and txn_group is not None:
+        email_amount, emails = email_group
+        txn_amount, transactions = txn_group
+        if email_amount < txn_amount:
+            email_group = next(email_groups, None)
+        elif email_amount > txn_amount:
+            txn_group = next(txn_groups, None)
+        else:
+            proposals.extend(_match_group(list(emails), list(transactions), window_days))
+            email_group = next(email_groups, None)
+            txn_group = next(txn_groups, None)
+
+    proposals.sort(key=lambda p: (p.received_at, p.email_transaction_id))
+    return proposals
@@ -0,0 +1,284 @@
+import logging
+import operator
+import statistics
+import uuid
+from array import array
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.crud.merchant_key import merchant_key
+from app.models import (
+    CashFlowProjection,
+    CashFlowProjectionMonth,
+    EmailTransaction,
+    EmailTransactionStatus,
+    GmailConnection,
+    RecurringSeries,
+    Transaction,
+    TxnType,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+LOOKBACK_DAYS = 730
+MIN_OCCURRENCES = 3
+MIN_INTERVAL_DAYS = 6
+MAX_INTERVAL_DAYS = 400
+# Largest accepted spread (standard deviation / mean) of gaps and amounts
+MAX_INTERVAL_CV = 0.25
+MAX_AMOUNT_CV = 0.25
+# A series this many intervals past its expected next date has stopped
+STALE_INTERVALS = 1.5
+# Occurrences after which more history no longer raises confidence
+FULL_SUPPORT = 6
+
+EMAIL_TYPES = {"credit": TxnType.income, "debit": TxnType.expense}
+# An unlinked email this close in days and relative amount to a transaction
+# of its group is taken to be the same payment entered by hand
+EMAIL_MATCH_DAYS = 1
+EMAIL_MATCH_AMOUNT = 0.01
+
+SeriesKey = tuple[str, TxnType]  # (merchant key, type)
+
+
+@dataclass
+class _Occurrences:
+    """Dated amounts of one merchant and type, plus the latest labels seen."""
+
+    points: list[tuple[int, float]] = field(default_factory=list)  # (ordinal, amount)
+    email_points: list[tuple[int, float]] = field(default_factory=list)
+    merchant: str | None = None
+    account_id: uuid.UUID | None = None
+    category_id: uuid.UUID | None = None
+    from_email: bool = False
+
+
+def _load_occurrences(
+    *, session: Session, user_id: uuid.UUID, since: date
+) -> dict[SeriesKey, _Occurrences]:
+    groups: dict[SeriesKey, _Occurrences] = {}
+    transactions = session.exec(
+        select(
+            Transaction.txn_date,
+            Transaction.amount,
+            Transaction.type,
+            Transaction.merchant,
+            Transaction.merchant_key,
+            Transaction.account_id,
+            Transaction.category_id,
+        )
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.txn_date >= since,
+            Transaction.merchant.is_not(None),
+        )
+        .order_by(Transaction.txn_date)
+    )
+    for txn_date, amount, txn_type, merchant, key, account_id, category_id in transactions:
+        # Rows written before the backfill have no stored key yet
+        key = key or merchant_key(merchant)
+        if not key:
+            continue
+        group = groups.setdefault((key, txn_type), _Occurrences())
+        group.points.append((txn_date.toordinal(), amount))
+        group.merchant, group.account_id, group.category_id = merchant, account_id, category_id
+
+    # Emails that were never converted are the only record of some bills
+    emails = session.exec(
+        select(
+            EmailTransaction.received_at,
+            EmailTransaction.amount,
+            EmailTransaction.transaction_type,
+            EmailTransaction.merchant,
+            EmailTransaction.merchant_key,
+            EmailTransaction.category_id,
+        )
+        .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+        .where(
+            GmailConnection.user_id == user_id,
+            EmailTransaction.received_at >= datetime.combine(since, datetime.min.time()),
+            EmailTransaction.linked_transaction_id.is_(None),
+            EmailTransaction.status != EmailTransactionStatus.ignored,
+            EmailTransaction.amount > 0,
+            EmailTransaction.merchant.is_not(None),
+        )
+        .order_by(EmailTransaction.received_at)
+    )
+    for received_at, amount, email_type, merchant, key, category_id in emails:
+        txn_type = EMAIL_TYPES.get((email_type or "").lower())
+        key = key or merchant_key(merchant)
+        if txn_type is None or not key:
+            continue
+        group = groups.setdefault((key, txn_type), _Occurrences())
+        group.email_points.append((received_at.date().toordinal(), amount))
+        group.merchant = group.merchant or merchant
+        group.category_id = group.category_id or category_id
+    return groups
+
+
+def _daily_amounts(group: _Occurrences) -> dict[int, float]:
+    """Total per day of a group, counting a payment found in both sources once.
+
+    Emails that match a transaction of the group within EMAIL_MATCH_DAYS
+    (received_at is UTC, so the day can be off by one) and EMAIL_MATCH_AMOUNT
+    are dropped; the others add to their day. Sets group.from_email when
+    any email is kept.
+    """
+    by_day: dict[int, float] = {}
+    transactions: dict[int, list[float]] = {}
+    for day, amount in group.points:
+        by_day[day] = by_day.get(day, 0.0) + amount
+        transactions.setdefault(day, []).append(amount)
+    for day, amount in group.email_points:
+        if any(
+            abs(amount - other) <= EMAIL_MATCH_AMOUNT * max(amount, other)
+            for near in range(day - EMAIL_MATCH_DAYS, day + EMAIL_MATCH_DAYS + 1)
+            for other in transactions.get(near, ())
+        ):
+            continue
+        by_day[day] = by_day.get(day, 0.0) + amount
+        group.from_email = True
+    return dict(sorted(by_day.items()))
+
+
+def _coefficient_of_variation(values: array) -> float:
+    mean = statistics.fmean(values)
+    return statistics.pstdev(values, mean) / mean if mean else float("inf")
+
+
+def analyze_series(
+    days: array, amounts: array, today: date
+) -> tuple[float, float, float, date] | None:
+    """(interval, amount, confidence, next date) when the points form a live series.
+
+    days are distinct sorted ordinals. The gaps come from one element-wise
+    subtraction of the day array and its shifted copy.
+    """
+    if len(days) < MIN_OCCURRENCES:
+        return None
+    gaps = array("l", map(operator.sub, days[1:], days[:-1]))
+    interval = statistics.median(gaps)
+    if not MIN_INTERVAL_DAYS <= interval <= MAX_INTERVAL_DAYS:
+        return None
+    interval_cv = _coefficient_of_variation(gaps)
+    amount_cv = _coefficient_of_variation(amounts)
+    if interval_cv > MAX_INTERVAL_CV or amount_cv > MAX_AMOUNT_CV:
+        return None
+
+    next_date = step_date(date.fromordinal(days[-1]), interval)
+    if (today - next_date).days > STALE_INTERVALS * interval:
+        return None
+    regularity = 1 - (interval_cv / MAX_INTERVAL_CV + amount_cv / MAX_AMOUNT_CV) / 2
+    support = min(1.0, (len(gaps) + 1) / FULL_SUPPORT)
+    return interval, statistics.median(amounts), round(regularity * support, 3), next_date
+
+
+def step_date(day: date, interval: float) -> date:
+    """The occurrence after day: calendar months and years for those cadences."""
+    if 27 <= interval <= 33 or 360 <= interval <= 370:
+        months = 1 if interval <= 33 else 12
+        year, month = divmod(day.month - 1 + months, 12)
+        year, month = day.year + year, month + 1
+        return date(year, month, min(day.day, monthrange(year, month)[1]))
+    return day + timedelta(days=round(interval))
+
+
+def detect_recurring_series(
+    *, session: Session, user_id: uuid.UUID, today: date | None = None
+) -> list[RecurringSeries]:
+    """Find periodic series in the last LOOKBACK_DAYS and store them, replacing old ones.
+
+    Transactions and unconverted email transactions are grouped by
+    canonical merchant key and type; a group is a series when it has at least
+    MIN_OCCURRENCES, its gaps and amounts are stable and it has not stopped.
+    """
+    today = today or date.today()
+    groups = _load_occurrences(
+        session=session, user_id=user_id, since=today - timedelta(days=LOOKBACK_DAYS)
+    )
+    detected = []
+    for (key, txn_type), group in groups.items():
+        # One occurrence per day: a split payment is not a zero-day cycle
+        by_day = _daily_amounts(group)
+        days = array("l", by_day)
+        result = analyze_series(days, array("d", by_day.values()), today)
+        if result is None:
+            continue
+        interval, amount, confidence, next_date = result
+        detected.append(
+            RecurringSeries(
+                user_id=user_id,
+                merchant_key=key[:255],
+                merchant=group.merchant,
+                type=txn_type,
+                account_id=group.account_id,
+                category_id=group.category_id,
+                interval_days=interval,
+                amount=amount,
+                occurrences=len(days),
+                first_date=date.fromordinal(days[0]),
+                last_date=date.fromordinal(days[-1]),
+                next_date=next_date,
+                confidence=confidence,
+                from_email=group.from_email,
+            )
+        )
+    crud.replace_recurring_series(session=session, user_id=user_id, series=detected)
+    return detected
+
+
+def detect_all_users() -> int:
+    """Re-detect recurring series of every active user; return how many succeeded."""
+    from app.core.db import engine
+
+    detected = 0
+    with Session(engine) as session:
+        user_ids = session.exec(select(User.id).where(User.is_active)).all()
+        for user_id in user_ids:
+            try:
+                detect_recurring_series(session=session, user_id=user_id)
+                detected += 1
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to detect recurring series for user {user_id}: {e}")
+    return detected
+
+
+def project_cash_flow(
+    *, session: Session, user_id: uuid.UUID, months: int = 6, today: date | None = None
+) -> CashFlowProjection:
+    """Expected income and expenses per month from the stored series.
+
+    Reads only the series table. Overdue occurrences count in the current
+    month.
+    """
+    today = today or date.today()
+    series = crud.get_recurring_series(session=session, user_id=user_id)
+    start = today.replace(day=1)
+    month_starts = [start]
+    for _ in range(months - 1):
+        month_starts.append(step_date(month_starts[-1], 30))
+    end = step_date(month_starts[-1], 30)
+    projection = {month: CashFlowProjectionMonth(month=month) for month in month_starts}
+
+    for item in series:
+        day = item.next_date
+        while day < end:
+            entry = projection[max(start, day.replace(day=1))]
+            if item.type == TxnType.income:
+                entry.income += item.amount
+            else:
+                entry.expense += item.amount
+            day = step_date(day, item.interval_days)
+    for entry in projection.values():
+        entry.net = entry.income - entry.expense
+    return CashFlowProjection(
+        data=list(projection.values()),
+        series_count=len(series),
+        detected_at=max((item.detected_at for item in series), default=None),
+    )
@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from app.core.config import settings
+from app.models import ReportCacheStats
+
+V = TypeVar("V")
+
+
+class ReportCache(Generic[V]):
+    """Byte-bounded LRU of report payloads.
+
+    Each entry is stored with the version token it was computed under; a
+    lookup with a different token is a miss, so writes invalidate entries
+    simply by bumping the version counter in the database. sizeof measures
+    a payload in bytes.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[V], int]) -> None:
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[Hashable, V]] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Hashable) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, payload: V) -> None:
+        size = self.sizeof(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._bytes -= self._sizes.pop(key)
+            self._entries[key] = (version, payload)
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+
+    def stats(self) -> ReportCacheStats:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return ReportCacheStats(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+            )
+
+
+report_cache: ReportCache[bytes] = ReportCache(
+    settings.REPORT_CACHE_MAX_BYTES, sizeof=len
+)
@@ -4,8 +4,11 @@ from datetime import datetime, timezone
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
+from app.services.categorization_service import rebuild_all_category_indexes
 from app.services.gmail_service import sync_all_active_connections
+from app.services.recurring_service import detect_all_users
 from app.services.schedule_service import batch_rollover_overdue_todos
+from app.services.snapshot_service import pa, snapshot_all_users
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +60,40 @@ class GmailSyncScheduler:
                 misfire_grace_time=3600  # 1 hour grace time
             )
             
+            # Add nightly rebuild of merchant category indexes
+            self.scheduler.add_job(
+                func=self._daily_category_index_rebuild_task,
+                trigger=IntervalTrigger(hours=24),
+                id='daily_category_index_rebuild',
+                name='Daily Category Index Rebuild',
+                replace_existing=True,
+                max_instances=1,
+                misfire_grace_time=3600  # 1 hour grace time
+            )
+
+            # Add nightly recurring series detection
+            self.scheduler.add_job(
+                func=self._daily_recurring_detection_task,
+                trigger=IntervalTrigger(hours=24),
+                id='daily_recurring_detection',
+                name='Daily Recurring Series Detection',
+                replace_existing=True,
+                max_instances=1,
+                misfire_grace_time=3600  # 1 hour grace time
+            )
+
+            # Add daily incremental analytics snapshot job (needs pyarrow)
+            if pa is not None:
+                self.scheduler.add_job(
+                    func=self._daily_analytics_snapshot_task,
+                    trigger=IntervalTrigger(hours=24),
+                    id='daily_analytics_snapshot',
+                    name='Daily Analytics Snapshot',
+                    replace_existing=True,
+                    max_instances=1,
+                    misfire_grace_time=3600  # 1 hour grace time
+                )
+
             self.scheduler.start()
             self.is_running = True
             
@@ -119,6 +156,33 @@ class GmailSyncScheduler:
         except Exception as e:
             logger.error(f"Error in daily todo rollover task: {e}")
     
+    def _daily_category_index_rebuild_task(self):
+        """Daily task to rebuild merchant category indexes from transaction history."""
+        logger.info("Starting daily category index rebuild task...")
+        try:
+            count = rebuild_all_category_indexes()
+            logger.info(f"Daily category index rebuild completed: {count} users rebuilt")
+        except Exception as e:
+            logger.error(f"Error in daily category index rebuild task: {e}")
+
+    def _daily_recurring_detection_task(self):
+        """Daily task to detect recurring series for cash-flow projections."""
+        logger.info("Starting daily recurring series detection task...")
+        try:
+            count = detect_all_users()
+            logger.info(f"Daily recurring series detection completed: {count} users processed")
+        except Exception as e:
+            logger.error(f"Error in daily recurring series detection task: {e}")
+
+    def _daily_analytics_snapshot_task(self):
+        """Daily task to write incremental columnar snapshots for all users."""
+        logger.info("Starting daily analytics snapshot task...")
+        try:
+            count = snapshot_all_users()
+            logger.info(f"Daily analytics snapshot completed: {count} users snapshotted")
+        except Exception as e:
+            logger.error(f"Error in daily analytics snapshot task: {e}")
+
     def get_job_status(self):
         """Get status of scheduled jobs."""
         if not self.is_running:
@@ -0,0 +1,356 @@
+import logging
+import os
+import shutil
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any
+
+from sqlmodel import Session, func, select
+
+from app import crud
+from app.core.config import settings
+from app.models import (
+    Account,
+    AnalyticsSnapshot,
+    Category,
+    EmailTransaction,
+    GmailConnection,
+    SnapshotFormat,
+    Transaction,
+    User,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional "analytics" extra
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLES = ("transactions", "email_transactions", "categories", "accounts")
+FILE_EXTENSIONS = {SnapshotFormat.parquet: "parquet", SnapshotFormat.arrow: "arrow"}
+
+
+class SnapshotUnavailableError(RuntimeError):
+    """Raised when the optional pyarrow dependency is not installed."""
+
+
+def _schemas() -> dict[str, Any]:
+    """Arrow schemas for each snapshot table.
+
+    Low-cardinality strings (types, currencies, names) are dictionary encoded,
+    amounts are float64 and dates are native date/timestamp columns.
+    """
+    label = pa.dictionary(pa.int32(), pa.string())
+    ts = pa.timestamp("us", tz="UTC")
+    return {
+        "transactions": pa.schema(
+            [
+                ("id", pa.string()),
+                ("txn_date", pa.date32()),
+                ("type", label),
+                ("amount", pa.float64()),
+                ("currency", label),
+                ("merchant", pa.string()),
+                ("note", pa.string()),
+                ("account_id", pa.string()),
+                ("account_name", label),
+                ("category_id", pa.string()),
+                ("category_name", label),
+                ("created_at", ts),
+                ("updated_at", ts),
+            ]
+        ),
+        "email_transactions": pa.schema(
+            [
+                ("id", pa.string()),
+                ("gmail_connection_id", pa.string()),
+                ("received_at", ts),
+                ("sender", label),
+                ("subject", pa.string()),
+                ("amount", pa.float64()),
+                ("merchant", pa.string()),
+                ("account_number", label),
+                ("transaction_type", label),
+                ("status", label),
+                ("category_id", pa.string()),
+                ("category_name", label),
+                ("linked_transaction_id", pa.string()),
+                ("created_at", ts),
+                ("updated_at", ts),
+            ]
+        ),
+        "categories": pa.schema(
+            [
+                ("id", pa.string()),
+                ("name", pa.string()),
+                ("grp", label),
+                ("is_envelope", pa.bool_()),
+                ("created_at", ts),
+                ("updated_at", ts),
+            ]
+        ),
+        "accounts": pa.schema(
+            [
+                ("id", pa.string()),
+                ("name", pa.string()),
+                ("type", label),
+                ("currency", label),
+                ("is_active", pa.bool_()),
+                ("created_at", ts),
+                ("updated_at", ts),
+            ]
+        ),
+    }
+
+
+def _statements(
+    user_id: uuid.UUID, since: datetime | None, watermark: datetime
+) -> dict[str, Any]:
+    """Select statements for each table, columns in schema order."""
+
+    def window(updated_at: Any) -> list[Any]:
+        clauses = [updated_at <= watermark]
+        if since is not None:
+            clauses.append(updated_at > since)
+        return clauses
+
+    transactions = (
+        select(
+            Transaction.id,
+            Transaction.txn_date,
+            Transaction.type,
+            Transaction.amount,
+            Transaction.currency,
+            Transaction.merchant,
+            Transaction.note,
+            Transaction.account_id,
+            Account.name,
+            Transaction.category_id,
+            Category.name,
+            Transaction.created_at,
+            Transaction.updated_at,
+        )
+        .join(Account, Transaction.account_id == Account.id)
+        .join(Category, Transaction.category_id == Category.id, isouter=True)
+        .where(Transaction.user_id == user_id, *window(Transaction.updated_at))
+        .order_by(Transaction.txn_date, Transaction.id)
+    )
+    email_transactions = (
+        select(
+            EmailTransaction.id,
+            EmailTransaction.gmail_connection_id,
+            EmailTransaction.received_at,
+            EmailTransaction.sender,
+            EmailTransaction.subject,
+            EmailTransaction.amount,
+            EmailTransaction.merchant,
+            EmailTransaction.account_number,
+            EmailTransaction.transaction_type,
+            EmailTransaction.status,
+            EmailTransaction.category_id,
+            Category.name,
+            EmailTransaction.linked_transaction_id,
+            EmailTransaction.created_at,
+            EmailTransaction.updated_at,
+        )
+        .join(GmailConnection, EmailTransaction.gmail_connection_id == GmailConnection.id)
+        .join(Category, EmailTransaction.category_id == Category.id, isouter=True)
+        .where(GmailConnection.user_id == user_id, *window(EmailTransaction.updated_at))
+        .order_by(EmailTransaction.received_at, EmailTransaction.id)
+    )
+    categories = select(
+        Category.id,
+        Category.name,
+        Category.grp,
+        Category.is_envelope,
+        Category.created_at,
+        Category.updated_at,
+    ).where(Category.user_id == user_id, *window(Category.updated_at))
+    accounts = select(
+        Account.id,
+        Account.name,
+        Account.type,
+        Account.currency,
+        Account.is_active,
+        Account.created_at,
+        Account.updated_at,
+    ).where(Account.user_id == user_id, *window(Account.updated_at))
+    return {
+        "transactions": transactions,
+        "email_transactions": email_transactions,
+        "categories": categories,
+        "accounts": accounts,
+    }
+
+
+def _to_arrow_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        # Timestamps are stored as naive UTC
+        return value.replace(tzinfo=timezone.utc)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _write_table(
+    rows: Iterable[Any], schema: Any, path: str, fmt: SnapshotFormat, batch_size: int
+) -> int:
+    """Write rows to a columnar file in batches of batch_size; return the row count."""
+    names = schema.names
+    if fmt == SnapshotFormat.parquet:
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(
+            path, schema, options=pa.ipc.IpcWriteOptions(compression="zstd")
+        )
+
+    total = 0
+    columns: list[list[Any]] = [[] for _ in names]
+
+    def flush() -> None:
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(col, type=schema.field(i).type) for i, col in enumerate(columns)],
+            schema=schema,
+        )
+        writer.write_batch(batch)
+        for col in columns:
+            col.clear()
+
+    try:
+        for row in rows:
+            for i, value in enumerate(row):
+                columns[i].append(_to_arrow_value(value))
+            total += 1
+            if total % batch_size == 0:
+                flush()
+        if columns[0] or total == 0:
+            flush()
+    finally:
+        writer.close()
+    return total
+
+
+def snapshot_file_path(snapshot: AnalyticsSnapshot, table: str) -> str:
+    return os.path.join(snapshot.path, f"{table}.{FILE_EXTENSIONS[snapshot.format]}")
+
+
+def _next_since(session: Session, user_id: uuid.UUID) -> datetime | None:
+    """Start of the next incremental window, or None when a full snapshot is due.
+
+    A full snapshot is due for a user without one, and once
+    ANALYTICS_SNAPSHOT_MAX_INCREMENTALS have piled up after the last full
+    one, so the chain readers have to merge stays bounded.
+    """
+    last_full = crud.get_latest_analytics_snapshot(
+        session=session, user_id=user_id, incremental=False
+    )
+    if last_full is None:
+        return None
+    pending = crud.count_analytics_snapshots_since(
+        session=session, user_id=user_id, watermark=last_full.watermark
+    )
+    if pending >= settings.ANALYTICS_SNAPSHOT_MAX_INCREMENTALS:
+        return None
+    previous = crud.get_latest_analytics_snapshot(session=session, user_id=user_id)
+    return previous.watermark if previous else None
+
+
+def _prune_before(session: Session, snapshot: AnalyticsSnapshot) -> None:
+    """Drop the snapshots a full snapshot supersedes, rows first, then files."""
+    paths = crud.delete_analytics_snapshots_before(
+        session=session, user_id=snapshot.user_id, watermark=snapshot.watermark
+    )
+    session.commit()
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def create_user_snapshot(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    fmt: SnapshotFormat = SnapshotFormat.parquet,
+    incremental: bool = True,
+    batch_size: int | None = None,
+) -> AnalyticsSnapshot:
+    """Write a columnar snapshot of a user's ledger data.
+
+    In incremental mode only rows whose updated_at is newer than the previous
+    snapshot's watermark are written, so the full dataset is the union of all
+    snapshot directories since the last full one (readers keep the latest
+    row per id). Deleted rows are not tracked; a full snapshot compacts the
+    chain and prunes the snapshots before it.
+
+    updated_at is stamped when a row is written, not when it commits, so the
+    watermark trails the database clock by ANALYTICS_SNAPSHOT_WATERMARK_LAG_SECONDS:
+    a row stamped before the watermark has had that long to commit and be
+    read, later ones fall into the next window.
+    """
+    if pa is None:
+        raise SnapshotUnavailableError(
+            "pyarrow is not installed, install the 'analytics' extra to enable snapshots"
+        )
+
+    batch_size = batch_size or settings.ANALYTICS_SNAPSHOT_BATCH_SIZE
+    since = _next_since(session, user_id) if incremental else None
+    # Naive UTC, like the timestamp columns it is compared with
+    db_now = session.exec(select(func.timezone("UTC", func.clock_timestamp()))).one()
+    watermark = db_now - timedelta(seconds=settings.ANALYTICS_SNAPSHOT_WATERMARK_LAG_SECONDS)
+    if since is not None:
+        # Back-to-back snapshots within the lag get an empty window
+        watermark = max(watermark, since)
+
+    snapshot = AnalyticsSnapshot(
+        user_id=user_id,
+        format=fmt,
+        is_incremental=since is not None,
+        since=since,
+        watermark=watermark,
+        path="",
+    )
+    snapshot.path = os.path.join(
+        settings.ANALYTICS_SNAPSHOT_DIR, str(user_id), str(snapshot.id)
+    )
+    os.makedirs(snapshot.path, exist_ok=True)
+
+    schemas = _schemas()
+    statements = _statements(user_id, since, watermark)
+    for table in SNAPSHOT_TABLES:
+        rows = session.exec(statements[table].execution_options(yield_per=batch_size))
+        count = _write_table(
+            rows, schemas[table], snapshot_file_path(snapshot, table), fmt, batch_size
+        )
+        setattr(snapshot, f"{table}_count", count)
+
+    session.add(snapshot)
+    session.commit()
+    session.refresh(snapshot)
+    if since is None:
+        _prune_before(session, snapshot)
+    return snapshot
+
+
+def snapshot_all_users(fmt: SnapshotFormat = SnapshotFormat.parquet) -> int:
+    """Take an incremental snapshot for every active user; return how many were written."""
+    from app.core.db import engine
+
+    written = 0
+    with Session(engine) as session:
+        user_ids = session.exec(select(User.id).where(User.is_active)).all()
+        for user_id in user_ids:
+            try:
+                create_user_snapshot(
+                    session=session, user_id=user_id, fmt=fmt, incremental=True
+                )
+                written += 1
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to snapshot user {user_id}: {e}")
+    return written
@@ -0,0 +1,367 @@
+import csv
+import re
+import uuid
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from itertools import islice
+from typing import Any
+
+from sqlmodel import Session, func, select
+
+from app import crud
+from app.models import (
+    Account,
+    Category,
+    StatementFormat,
+    Transaction,
+    TransactionImportError,
+    TransactionImportResult,
+    TxnType,
+)
+from app.services.categorization_service import load_category_index
+from app.utils import normalize_text
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+MERCHANT_MAX_LENGTH = 255
+NOTE_MAX_LENGTH = 500
+
+# Tried in order when no date_format is given; day-first like local bank exports
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d", "%Y%m%d")
+OFX_DATE_FORMAT = "%Y%m%d"
+
+# Statement header (normalized) -> Transaction field
+COLUMN_ALIASES = {
+    "txn_date": (
+        "date",
+        "txn date",
+        "transaction date",
+        "posting date",
+        "posted date",
+        "value date",
+        "ngay giao dich",
+        "ngay",
+    ),
+    "amount": ("amount", "so tien"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out", "ghi no"),
+    "credit": ("credit", "deposit", "deposits", "money in", "ghi co"),
+    "type": ("type", "transaction type", "loai"),
+    "merchant": ("merchant", "payee", "description", "details", "name", "noi dung"),
+    "note": ("note", "notes", "memo", "ghi chu"),
+    "currency": ("currency", "tien te"),
+    "category": ("category", "danh muc"),
+}
+INCOME_TYPES = {"in", "income", "credit", "cr", "deposit"}
+EXPENSE_TYPES = {"out", "expense", "debit", "dr", "withdrawal"}
+
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+RawRecord = tuple[int, dict[str, str]]
+DedupKey = tuple[date, float, TxnType, str]
+
+
+def resolve_columns(
+    header: list[str], columns: dict[str, str] | None = None
+) -> dict[str, int]:
+    """Map Transaction fields to header positions.
+
+    Explicit columns (field -> header text) win over the built-in aliases;
+    headers are compared accent- and case-insensitively.
+    """
+    positions = {normalize_text(name): index for index, name in enumerate(header)}
+    resolved: dict[str, int] = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        if columns and field in columns:
+            name = normalize_text(columns[field])
+            if name not in positions:
+                raise ValueError(f"Column not found for {field}: {columns[field]}")
+            resolved[field] = positions[name]
+            continue
+        for alias in aliases:
+            if alias in positions:
+                resolved[field] = positions[alias]
+                break
+    unknown = set(columns or {}) - COLUMN_ALIASES.keys()
+    if unknown:
+        raise ValueError(f"Unknown import fields: {', '.join(sorted(unknown))}")
+    if "txn_date" not in resolved:
+        raise ValueError("No date column found")
+    if "amount" not in resolved and not {"debit", "credit"} & resolved.keys():
+        raise ValueError("No amount, debit or credit column found")
+    return resolved
+
+
+def iter_csv_records(
+    lines: Iterable[str], columns: dict[str, str] | None = None
+) -> Iterator[RawRecord]:
+    """Yield (line number, field -> raw text) for each data row of a CSV statement.
+
+    A row the csv module cannot parse stops the import with a ValueError
+    naming its line.
+    """
+    reader = csv.reader(lines)
+    try:
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("The file is empty")
+        positions = resolve_columns(header, columns)
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            yield reader.line_num, {
+                field: row[index].strip()
+                for field, index in positions.items()
+                if index < len(row)
+            }
+    except csv.Error as e:
+        raise ValueError(f"Malformed CSV on row {reader.line_num}: {e}") from e
+
+
+def iter_ofx_records(lines: Iterable[str]) -> Iterator[RawRecord]:
+    """Yield (statement entry number, field -> raw text) for each <STMTTRN>.
+
+    Works for both SGML (unclosed tags) and XML OFX since only the opening
+    tag and the text up to the next tag are read.
+    """
+    record: dict[str, str] | None = None
+    index = 0
+    for line in lines:
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            # SGML entries may never be closed: the next entry or the end
+            # of the list closes them
+            if tag in ("STMTTRN", "BANKTRANLIST") and record is not None:
+                yield index, record
+                record = None
+            if tag == "STMTTRN" and not closing:
+                index += 1
+                record = {}
+            elif record is not None and not closing and value.strip():
+                record[tag] = value.strip()
+    if record is not None:
+        yield index, record
+
+
+def _ofx_to_raw(record: dict[str, str]) -> dict[str, str]:
+    return {
+        "txn_date": record.get("DTPOSTED", "")[:8],
+        "amount": record.get("TRNAMT", ""),
+        "merchant": record.get("NAME") or record.get("PAYEE", ""),
+        "note": record.get("MEMO", ""),
+    }
+
+
+def parse_amount(text: str) -> float:
+    """Parse "1,234.56", "1.234.567", "(50.00)", "-12,5" and similar."""
+    cleaned = re.sub(r"[^\d,.\-()]", "", text)
+    negative = cleaned.startswith("-") or cleaned.startswith("(")
+    cleaned = cleaned.strip("-()")
+    if not cleaned:
+        raise ValueError(f"Invalid amount: {text!r}")
+    if "," in cleaned and "." in cleaned:
+        # The right-most separator is the decimal one
+        thousands = "," if cleaned.rfind(".") > cleaned.rfind(",") else "."
+        cleaned = cleaned.replace(thousands, "").replace(",", ".")
+    else:
+        separator = "," if "," in cleaned else "."
+        parts = cleaned.split(separator)
+        # Repeated, or followed by exactly three digits: a thousands separator
+        if len(parts) > 2 or (len(parts) == 2 and len(parts[1]) == 3):
+            cleaned = "".join(parts)
+        else:
+            cleaned = cleaned.replace(separator, ".")
+    try:
+        value = float(cleaned)
+    except ValueError:
+        raise ValueError(f"Invalid amount: {text!r}")
+    return -value if negative else value
+
+
+def parse_date(text: str, date_format: str | None = None) -> date:
+    for fmt in (date_format,) if date_format else DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {text!r}")
+
+
+class RowBuilder:
+    """Turn raw statement fields into insertable Transaction dicts for one account."""
+
+    def __init__(
+        self,
+        *,
+        session: Session,
+        user_id: uuid.UUID,
+        account: Account,
+        date_format: str | None,
+    ) -> None:
+        self.account = account
+        self.date_format = date_format
+        self.category_ids = {
+            normalize_text(name): category_id
+            for category_id, name in session.exec(
+                select(Category.id, Category.name).where(Category.user_id == user_id)
+            )
+        }
+        self.category_index = load_category_index(session=session, user_id=user_id)
+
+    def _amount_and_type(self, raw: dict[str, str]) -> tuple[float, TxnType]:
+        if raw.get("amount"):
+            amount = parse_amount(raw["amount"])
+            declared = raw.get("type", "").lower()
+            if declared in INCOME_TYPES:
+                return abs(amount), TxnType.income
+            if declared in EXPENSE_TYPES:
+                return abs(amount), TxnType.expense
+            return abs(amount), TxnType.income if amount > 0 else TxnType.expense
+        if raw.get("debit"):
+            return abs(parse_amount(raw["debit"])), TxnType.expense
+        if raw.get("credit"):
+            return abs(parse_amount(raw["credit"])), TxnType.income
+        raise ValueError("Missing amount")
+
+    def build(self, raw: dict[str, str]) -> dict[str, Any]:
+        if not raw.get("txn_date"):
+            raise ValueError("Missing date")
+        txn_date = parse_date(raw["txn_date"], self.date_format)
+        amount, txn_type = self._amount_and_type(raw)
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero")
+        merchant = raw.get("merchant") or None
+        note = raw.get("note") or None
+        category_name = raw.get("category")
+        if category_name:
+            category_id = self.category_ids.get(normalize_text(category_name))
+            if category_id is None:
+                raise ValueError(f"Unknown category: {category_name!r}")
+        else:
+            category_id = self.category_index.suggest(merchant, note)
+        currency = (raw.get("currency") or self.account.currency).upper()
+        if len(currency) > 10:
+            raise ValueError(f"Invalid currency: {currency!r}")
+        return {
+            "account_id": self.account.id,
+            "txn_date": txn_date,
+            "type": txn_type,
+            "amount": amount,
+            "currency": currency,
+            "merchant": merchant[:MERCHANT_MAX_LENGTH] if merchant else None,
+            "note": note[:NOTE_MAX_LENGTH] if note else None,
+            "category_id": category_id,
+        }
+
+
+def dedup_key(
+    txn_date: date, amount: float, txn_type: TxnType, merchant: str | None
+) -> DedupKey:
+    return txn_date, round(amount, 2), txn_type, " ".join((merchant or "").lower().split())
+
+
+def _existing_counts(
+    *, session: Session, user_id: uuid.UUID, account_id: uuid.UUID, start: date, end: date
+) -> Counter[DedupKey]:
+    statement = (
+        select(
+            Transaction.txn_date,
+            Transaction.amount,
+            Transaction.type,
+            Transaction.merchant,
+            func.count(),
+        )
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.account_id == account_id,
+            Transaction.txn_date >= start,
+            Transaction.txn_date <= end,
+        )
+        .group_by(
+            Transaction.txn_date,
+            Transaction.amount,
+            Transaction.type,
+            Transaction.merchant,
+        )
+    )
+    counts: Counter[DedupKey] = Counter()
+    for txn_date, amount, txn_type, merchant, count in session.exec(statement):
+        counts[dedup_key(txn_date, amount, txn_type, merchant)] += count
+    return counts
+
+
+def import_statement(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    account: Account,
+    lines: Iterable[str],
+    fmt: StatementFormat,
+    date_format: str | None = None,
+    columns: dict[str, str] | None = None,
+    dry_run: bool = False,
+) -> TransactionImportResult:
+    """Import a CSV or OFX statement into one account.
+
+    The file is read lazily and handled IMPORT_CHUNK_SIZE rows at a time:
+    rows are validated, checked against existing transactions of the same
+    account and dates with one grouped query, and inserted with one
+    executemany INSERT. Duplicates are counted per identical
+    (date, amount, type, merchant): re-importing a statement skips every row,
+    while two identical purchases on one day in a new file both import.
+    Everything commits once at the end; invalid rows are reported and
+    skipped.
+    """
+    if fmt == StatementFormat.ofx:
+        records: Iterator[RawRecord] = (
+            (index, _ofx_to_raw(record)) for index, record in iter_ofx_records(lines)
+        )
+        date_format = date_format or OFX_DATE_FORMAT
+    else:
+        records = iter_csv_records(lines, columns)
+    builder = RowBuilder(
+        session=session, user_id=user_id, account=account, date_format=date_format
+    )
+
+    result = TransactionImportResult(dry_run=dry_run)
+    seen: Counter[DedupKey] = Counter()
+    inserted: Counter[DedupKey] = Counter()
+    while chunk := list(islice(records, IMPORT_CHUNK_SIZE)):
+        rows: list[tuple[DedupKey, dict[str, Any]]] = []
+        for row_number, raw in chunk:
+            try:
+                row = builder.build(raw)
+            except ValueError as e:
+                result.failed += 1
+                if len(result.errors) < MAX_REPORTED_ERRORS:
+                    result.errors.append(TransactionImportError(row=row_number, error=str(e)))
+                continue
+            key = dedup_key(row["txn_date"], row["amount"], row["type"], row["merchant"])
+            rows.append((key, row))
+        if not rows:
+            continue
+
+        existing = _existing_counts(
+            session=session,
+            user_id=user_id,
+            account_id=account.id,
+            start=min(row["txn_date"] for _, row in rows),
+            end=max(row["txn_date"] for _, row in rows),
+        )
+        new_rows = []
+        for key, row in rows:
+            # The n-th occurrence in the file pairs with the n-th stored row
+            if seen[key] < existing[key] - inserted[key]:
+                result.duplicates += 1
+            else:
+                new_rows.append(row)
+            seen[key] += 1
+        if not dry_run:
+            crud.insert_transaction_rows(session=session, user_id=user_id, rows=new_rows)
+            for row in new_rows:
+                inserted[dedup_key(row["txn_date"], row["amount"], row["type"], row["merchant"])] += 1
+        result.imported += len(new_rows)
+
+    if not dry_run:
+        session.commit()
+    return result
@@ -0,0 +1,59 @@
+import uuid
+from datetime import date
+
+from sqlmodel import Session
+
+from app import crud
+from app.models import CategoryGrowthReport, CategoryGrowthSeries, TxnType
+from app.services.budget_service import month_starts
+
+GROWTH_DIGITS = 4
+
+
+def growth(current: float, previous: float | None) -> float | None:
+    """Relative change from previous to current; None without a base to compare."""
+    if not previous:
+        return None
+    return round((current - previous) / previous, GROWTH_DIGITS)
+
+
+def compute_growth_report(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    start_month: date,
+    end_month: date,
+    txn_type: TxnType = TxnType.expense,
+) -> CategoryGrowthReport:
+    """Month-over-month, 3-month average and year-over-year series per category.
+
+    The windowed query returns one row per category and month of the
+    range, already dense and ordered, so this only folds rows into lists.
+    """
+    series: dict[uuid.UUID | None, CategoryGrowthSeries] = {}
+    for category_id, name, _, total, previous, average, year_ago in crud.get_category_trend_rows(
+        session=session,
+        user_id=user_id,
+        start_month=start_month,
+        end_month=end_month,
+        txn_type=txn_type,
+    ):
+        item = series.get(category_id)
+        if item is None:
+            item = series[category_id] = CategoryGrowthSeries(
+                category_id=category_id,
+                category_name=name,
+                totals=[],
+                mom_growth=[],
+                rolling_average=[],
+                yoy_growth=[],
+            )
+        item.totals.append(total)
+        item.mom_growth.append(growth(total, previous))
+        item.rolling_average.append(float(average))
+        item.yoy_growth.append(growth(total, year_ago))
+    # Categories only active in the year before the range stay, showing -100% YoY
+    ranked = sorted(series.values(), key=lambda item: sum(item.totals), reverse=True)
+    return CategoryGrowthReport(
+        type=txn_type, months=month_starts(start_month, end_month), series=ranked
+    )
@@ -1,8 +1,11 @@
 import uuid
+from datetime import date
+
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
-from app.models import Account, User
+from app import crud
+from app.models import Account, TransactionCreate, TransactionUpdate, TxnType, User
 
 
 def test_read_accounts_pagination(
@@ -81,3 +84,56 @@ def test_read_accounts_empty(
     data = response.json()
     assert data["data"] == []
     assert data["count"] == 0
+
+
+def test_account_balances_and_history(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test balances follow transaction writes and history pages carry the running balance."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    wallet = Account(name="Balance Wallet", user_id=user.id)
+    empty = Account(name="Balance Empty", user_id=user.id)
+    db.add_all([wallet, empty])
+    db.commit()
+    transactions = [
+        crud.create_transaction(
+            session=db,
+            transaction_in=TransactionCreate(
+                txn_date=txn_date, type=txn_type, amount=amount, account_id=wallet.id
+            ),
+            user_id=user.id,
+        )
+        for txn_date, txn_type, amount in [
+            (date(2024, 3, 1), TxnType.income, 100000),
+            (date(2024, 3, 5), TxnType.expense, 30000),
+            (date(2024, 3, 9), TxnType.expense, 20000),
+        ]
+    ]
+    crud.update_transaction(
+        session=db,
+        db_transaction=transactions[2],
+        transaction_in=TransactionUpdate(amount=25000),
+    )
+
+    response = client.get("/api/v1/accounts/balances", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    balances = {b["name"]: b for b in response.json()["data"]}
+    assert balances["Balance Wallet"]["balance"] == 45000
+    assert balances["Balance Wallet"]["txn_count"] == 3
+    assert balances["Balance Empty"]["balance"] == 0
+
+    url = f"/api/v1/accounts/{wallet.id}/balance-history"
+    first = client.get(url, params={"limit": 2}, headers=normal_user_token_headers).json()
+    assert [e["running_balance"] for e in first["data"]] == [100000, 70000]
+    second = client.get(
+        url,
+        params={"limit": 2, "cursor": first["next_cursor"]},
+        headers=normal_user_token_headers,
+    ).json()
+    assert [e["running_balance"] for e in second["data"]] == [45000]
+    assert second["next_cursor"] is None
+
+    response = client.get(
+        url, params={"start_date": "2024-03-05"}, headers=normal_user_token_headers
+    )
+    assert response.json()["opening_balance"] == 100000
@@ -0,0 +1,186 @@
+import os
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.config import settings
+from app.models import (
+    Account,
+    Category,
+    CategoryGroup,
+    TransactionCreate,
+    TransactionUpdate,
+    TxnType,
+    User,
+)
+from app.services import snapshot_service
+from app.services.analytics_service import analytics_cache
+
+
+def test_analytics_queries_use_cached_columns(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test trends, rolling totals and merchants come from the cache until a write."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Analytics Account", user_id=user.id)
+    food = Category(name="Analytics Food", grp=CategoryGroup.needs, user_id=user.id)
+    db.add_all([account, food])
+    db.commit()
+    for txn_date, txn_type, amount, category, merchant in [
+        (date(2024, 4, 30), TxnType.expense, 10000, food, "Grab Food"),
+        (date(2024, 5, 1), TxnType.expense, 20000, food, "GRAB  food"),
+        (date(2024, 5, 3), TxnType.expense, 6000, None, "Coffee"),
+        (date(2024, 5, 3), TxnType.income, 900000, None, None),
+    ]:
+        crud.create_transaction(
+            session=db,
+            transaction_in=TransactionCreate(
+                txn_date=txn_date,
+                type=txn_type,
+                amount=amount,
+                account_id=account.id,
+                category_id=category.id if category else None,
+                merchant=merchant,
+            ),
+            user_id=user.id,
+        )
+
+    params = {"start_date": "2024-04-01", "end_date": "2024-05-31"}
+    response = client.get(
+        "/api/v1/analytics/category-trends", headers=normal_user_token_headers, params=params
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["months"] == ["2024-04-01", "2024-05-01"]
+    assert [(s["category_name"], s["totals"]) for s in content["series"]] == [
+        ("Analytics Food", [10000, 20000]),
+        (None, [0, 6000]),
+    ]
+
+    hits = analytics_cache.hits
+    response = client.get(
+        "/api/v1/analytics/top-merchants", headers=normal_user_token_headers, params=params
+    )
+    assert analytics_cache.hits == hits + 1
+    content = response.json()
+    assert content["count"] == 2
+    assert content["data"][0] == {"merchant": "Grab Food", "total": 30000, "count": 2}
+
+    crud.create_transaction(
+        session=db,
+        transaction_in=TransactionCreate(
+            txn_date=date(2024, 5, 2),
+            type=TxnType.expense,
+            amount=3000,
+            account_id=account.id,
+        ),
+        user_id=user.id,
+    )
+    response = client.get(
+        "/api/v1/analytics/rolling",
+        headers=normal_user_token_headers,
+        params={"start_date": "2024-05-01", "end_date": "2024-05-03", "window": 2},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["totals"] == [20000, 3000, 6000]
+    assert content["rolling_average"] == [15000, 11500, 4500]
+
+    response = client.get(
+        "/api/v1/analytics/rolling",
+        headers=normal_user_token_headers,
+        params={"start_date": "2024-05-03", "end_date": "2024-05-01"},
+    )
+    assert response.status_code == 400
+
+
+def test_snapshot_incremental_round_trip(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test an incremental snapshot holds only the rows edited since the full one."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(settings, "ANALYTICS_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "ANALYTICS_SNAPSHOT_WATERMARK_LAG_SECONDS", 0)
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Snapshot Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    transactions = [
+        crud.create_transaction(
+            session=db,
+            transaction_in=TransactionCreate(
+                txn_date=date(2024, 5, 1),
+                type=TxnType.expense,
+                amount=amount,
+                account_id=account.id,
+            ),
+            user_id=user.id,
+        )
+        for amount in (1000, 2000)
+    ]
+
+    response = client.post(
+        "/api/v1/analytics/snapshots",
+        headers=normal_user_token_headers,
+        params={"incremental": False},
+    )
+    assert response.status_code == 200
+    full = response.json()
+    assert full["is_incremental"] is False
+    assert full["transactions_count"] == 2
+
+    edited = transactions[1]
+    crud.update_transaction(
+        session=db,
+        db_transaction=edited,
+        transaction_in=TransactionUpdate(amount=2500),
+    )
+    response = client.post(
+        "/api/v1/analytics/snapshots", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    incremental = response.json()
+    assert incremental["is_incremental"] is True
+    assert incremental["transactions_count"] == 1
+    table = pq.read_table(
+        tmp_path / str(user.id) / incremental["id"] / "transactions.parquet"
+    )
+    assert table.column("id").to_pylist() == [str(edited.id)]
+    assert table.column("amount").to_pylist() == [2500]
+
+    # A new full snapshot compacts the chain and prunes the older directories
+    response = client.post(
+        "/api/v1/analytics/snapshots",
+        headers=normal_user_token_headers,
+        params={"incremental": False},
+    )
+    assert response.status_code == 200
+    latest = response.json()
+    assert latest["transactions_count"] == 2
+    assert os.listdir(tmp_path / str(user.id)) == [latest["id"]]
+    response = client.get(
+        "/api/v1/analytics/snapshots", headers=normal_user_token_headers
+    )
+    assert [s["id"] for s in response.json()["data"]] == [latest["id"]]
+
+
+def test_snapshot_without_pyarrow(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test snapshots answer 501 when the analytics extra is not installed."""
+    monkeypatch.setattr(snapshot_service, "pa", None)
+    response = client.post(
+        "/api/v1/analytics/snapshots", headers=normal_user_token_headers
+    )
+    assert response.status_code == 501
+    assert "pyarrow" in response.json()["detail"]
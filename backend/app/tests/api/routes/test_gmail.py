@@ -0,0 +1,150 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import (
+    Account,
+    Category,
+    CategoryGroup,
+    EmailTransaction,
+    EmailTransactionStatus,
+    Transaction,
+    TxnType,
+    User,
+)
+from app.tests.utils.gmail import create_email_transaction, create_gmail_connection
+
+
+def test_create_transactions_from_emails_bulk(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test bulk conversion links valid emails and reports per-item errors."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Timo", currency="USD", user_id=user.id)
+    refunds = Category(name="Refunds", grp=CategoryGroup.income, user_id=user.id)
+    db.add_all([account, refunds])
+    db.commit()
+    connection = create_gmail_connection(db, user.id)
+    first = create_email_transaction(db, connection, amount=50000)
+    second = create_email_transaction(db, connection, amount=75000)
+    no_amount = create_email_transaction(db, connection, amount=None)
+    foreign_category = create_email_transaction(db, connection, amount=1000)
+
+    items = [
+        {"email_transaction_id": str(first.id), "account_id": str(account.id), "type": TxnType.expense.value},
+        {"email_transaction_id": str(second.id), "account_id": str(account.id), "type": TxnType.income.value, "note": "refund", "category_id": str(refunds.id)},
+        {"email_transaction_id": str(no_amount.id), "account_id": str(account.id), "type": TxnType.expense.value},
+        {"email_transaction_id": str(uuid.uuid4()), "account_id": str(account.id), "type": TxnType.expense.value},
+        {"email_transaction_id": str(foreign_category.id), "account_id": str(account.id), "type": TxnType.expense.value, "category_id": str(uuid.uuid4())},
+    ]
+    response = client.post(
+        "/api/v1/gmail/email-transactions/create-transactions",
+        headers=normal_user_token_headers,
+        json={"items": items},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 5
+    assert content["created_count"] == 2
+    assert content["data"][0]["transaction_id"] is not None
+    assert content["data"][1]["transaction_id"] is not None
+    assert content["data"][2]["error"] == "Email transaction has no amount"
+    assert content["data"][3]["error"] == "Email transaction not found"
+    assert content["data"][4]["error"] == "Category not found"
+
+    db.expire_all()
+    linked = db.get(EmailTransaction, first.id)
+    assert str(linked.linked_transaction_id) == content["data"][0]["transaction_id"]
+    assert linked.status == EmailTransactionStatus.processed
+    refund = db.get(Transaction, uuid.UUID(content["data"][1]["transaction_id"]))
+    assert refund.type == TxnType.income
+    assert refund.amount == 75000
+    assert refund.note == "refund"
+    assert refund.category_id == refunds.id
+    # Transactions take the currency of the account they are filed under
+    assert refund.currency == "USD"
+
+    # Converting the same email again is rejected
+    response = client.post(
+        "/api/v1/gmail/email-transactions/create-transactions",
+        headers=normal_user_token_headers,
+        json={"items": items[:1]},
+    )
+    assert response.json()["data"][0]["error"] == (
+        "Email transaction is already linked to a transaction"
+    )
+
+
+def test_bulk_update_email_transactions_by_filter_and_ids(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test bulk update selects rows by filter or ids and only touches the user's rows."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    connection = create_gmail_connection(db, user.id)
+    grab_1 = create_email_transaction(db, connection, merchant="GRAB*Food")
+    grab_2 = create_email_transaction(db, connection, merchant="grab bike")
+    shopee = create_email_transaction(db, connection, merchant="Shopee")
+
+    response = client.patch(
+        "/api/v1/gmail/email-transactions/bulk",
+        headers=normal_user_token_headers,
+        json={
+            "filter": {"merchant": "grab", "status": "pending"},
+            "update": {"status": "ignored"},
+        },
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 2
+    assert set(content["ids"]) == {str(grab_1.id), str(grab_2.id)}
+
+    # LIKE wildcards in a filter are matched literally, not as "any row"
+    response = client.patch(
+        "/api/v1/gmail/email-transactions/bulk",
+        headers=normal_user_token_headers,
+        json={"filter": {"merchant": "%"}, "update": {"status": "ignored"}},
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+    response = client.patch(
+        "/api/v1/gmail/email-transactions/bulk",
+        headers=normal_user_token_headers,
+        json={"ids": [str(shopee.id), str(uuid.uuid4())], "update": {"merchant": "Shopee VN"}},
+    )
+    assert response.status_code == 200
+    assert response.json()["ids"] == [str(shopee.id)]
+
+    db.expire_all()
+    assert db.get(EmailTransaction, grab_1.id).status == EmailTransactionStatus.ignored
+    assert db.get(EmailTransaction, shopee.id).status == EmailTransactionStatus.pending
+    assert db.get(EmailTransaction, shopee.id).merchant == "Shopee VN"
+
+    # Exactly one selector is required
+    response = client.patch(
+        "/api/v1/gmail/email-transactions/bulk",
+        headers=normal_user_token_headers,
+        json={"update": {"status": "ignored"}},
+    )
+    assert response.status_code == 422
+
+    # An empty filter would select every row the user has
+    for empty in ({}, {"merchant": ""}):
+        response = client.patch(
+            "/api/v1/gmail/email-transactions/bulk",
+            headers=normal_user_token_headers,
+            json={"filter": empty, "update": {"status": "ignored"}},
+        )
+        assert response.status_code == 422
+
+    # A link can only go to one email
+    response = client.patch(
+        "/api/v1/gmail/email-transactions/bulk",
+        headers=normal_user_token_headers,
+        json={
+            "ids": [str(grab_1.id), str(shopee.id)],
+            "update": {"linked_transaction_id": str(uuid.uuid4())},
+        },
+    )
+    assert response.status_code == 422
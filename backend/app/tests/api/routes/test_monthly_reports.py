@@ -0,0 +1,352 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete, select
+
+from app import crud
+from app.models import (
+    Account,
+    AllocationRuleCreate,
+    BudgetGroupTotal,
+    Category,
+    CategoryGroup,
+    FxRate,
+    TransactionCreate,
+    TxnType,
+    User,
+)
+from app.services.report_cache import report_cache
+
+
+def _create_month_of_transactions(db: Session) -> None:
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    wallet = Account(name="Wallet", user_id=user.id)
+    bank = Account(name="Bank", user_id=user.id)
+    food = Category(name="Food", grp=CategoryGroup.needs, user_id=user.id)
+    db.add_all([wallet, bank, food])
+    db.commit()
+    for txn_date, txn_type, amount, account, category in [
+        (date(2024, 5, 2), TxnType.expense, 30000, wallet, food),
+        (date(2024, 5, 9), TxnType.expense, 20000, bank, food),
+        (date(2024, 5, 10), TxnType.expense, 5000, bank, None),
+        (date(2024, 5, 25), TxnType.income, 1000000, bank, None),
+        (date(2024, 6, 1), TxnType.expense, 99999, wallet, food),
+    ]:
+        crud.create_transaction(
+            session=db,
+            transaction_in=TransactionCreate(
+                txn_date=txn_date,
+                type=txn_type,
+                amount=amount,
+                account_id=account.id,
+                category_id=category.id if category else None,
+            ),
+            user_id=user.id,
+        )
+
+
+def test_monthly_summary_breakdowns(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test the summary totals and breakdowns only cover the requested month."""
+    _create_month_of_transactions(db)
+
+    response = client.get(
+        "/api/v1/monthly-reports/summary/2024/5", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["total_expenses"] == 55000
+    assert content["expense_count"] == 3
+    assert content["net_amount"] == 945000
+    assert content["category_breakdown"] == {"Food": 50000}
+    assert content["account_breakdown"] == {"Wallet": -30000, "Bank": 975000}
+
+
+def test_monthly_reports_range(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test the range report totals every month and only embeds transactions on request."""
+    _create_month_of_transactions(db)
+
+    params = {"start_year": 2024, "start_month": 4, "end_year": 2024, "end_month": 6}
+    response = client.get(
+        "/api/v1/monthly-reports/range", headers=normal_user_token_headers, params=params
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 3
+    april, may, june = content["data"]
+    assert april["expense_count"] == 0
+    assert may["total_expenses"] == 55000
+    assert may["net_amount"] == 945000
+    assert june["total_expenses"] == 99999
+    assert may["transactions"] == []
+
+    response = client.get(
+        "/api/v1/monthly-reports/range",
+        headers=normal_user_token_headers,
+        params={**params, "include_transactions": True},
+    )
+    may = response.json()["data"][1]
+    assert [t["txn_date"] for t in may["transactions"]] == [
+        "2024-05-02",
+        "2024-05-09",
+        "2024-05-10",
+        "2024-05-25",
+    ]
+
+
+def test_monthly_summary_cache_invalidated_by_writes(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test repeated summaries hit the cache until a write bumps the month version."""
+    _create_month_of_transactions(db)
+    url = "/api/v1/monthly-reports/summary/2024/5"
+
+    first = client.get(url, headers=normal_user_token_headers).json()
+    hits = report_cache.hits
+    assert client.get(url, headers=normal_user_token_headers).json() == first
+    assert report_cache.hits == hits + 1
+
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = db.exec(select(Account).where(Account.user_id == user.id)).first()
+    crud.create_transaction(
+        session=db,
+        transaction_in=TransactionCreate(
+            txn_date=date(2024, 5, 31),
+            type=TxnType.expense,
+            amount=1000,
+            account_id=account.id,
+        ),
+        user_id=user.id,
+    )
+    updated = client.get(url, headers=normal_user_token_headers).json()
+    assert updated["total_expenses"] == first["total_expenses"] + 1000
+
+
+def test_budget_report(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test allocations follow income and the envelope carries over between months."""
+    _create_month_of_transactions(db)
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    crud.create_allocation_rule(
+        session=db,
+        allocation_rule_in=AllocationRuleCreate(grp=CategoryGroup.needs, percent=50),
+        user_id=user.id,
+    )
+
+    response = client.get(
+        "/api/v1/monthly-reports/budget",
+        headers=normal_user_token_headers,
+        params={"start_year": 2024, "start_month": 5, "end_year": 2024, "end_month": 6},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["months"] == ["2024-05-01", "2024-06-01"]
+    assert content["income"] == [1000000, 0]
+    assert content["unassigned_spent"] == [5000, 0]
+    needs = next(g for g in content["groups"] if g["grp"] == CategoryGroup.needs.value)
+    assert needs["allocated"] == [500000, 0]
+    assert needs["spent"] == [50000, 99999]
+    assert needs["remaining"] == [450000, -99999]
+    assert needs["carryover"] == [450000, 350001]
+
+
+def test_budget_totals_follow_account_delete(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test deleting an account takes its spending out of the group totals."""
+    _create_month_of_transactions(db)
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    wallet = db.exec(
+        select(Account).where(Account.user_id == user.id, Account.name == "Wallet")
+    ).one()
+
+    def needs_totals() -> dict[date, float]:
+        db.expire_all()
+        return dict(
+            db.exec(
+                select(BudgetGroupTotal.month, BudgetGroupTotal.amount).where(
+                    BudgetGroupTotal.user_id == user.id,
+                    BudgetGroupTotal.grp == CategoryGroup.needs,
+                )
+            ).all()
+        )
+
+    assert needs_totals() == {date(2024, 5, 1): 50000, date(2024, 6, 1): 99999}
+    response = client.delete(
+        f"/api/v1/accounts/{wallet.id}", headers=normal_user_token_headers
+    )
+    assert response.status_code == 200
+    assert needs_totals() == {date(2024, 5, 1): 20000, date(2024, 6, 1): 0}
+
+
+def test_category_trends(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test growth and averages reach into the months before the range."""
+    _create_month_of_transactions(db)
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    food = db.exec(select(Category).where(Category.user_id == user.id)).first()
+    account = db.exec(select(Account).where(Account.user_id == user.id)).first()
+    crud.create_transaction(
+        session=db,
+        transaction_in=TransactionCreate(
+            txn_date=date(2023, 5, 15),
+            type=TxnType.expense,
+            amount=25000,
+            account_id=account.id,
+            category_id=food.id,
+        ),
+        user_id=user.id,
+    )
+
+    response = client.get(
+        "/api/v1/monthly-reports/trends",
+        headers=normal_user_token_headers,
+        params={"start_year": 2024, "start_month": 5, "end_year": 2024, "end_month": 6},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["months"] == ["2024-05-01", "2024-06-01"]
+    food_series, uncategorized = content["series"]
+    assert food_series["category_name"] == "Food"
+    assert food_series["totals"] == [50000, 99999]
+    assert food_series["mom_growth"] == [None, 1.0]  # 0.99998, rounded
+    assert food_series["rolling_average"] == pytest.approx([50000 / 3, 149999 / 3])
+    assert food_series["yoy_growth"] == [1.0, None]
+    assert uncategorized["category_id"] is None
+    assert uncategorized["totals"] == [5000, 0]
+    assert uncategorized["mom_growth"] == [None, -1.0]
+
+
+def test_budget_alerts_raised_on_write(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test crossing allocation thresholds raises each alert once, and acknowledging it."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Budget Account", user_id=user.id)
+    rent = Category(name="Rent", grp=CategoryGroup.needs, user_id=user.id)
+    db.add_all([account, rent])
+    db.commit()
+    crud.create_allocation_rule(
+        session=db,
+        allocation_rule_in=AllocationRuleCreate(grp=CategoryGroup.needs, percent=50),
+        user_id=user.id,
+    )
+
+    def spend(txn_type: TxnType, amount: float, category: Category | None) -> None:
+        crud.create_transaction(
+            session=db,
+            transaction_in=TransactionCreate(
+                txn_date=date(2024, 7, 5),
+                type=txn_type,
+                amount=amount,
+                account_id=account.id,
+                category_id=category.id if category else None,
+            ),
+            user_id=user.id,
+        )
+
+    def alerts(**params) -> list[dict]:
+        response = client.get(
+            "/api/v1/allocation-rules/alerts",
+            headers=normal_user_token_headers,
+            params=params,
+        )
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    spend(TxnType.income, 100000, None)
+    spend(TxnType.expense, 30000, rent)
+    assert alerts() == []
+
+    spend(TxnType.expense, 15000, rent)
+    (warning,) = alerts()
+    assert (warning["grp"], warning["threshold"]) == (CategoryGroup.needs.value, 80)
+    assert (warning["allocated"], warning["spent"]) == (50000, 45000)
+
+    spend(TxnType.expense, 10000, rent)
+    spend(TxnType.expense, 1000, rent)
+    assert [a["threshold"] for a in alerts()] == [100, 80]
+    assert [a["threshold"] for a in alerts(since=warning["created_at"])] == [100]
+
+    response = client.post(
+        f"/api/v1/allocation-rules/alerts/{warning['id']}/acknowledge",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["acknowledged_at"] is not None
+    assert [a["threshold"] for a in alerts()] == [100]
+    assert len(alerts(include_acknowledged=True)) == 2
+
+
+def test_monthly_summary_converts_currencies(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+) -> None:
+    """Test foreign amounts are left out without rates, then converted at the month's average."""
+    _create_month_of_transactions(db)
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = db.exec(select(Account).where(Account.user_id == user.id)).first()
+    crud.create_transaction(
+        session=db,
+        transaction_in=TransactionCreate(
+            txn_date=date(2024, 5, 20),
+            type=TxnType.expense,
+            amount=2,
+            currency="USD",
+            account_id=account.id,
+        ),
+        user_id=user.id,
+    )
+    url = "/api/v1/monthly-reports/summary/2024/5"
+    try:
+        # Without rates the USD amount is left out, not counted 1:1
+        content = client.get(url, headers=normal_user_token_headers).json()
+        assert content["total_expenses"] == 55000
+        assert content["unconverted"] == {"USD": 2}
+        content = client.get(
+            "/api/v1/monthly-reports/detailed/2024/5", headers=normal_user_token_headers
+        ).json()
+        assert content["unconverted"] == {"USD": 2}
+        budget = client.get(
+            "/api/v1/monthly-reports/budget",
+            headers=normal_user_token_headers,
+            params={"start_year": 2024, "start_month": 4, "end_year": 2024, "end_month": 5},
+        ).json()
+        assert budget["unconverted"] == {"USD": 2}
+
+        csv_body = "date,currency,rate\n2024-05-01,USD,24000\n2024-05-31,usd,26000\n2024-05-02,USD,-1\n"
+        response = client.post(
+            "/api/v1/fx-rates/import",
+            headers=superuser_token_headers,
+            files={"file": ("rates.csv", csv_body, "text/csv")},
+        )
+        assert response.status_code == 200
+        assert response.json()["loaded"] == 2
+        assert response.json()["failed"] == 1
+
+        content = client.get(url, headers=normal_user_token_headers).json()
+        assert content["total_expenses"] == 55000 + 2 * 25000
+        assert content["unconverted"] == {}
+        content = client.get(
+            "/api/v1/monthly-reports/detailed/2024/5", headers=normal_user_token_headers
+        ).json()
+        assert content["unconverted"] == {}
+
+        response = client.post(
+            "/api/v1/fx-rates/import",
+            headers=normal_user_token_headers,
+            files={"file": ("rates.csv", csv_body, "text/csv")},
+        )
+        assert response.status_code == 403
+    finally:
+        db.exec(delete(FxRate))
+        db.commit()
+        crud.fx_rate_cache.clear()
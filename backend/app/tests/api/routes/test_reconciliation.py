@@ -0,0 +1,78 @@
+from datetime import date, datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import (
+    Account,
+    EmailTransaction,
+    EmailTransactionStatus,
+    Transaction,
+    TxnType,
+    User,
+)
+from app.tests.utils.gmail import create_email_transaction, create_gmail_connection
+
+
+def test_propose_and_confirm_reconciliation_matches(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test proposals pair equal amounts within the window and confirm links them."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Reconcile Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    transactions = [
+        Transaction(
+            txn_date=txn_date,
+            type=TxnType.expense,
+            amount=amount,
+            account_id=account.id,
+            user_id=user.id,
+        )
+        for txn_date, amount in [
+            (date(2024, 3, 14), 100000),
+            (date(2024, 3, 15), 100000),
+            (date(2024, 3, 30), 55000),
+        ]
+    ]
+    db.add_all(transactions)
+    db.commit()
+    connection = create_gmail_connection(db, user.id)
+    email = create_email_transaction(
+        db, connection, amount=100000, received_at=datetime(2024, 3, 15, 8, tzinfo=timezone.utc)
+    )
+    create_email_transaction(
+        db, connection, amount=55000, received_at=datetime(2024, 3, 15, 8, tzinfo=timezone.utc)
+    )
+
+    response = client.get(
+        "/api/v1/reconciliation/proposals",
+        headers=normal_user_token_headers,
+        params={"window_days": 3},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 1
+    proposal = content["data"][0]
+    assert proposal["email_transaction_id"] == str(email.id)
+    assert proposal["transaction_id"] == str(transactions[1].id)
+    assert proposal["day_diff"] == 0
+
+    match = {
+        "email_transaction_id": proposal["email_transaction_id"],
+        "transaction_id": proposal["transaction_id"],
+    }
+    response = client.post(
+        "/api/v1/reconciliation/confirm",
+        headers=normal_user_token_headers,
+        json={"matches": [match, match]},
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["skipped"] == 1
+
+    db.expire_all()
+    linked = db.get(EmailTransaction, email.id)
+    assert linked.linked_transaction_id == transactions[1].id
+    assert linked.status == EmailTransactionStatus.processed
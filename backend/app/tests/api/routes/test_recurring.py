@@ -0,0 +1,104 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import Account, Transaction, TxnType, User
+from app.tests.utils.gmail import create_email_transaction, create_gmail_connection
+
+
+def test_detect_recurring_series_and_projection(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test a monthly bill is detected while irregular purchases are not, and projected."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Recurring Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    today = date.today()
+    for months_ago in range(1, 6):
+        db.add(
+            Transaction(
+                txn_date=today - timedelta(days=30 * months_ago),
+                type=TxnType.expense,
+                amount=250000 + months_ago,
+                merchant=f"INTERNET FPT {months_ago:04d}",
+                account_id=account.id,
+                user_id=user.id,
+            )
+        )
+    for days_ago, amount in [(3, 45000), (4, 120000), (19, 30000), (60, 80000)]:
+        db.add(
+            Transaction(
+                txn_date=today - timedelta(days=days_ago),
+                type=TxnType.expense,
+                amount=amount,
+                merchant="Coffee",
+                account_id=account.id,
+                user_id=user.id,
+            )
+        )
+    db.commit()
+
+    response = client.post("/api/v1/recurring/detect", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 1
+    (series,) = content["data"]
+    assert series["merchant_key"] == "internet fpt"
+    assert series["occurrences"] == 5
+    assert series["interval_days"] == 30
+    assert series["amount"] == 250003
+
+    response = client.get(
+        "/api/v1/recurring/projection",
+        headers=normal_user_token_headers,
+        params={"months": 3},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["series_count"] == 1
+    assert len(content["data"]) == 3
+    assert content["data"][1]["expense"] == 250003
+    assert content["data"][1]["net"] == -250003
+
+
+def test_detect_recurring_bill_in_emails_and_transactions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test a bill entered by hand and also left as an unlinked email counts once."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Recurring Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    connection = create_gmail_connection(db, user.id)
+    today = date.today()
+    for months_ago in range(1, 6):
+        day = today - timedelta(days=30 * months_ago)
+        db.add(
+            Transaction(
+                txn_date=day,
+                type=TxnType.expense,
+                amount=180000,
+                merchant="Netflix",
+                account_id=account.id,
+                user_id=user.id,
+            )
+        )
+        # The bank email arrives the evening before in UTC
+        create_email_transaction(
+            db,
+            connection,
+            amount=180000,
+            merchant="NETFLIX.COM",
+            received_at=datetime.combine(day - timedelta(days=1), time(20), timezone.utc),
+        )
+    db.commit()
+
+    response = client.post("/api/v1/recurring/detect", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    (series,) = response.json()["data"]
+    assert series["merchant_key"] == "netflix"
+    assert series["amount"] == 180000
+    assert series["occurrences"] == 5
+    assert series["from_email"] is False
@@ -0,0 +1,59 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import Account, Transaction, TxnType, User
+
+
+def test_search_transactions(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test search ignores accents, matches word prefixes and merchant substrings, and pages."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Search Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    for merchant, note in [
+        ("Phở Hà Nội", "bữa sáng"),
+        ("GRAB FOOD", "phở giao tận nơi"),
+        ("Shopee", None),
+    ]:
+        db.add(
+            Transaction(
+                txn_date=date(2024, 3, 1),
+                type=TxnType.expense,
+                amount=50000,
+                merchant=merchant,
+                note=note,
+                account_id=account.id,
+                user_id=user.id,
+            )
+        )
+    db.commit()
+    url = "/api/v1/search/"
+
+    response = client.get(url, headers=normal_user_token_headers, params={"q": "pho"})
+    assert response.status_code == 200
+    content = response.json()
+    # The merchant match outranks the one only found in the note
+    assert [hit["merchant"] for hit in content["data"]] == ["Phở Hà Nội", "GRAB FOOD"]
+    assert content["data"][0]["kind"] == "transaction"
+
+    response = client.get(url, headers=normal_user_token_headers, params={"q": "hopee"})
+    assert [hit["merchant"] for hit in response.json()["data"]] == ["Shopee"]
+
+    first = client.get(
+        url, headers=normal_user_token_headers, params={"q": "pho", "limit": 1}
+    ).json()
+    assert len(first["data"]) == 1
+    second = client.get(
+        url,
+        headers=normal_user_token_headers,
+        params={"q": "pho", "limit": 1, "cursor": first["next_cursor"]},
+    ).json()
+    assert [hit["merchant"] for hit in second["data"]] == ["GRAB FOOD"]
+    assert second["next_cursor"] is None
+
+    response = client.get(url, headers=normal_user_token_headers, params={"q": "!!"})
+    assert response.status_code == 400
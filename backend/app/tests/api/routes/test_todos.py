@@ -0,0 +1,143 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.crud.search import title_search
+from app.models import (
+    Resource,
+    ResourceSubject,
+    Roadmap,
+    RoadmapMilestone,
+    Todo,
+    User,
+)
+
+
+@contextmanager
+def count_statements() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_read_todos_loads_relations_in_constant_statements(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test subjects and milestones are embedded without a query per todo."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    roadmap = Roadmap(title="Roadmap", user_id=user.id)
+    resource = Resource(title="Resource", user_id=user.id)
+    db.add_all([roadmap, resource])
+    db.commit()
+    milestone = RoadmapMilestone(title="Milestone", roadmap_id=roadmap.id)
+    subject = ResourceSubject(title="Subject", resource_id=resource.id)
+    db.add_all([milestone, subject])
+    db.commit()
+    owner_id, milestone_id, subject_id = user.id, milestone.id, subject.id
+
+    def add_todos(count: int) -> None:
+        for index in range(count):
+            db.add(
+                Todo(
+                    title=f"Todo {index}",
+                    owner_id=owner_id,
+                    milestone_id=milestone_id,
+                    subject_id=subject_id,
+                )
+            )
+        db.commit()
+        # Nothing may come from the identity map
+        db.expunge_all()
+
+    def read_todos() -> tuple[dict, int]:
+        with count_statements() as statements:
+            response = client.get("/api/v1/todos/", headers=normal_user_token_headers)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    add_todos(2)
+    content, few = read_todos()
+    assert content["count"] == 2
+    add_todos(8)
+    content, many = read_todos()
+    assert content["count"] == 10
+    assert many == few
+    todo = content["data"][0]
+    assert todo["subject"]["title"] == "Subject"
+    assert todo["milestone"]["title"] == "Milestone"
+
+    response = client.get(f"/api/v1/todos/{todo['id']}", headers=normal_user_token_headers)
+    assert response.status_code == 200
+    assert response.json()["subject"]["id"] == str(subject_id)
+
+
+def test_search_todos_ranks_title_matches_first(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test search ignores accents and ranks title matches above description ones."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    for title, description in [
+        ("Mua sách", "Giáo trình tiếng Anh"),
+        ("Học Tiếng Anh", None),
+        ("Ôn tập toán", "Chương 3"),
+    ]:
+        db.add(Todo(title=title, description=description, owner_id=user.id))
+    db.commit()
+
+    response = client.get(
+        "/api/v1/todos/",
+        headers=normal_user_token_headers,
+        params={"search": "tieng anh"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 2
+    assert [todo["title"] for todo in content["data"]] == ["Học Tiếng Anh", "Mua sách"]
+
+
+def test_search_todos_short_terms_use_word_indexes(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test one- and two-letter searches prefix-match words through an index."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    for title, description in [
+        ("Học Tiếng Anh", None),
+        ("Mua sách", "Giáo trình tiếng Anh"),
+        ("Ôn tập toán", "Chương 3"),
+    ]:
+        db.add(Todo(title=title, description=description, owner_id=user.id))
+    db.commit()
+
+    def search(value: str) -> list[str]:
+        response = client.get(
+            "/api/v1/todos/", headers=normal_user_token_headers, params={"search": value}
+        )
+        assert response.status_code == 200
+        return sorted(todo["title"] for todo in response.json()["data"])
+
+    assert search("ti") == ["Học Tiếng Anh", "Mua sách"]
+    assert search("o") == ["Ôn tập toán"]
+    # Words are matched from their start: "ach" is not a prefix of "sách"
+    assert search("ac") == []
+
+    matches, _ = title_search("ti", Todo.title, Todo.description)
+    statement = select(Todo.id).where(matches).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    db.exec(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(row[0] for row in db.exec(text(f"EXPLAIN {statement}")))
+    db.rollback()
+    assert "ix_todo_title_words" in plan
+    assert "ix_todo_description_words" in plan
@@ -0,0 +1,291 @@
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import Account, Category, CategoryGroup, Transaction, TxnType, User
+
+
+def _create_account_with_transactions(db: Session) -> Account:
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Export Account", user_id=user.id)
+    category = Category(name="Export Food", grp=CategoryGroup.needs, user_id=user.id)
+    db.add(account)
+    db.add(category)
+    db.commit()
+    for day in range(1, 6):
+        db.add(
+            Transaction(
+                txn_date=date(2024, 1, day),
+                type=TxnType.expense,
+                amount=1000 * day,
+                merchant=f"Shop {day}",
+                account_id=account.id,
+                category_id=category.id,
+                user_id=user.id,
+            )
+        )
+    db.commit()
+    return account
+
+
+def test_export_transactions_csv(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test CSV export streams every transaction with related names."""
+    _create_account_with_transactions(db)
+
+    response = client.get(
+        "/api/v1/transactions/export?format=csv",
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5
+    assert rows[0]["txn_date"] == "2024-01-01"
+    assert rows[0]["account_name"] == "Export Account"
+    assert rows[0]["category_name"] == "Export Food"
+    assert rows[0]["type"] == TxnType.expense.value
+
+
+def test_export_transactions_ndjson_gzip_with_filters(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test gzipped NDJSON export honours the date filters."""
+    account = _create_account_with_transactions(db)
+
+    response = client.get(
+        "/api/v1/transactions/export",
+        params={
+            "format": "ndjson",
+            "gzip": "true",
+            "start_date": "2024-01-02",
+            "end_date": "2024-01-03",
+            "account_id": str(account.id),
+        },
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+
+    lines = gzip.decompress(response.content).decode("utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["txn_date"] for r in records] == ["2024-01-02", "2024-01-03"]
+    assert records[1]["amount"] == 3000
+
+
+def test_read_transactions_page_counts_all_rows(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test the list returns the total count, newest first, with category names."""
+    _create_account_with_transactions(db)
+
+    response = client.get(
+        "/api/v1/transactions/",
+        params={"skip": 1, "limit": 2},
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 5
+    assert [t["txn_date"] for t in content["data"]] == ["2024-01-04", "2024-01-03"]
+    assert all(t["category_name"] == "Export Food" for t in content["data"])
+
+
+def test_read_transactions_filters_and_cursor(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test server-side filters, sorting and keyset paging of the list."""
+    account = _create_account_with_transactions(db)
+
+    response = client.get(
+        "/api/v1/transactions/",
+        params={
+            "account_id": str(account.id),
+            "min_amount": 2000,
+            "max_amount": 4000,
+            "sort": "amount",
+            "limit": 2,
+        },
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 3
+    assert [t["amount"] for t in content["data"]] == [2000, 3000]
+
+    response = client.get(
+        "/api/v1/transactions/",
+        params={
+            "account_id": str(account.id),
+            "min_amount": 2000,
+            "max_amount": 4000,
+            "sort": "amount",
+            "limit": 2,
+            "cursor": content["next_cursor"],
+        },
+        headers=normal_user_token_headers,
+    )
+    content = response.json()
+    assert [t["amount"] for t in content["data"]] == [4000]
+    assert content["next_cursor"] is None
+    # Keyset pages skip the count, which would scan every matching row
+    assert content["count"] is None
+
+    response = client.get(
+        "/api/v1/transactions/",
+        params={"q": "shop 5"},
+        headers=normal_user_token_headers,
+    )
+    assert [t["merchant"] for t in response.json()["data"]] == ["Shop 5"]
+
+    response = client.get(
+        "/api/v1/transactions/",
+        params={"sort": "user_id"},
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_import_transactions_csv_skips_duplicates(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test a CSV statement imports once, reports bad rows and dedups on re-import."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Import Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    statement = (
+        "Ngày giao dịch,Nội dung,Số tiền\n"
+        "2024-02-01,Coffee,-45.000\n"
+        "2024-02-01,Coffee,-45.000\n"
+        "02/02/2024,Salary,\"10,000,000\"\n"
+        "not a date,Broken,100\n"
+    ).encode()
+
+    def upload() -> dict:
+        response = client.post(
+            "/api/v1/transactions/import",
+            data={"account_id": str(account.id)},
+            files={"file": ("statement.csv", statement, "text/csv")},
+            headers=normal_user_token_headers,
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    first = upload()
+    assert first["imported"] == 3
+    assert first["failed"] == 1
+    assert first["errors"] == [{"row": 5, "error": "Invalid date: 'not a date'"}]
+
+    second = upload()
+    assert second["imported"] == 0
+    assert second["duplicates"] == 3
+
+    response = client.get(
+        "/api/v1/transactions/",
+        params={"account_id": str(account.id), "sort": "txn_date"},
+        headers=normal_user_token_headers,
+    )
+    content = response.json()
+    assert content["count"] == 3
+    assert [(t["type"], t["amount"]) for t in content["data"]] == [
+        (TxnType.expense.value, 45000),
+        (TxnType.expense.value, 45000),
+        (TxnType.income.value, 10000000),
+    ]
+
+
+def test_import_transactions_malformed_csv(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test a row the csv module cannot parse fails the import with its row number."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Malformed Import Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    statement = (
+        "Date,Description,Amount\n"
+        "2024-02-01,Coffee,-45000\n"
+        f"2024-02-02,{'x' * 200_000},-1000\n"
+    ).encode()
+
+    response = client.post(
+        "/api/v1/transactions/import",
+        data={"account_id": str(account.id)},
+        files={"file": ("statement.csv", statement, "text/csv")},
+        headers=normal_user_token_headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Malformed CSV on row 3:")
+
+    response = client.get(
+        "/api/v1/transactions/",
+        params={"account_id": str(account.id)},
+        headers=normal_user_token_headers,
+    )
+    assert response.json()["count"] == 0
+
+
+def test_batch_transactions_atomic_and_partial(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    """Test an atomic batch rolls back on error while a partial one skips it."""
+    user = db.exec(select(User).where(User.email == "test@example.com")).first()
+    account = Account(name="Batch Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    new_id = str(uuid.uuid4())
+    operations = [
+        {
+            "op": "create",
+            "id": new_id,
+            "create": {
+                "txn_date": "2024-03-01",
+                "type": TxnType.expense.value,
+                "amount": 500,
+                "account_id": str(account.id),
+            },
+        },
+        {"op": "update", "id": new_id, "update": {"amount": 700}},
+        {"op": "delete", "id": str(uuid.uuid4())},
+    ]
+
+    def post(mode: str):
+        return client.post(
+            "/api/v1/transactions/batch",
+            json={"mode": mode, "operations": operations},
+            headers=normal_user_token_headers,
+        )
+
+    response = post("atomic")
+    assert response.status_code == 400
+    content = response.json()
+    assert content["committed"] is False
+    assert [r["error"] for r in content["results"]] == [
+        "Rolled back",
+        "Rolled back",
+        "Transaction not found",
+    ]
+    assert db.get(Transaction, uuid.UUID(new_id)) is None
+
+    response = post("partial")
+    assert response.status_code == 200
+    content = response.json()
+    assert content["committed"] is True
+    assert (content["succeeded"], content["failed"]) == (2, 1)
+    assert content["results"][1]["transaction"]["amount"] == 700
+
+    response = client.get(
+        "/api/v1/accounts/balances", headers=normal_user_token_headers
+    )
+    balances = {b["account_id"]: b for b in response.json()["data"]}
+    assert balances[str(account.id)]["balance"] == -700
+    assert balances[str(account.id)]["txn_count"] == 1
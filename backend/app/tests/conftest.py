@@ -12,7 +12,12 @@ from app.models import (
     Account,
     AllocationRule,
     Category,
+    GmailConnection,
     Item,
+    Resource,
+    ResourceSubject,
+    Roadmap,
+    RoadmapMilestone,
     Transaction,
     User,
     EmailTransaction
@@ -34,12 +39,22 @@ def db() -> Generator[Session, None, None]:
         session.exec(statement)
         statement = delete(EmailTransaction)
         session.exec(statement)
+        statement = delete(GmailConnection)
+        session.exec(statement)
         statement = delete(Category)
         session.exec(statement)
         statement = delete(Account)
         session.exec(statement)
         statement = delete(Item)
         session.exec(statement)
+        statement = delete(ResourceSubject)
+        session.exec(statement)
+        statement = delete(Resource)
+        session.exec(statement)
+        statement = delete(RoadmapMilestone)
+        session.exec(statement)
+        statement = delete(Roadmap)
+        session.exec(statement)
         statement = delete(User)
         session.exec(statement)
         session.commit()
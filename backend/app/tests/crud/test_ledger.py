@@ -0,0 +1,83 @@
+from datetime import date
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.models import (
+    Account,
+    CategoryCreate,
+    CategoryGroup,
+    LedgerAggregate,
+    TransactionCreate,
+    TransactionUpdate,
+    TxnType,
+    User,
+)
+
+
+class TestLedgerAggregates:
+    def test_aggregates_follow_create_update_delete(
+        self, db: Session, normal_user_token_headers: dict[str, str]
+    ) -> None:
+        """Test aggregates move with a transaction across months and categories"""
+        user = db.exec(select(User).where(User.email == "test@example.com")).first()
+        account = Account(name="Ledger Account", user_id=user.id)
+        db.add(account)
+        db.commit()
+        food = crud.create_category(
+            session=db,
+            category_in=CategoryCreate(name="Ledger Food", grp=CategoryGroup.needs),
+            user_id=user.id,
+        )
+
+        first = crud.create_transaction(
+            session=db,
+            transaction_in=TransactionCreate(
+                txn_date=date(2024, 7, 3),
+                type=TxnType.expense,
+                amount=40000,
+                account_id=account.id,
+                category_id=food.id,
+            ),
+            user_id=user.id,
+        )
+        second = crud.create_transaction(
+            session=db,
+            transaction_in=TransactionCreate(
+                txn_date=date(2024, 7, 20),
+                type=TxnType.expense,
+                amount=10000,
+                account_id=account.id,
+                category_id=food.id,
+            ),
+            user_id=user.id,
+        )
+        crud.update_transaction(
+            session=db,
+            db_transaction=second,
+            transaction_in=TransactionUpdate(txn_date=date(2024, 8, 1), category_id=None),
+        )
+        crud.update_transaction(
+            session=db,
+            db_transaction=first,
+            transaction_in=TransactionUpdate(amount=45000),
+        )
+
+        rows = db.exec(
+            select(LedgerAggregate).where(LedgerAggregate.user_id == user.id)
+        ).all()
+        by_month = {(r.month, r.category_id): (r.total_amount, r.txn_count) for r in rows}
+        assert by_month == {
+            (date(2024, 7, 1), food.id): (45000, 1),
+            (date(2024, 8, 1), None): (10000, 1),
+        }
+        assert crud.check_ledger_aggregates(session=db, user_id=user.id) == []
+
+        crud.delete_transaction(session=db, transaction_id=second.id)
+        rows = db.exec(
+            select(LedgerAggregate).where(LedgerAggregate.user_id == user.id)
+        ).all()
+        assert [(r.month, r.txn_count) for r in rows] == [(date(2024, 7, 1), 1)]
+
+        assert crud.rebuild_ledger_aggregates(session=db, user_id=user.id) == 1
+        assert crud.check_ledger_aggregates(session=db, user_id=user.id) == []
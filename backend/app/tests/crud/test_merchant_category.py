@@ -0,0 +1,61 @@
+from datetime import date
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.models import (
+    Account,
+    CategoryCreate,
+    CategoryGroup,
+    TransactionCreate,
+    TxnType,
+    User,
+)
+from app.services.categorization_service import load_category_index
+
+
+class TestMerchantCategoryIndex:
+    def test_index_tracks_transactions_and_suggests_category(
+        self, db: Session, normal_user_token_headers: dict[str, str]
+    ) -> None:
+        """Test the index is updated on create and rebuilt from history"""
+        user = db.exec(select(User).where(User.email == "test@example.com")).first()
+        account = Account(name="Index Account", user_id=user.id)
+        db.add(account)
+        db.commit()
+        food = crud.create_category(
+            session=db,
+            category_in=CategoryCreate(name="Food", grp=CategoryGroup.needs),
+            user_id=user.id,
+        )
+        transport = crud.create_category(
+            session=db,
+            category_in=CategoryCreate(name="Transport", grp=CategoryGroup.needs),
+            user_id=user.id,
+        )
+        for merchant, category in [
+            ("GRAB*Food 1234", food),
+            ("Grab Food 9876", food),
+            ("Grab Bike", transport),
+        ]:
+            crud.create_transaction(
+                session=db,
+                transaction_in=TransactionCreate(
+                    txn_date=date(2024, 1, 1),
+                    type=TxnType.expense,
+                    amount=50000,
+                    merchant=merchant,
+                    account_id=account.id,
+                    category_id=category.id,
+                ),
+                user_id=user.id,
+            )
+
+        index = load_category_index(session=db, user_id=user.id)
+        assert index.suggest("grab food 5555") == food.id
+        assert index.suggest("GRAB BIKE") == transport.id
+        assert index.suggest("Unknown shop") is None
+
+        entries = crud.rebuild_merchant_category_index(session=db, user_id=user.id)
+        assert entries > 0
+        assert crud.get_merchant_category_index(session=db, user_id=user.id) == index.entries
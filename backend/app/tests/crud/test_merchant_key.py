@@ -0,0 +1,48 @@
+from datetime import date
+
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app import crud
+from app.models import Account, Transaction, TransactionCreate, TxnType
+from app.tests.utils.user import create_random_user
+
+
+def test_merchant_key_canonicalizes_raw_text() -> None:
+    assert crud.merchant_key("ShopeePay 84388522680 - VCCB APAY25092700nft3") == "shopee"
+    assert crud.merchant_key("GRAB*Food 1234") == "grab"
+    assert crud.merchant_key("INTERNET FPT 0001") == "internet fpt"
+    assert crud.merchant_key("shoppe") == "shopee"
+    assert crud.merchant_key(None, "Thanh toan Đặt hàng Tiki") == "tiki"
+    assert crud.merchant_key(None, None) is None
+
+
+def test_merchant_key_stored_and_backfilled(db: Session) -> None:
+    """Test keys are set on create and refilled by the backfill job"""
+    user = create_random_user(db)
+    account = Account(name="Merchant Key Account", user_id=user.id)
+    db.add(account)
+    db.commit()
+    transaction = crud.create_transaction(
+        session=db,
+        transaction_in=TransactionCreate(
+            txn_date=date(2024, 1, 1),
+            type=TxnType.expense,
+            amount=50000,
+            merchant="Remitano 0912345",
+            account_id=account.id,
+        ),
+        user_id=user.id,
+    )
+    assert transaction.merchant_key == "remitano"
+
+    db.exec(
+        update(Transaction)
+        .where(Transaction.user_id == user.id)
+        .values(merchant_key=None)
+    )
+    db.commit()
+    assert crud.backfill_merchant_keys(session=db, user_id=user.id) == 1
+    db.refresh(transaction)
+    assert transaction.merchant_key == "remitano"
+    assert crud.backfill_merchant_keys(session=db, user_id=user.id) == 0
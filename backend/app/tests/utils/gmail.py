@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlmodel import Session
+
+from app.models import EmailTransaction, GmailConnection
+from app.tests.utils.utils import random_lower_string
+
+
+def create_gmail_connection(db: Session, user_id: uuid.UUID) -> GmailConnection:
+    connection = GmailConnection(
+        gmail_email=f"{random_lower_string()}@gmail.com",
+        user_id=user_id,
+        access_token="encrypted-access-token",
+        refresh_token="encrypted-refresh-token",
+    )
+    db.add(connection)
+    db.commit()
+    db.refresh(connection)
+    return connection
+
+
+def create_email_transaction(
+    db: Session,
+    connection: GmailConnection,
+    *,
+    amount: float | None = 100000,
+    merchant: str | None = "Grab",
+    sender: str = "support@timo.vn",
+    received_at: datetime | None = None,
+) -> EmailTransaction:
+    email_transaction = EmailTransaction(
+        gmail_connection_id=connection.id,
+        email_id=random_lower_string(),
+        subject="Thông báo thay đổi số dư tài khoản",
+        sender=sender,
+        received_at=received_at or datetime(2024, 3, 15, 10, 0, tzinfo=timezone.utc),
+        amount=amount,
+        merchant=merchant,
+        transaction_type="debit",
+    )
+    db.add(email_transaction)
+    db.commit()
+    db.refresh(email_transaction)
+    return email_transaction
@@ -1,4 +1,6 @@
 import logging
+import re
+import unicodedata
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, date
 from pathlib import Path
@@ -79,6 +81,25 @@ def convert_empty_string_to_none(v: Any) -> Any:
     return v
 
 
+# ========= TEXT UTILITIES =========
+def normalize_text(text: str | None) -> str:
+    """
+    Normalize free text for matching.
+
+    Lowercases, strips Vietnamese/Latin accents, replaces digit runs with
+    "#" (card suffixes, order numbers) and collapses punctuation and
+    whitespace to single spaces.
+    """
+    if not text:
+        return ""
+    text = text.lower().replace("đ", "d")
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"\d+", "#", text)
+    text = re.sub(r"[^a-z#]+", " ", text)
+    return text.strip()
+
+
 @dataclass
 class EmailData:
     html_content: str